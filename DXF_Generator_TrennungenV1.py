@@ -12,126 +12,204 @@
 # ------------------------------------------------------
 # Importierte Bibliotheken
 
-import ezdxf
-import matplotlib.pyplot as plt
+# ezdxf, matplotlib und Pmw werden erst bei Bedarf geladen -> das Fenster steht sofort
 import tkinter as tk
 from tkinter import filedialog, messagebox
+import argparse
 import json
-import Pmw
+import os
+import sys
+import time
+from itertools import product
 
-# -----------------------------
-
-#plt.rcParams['toolbar'] = 'None'   # keine Toolbar (keine Save/Configure-Buttons)
+import startprofil
+from zeitspur import span, traced, file_size, merge, run_traced
+from hintergrund import write_atomic
 
 # -----------------------------
-# Globale Vorgaben für IKEA Rahmen 250x250
+# Globale Vorgaben für IKEA Rahmen 250x250 (Werte in trennsteg_geometrie.py)
 # -----------------------------
-SCHLITZABSTAND = 16.6666  # mm Abstand Mitte -> Mitte
-ANZAHL_SCHLITZE = 12      # Anzahl der Schlitze für Gitter  
-VERSCHIEBUNG = 8.3333     # mm für "Waagerecht"-Option
+from trennsteg_geometrie import (SCHLITZABSTAND, ANZAHL_SCHLITZE, VERSCHIEBUNG, TRENNSTEGHOEHE,
+                                 erstes_schlitz_links, strip_geometry, add_strip_entities,
+                                 validate_dimensions, validate_values)
+from laserpfad import merge_collinear_lines, optimize_cut_order
 position = "Senkrecht"    # Radiobutton Auswahl
-TRENNSTEGHOEHE = 44.8     # mm Höhe der Trennstege
 # -----------------------------
 # Funktionen
 # -----------------------------
 
-def draw_preview(laenge, hoehe, schlitzbreite, erstes_schlitzauslinks):
-    schlitzhoehe = round(hoehe / 2 + 1, 2)
-    y_unten = round((hoehe - schlitzhoehe) / 2, 2)
-    y_oben = round(y_unten + schlitzhoehe, 2)
-
-    fig = plt.figure(num="Vorschau Trennstege", figsize=(laenge/20, hoehe/20))
-
-    # Toolbar & Kopf/Fußzeile ausblenden
-    fig.canvas.toolbar_visible = False
-    fig.canvas.header_visible = False
-    fig.canvas.footer_visible = False
-
-    # Außenrahmen
-    plt.plot([0, laenge, laenge, 0, 0],
-             [0, 0, hoehe, hoehe, 0], 'b-', linewidth=1.5)
-
-    # Schlitze & Mittellinie
-    linie_x_start = 0
-    x = erstes_schlitzauslinks
-    schlitz_mitten = []
-    for i in range(ANZAHL_SCHLITZE):
-        plt.plot([linie_x_start, x - schlitzbreite/2], [hoehe/2, hoehe/2], 'g-')
-        xs = [x - schlitzbreite/2, x + schlitzbreite/2,
-              x + schlitzbreite/2, x - schlitzbreite/2, x - schlitzbreite/2]
-        ys = [y_unten, y_unten, y_oben, y_oben, y_unten]
-        plt.plot(xs, ys, 'r-', linewidth=2)
-        linie_x_start = x + schlitzbreite/2
-        schlitz_mitten.append(x)
-        x += SCHLITZABSTAND
-
-    plt.plot([linie_x_start, laenge], [hoehe/2, hoehe/2], 'g-')
-
-    plt.gca().set_aspect('equal', adjustable='box')
-    plt.xlim(-0.1*laenge, 1.1*laenge)
-    plt.ylim(-0.1*hoehe, hoehe)
-    plt.axis('off')
-
-    # Länge und Höhe beschriften (2 Nachkommastellen)
-    plt.text(laenge/2, hoehe, f"Länge: {laenge:.2f} mm", ha='center', va='bottom', color='blue')
-    plt.text(-0.05*laenge, hoehe/2, f"Höhe: {hoehe:.2f} mm", ha='right', va='center', rotation='vertical', color='blue')
-    plt.text(erstes_schlitzauslinks, y_oben + 0.05*hoehe, f"Schlitzbreite: {schlitzbreite:.2f} mm", ha='left', va='bottom', color='red')
-
-    # Abstand von links bis zum 1. Schlitz
-    x1 = 0
-    x2 = schlitz_mitten[0]
-    y_pos = y_oben + hoehe
-    plt.annotate('', xy=(x1, y_pos), xytext=(x2, y_pos),
-                 arrowprops=dict(arrowstyle='<->', color='green'))
-    plt.text((x1+x2)/2, y_pos + 0.02*hoehe, f"{(x2-x1):.4f} mm", ha='center', va='bottom', color='green')
-
-    # Abstand vorletztes Schlitzpaar
-    if len(schlitz_mitten) >= 2:
-        x1 = schlitz_mitten[-2]
-        x2 = schlitz_mitten[-1]
-        y_pos = y_oben + hoehe
-        plt.annotate('', xy=(x1, y_pos), xytext=(x2, y_pos),
-                     arrowprops=dict(arrowstyle='<->', color='blue'))
-        plt.text((x1+x2)/2, y_pos + 0.02*hoehe, f"{(x2-x1):.4f} mm",
-                 ha='center', va='bottom', color='blue')
-
-    plt.subplots_adjust(left=0.05, right=0.95, top=0.95, bottom=0.05)
-    plt.show()
+# -----------------------------
+# Vorschau (im Hauptfenster eingebettet)
+# -----------------------------
+class LivePreview:
+    # Kontur, Mittellinie und Schlitze als LineCollections; bei Eingaben wird entprellt neu gezeichnet,
+    # bei gleicher Größe nur per Blitting (Hintergrund bleibt, nur die Vorschau-Objekte werden neu gemalt)
+    VERZOEGERUNG = 150   # ms nach der letzten Eingabe
+
+    def __init__(self, master, quelle):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.collections import LineCollection
+        from matplotlib.figure import Figure
+
+        self.master = master
+        self.quelle = quelle          # liefert (laenge, hoehe, schlitzbreite, erstes, anzahl, abstand) oder None
+        self.figure = Figure(figsize=(7.4, 2.6), dpi=100)
+        self.ax = self.figure.add_axes([0, 0, 1, 1])
+        self.ax.set_aspect('equal', adjustable='box')
+        self.ax.axis('off')
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+
+        ax = self.ax
+        self.kontur = ax.add_collection(LineCollection([], colors='b', linewidths=1.5, animated=True))
+        self.mittellinie = ax.add_collection(LineCollection([], colors='g', linewidths=1, animated=True))
+        self.schlitze = ax.add_collection(LineCollection([], colors='r', linewidths=2, animated=True))
+        self.text_laenge = ax.text(0, 0, "", ha='center', va='bottom', color='blue', animated=True)
+        self.text_hoehe = ax.text(0, 0, "", ha='right', va='center', rotation='vertical', color='blue', animated=True)
+        self.text_schlitz = ax.text(0, 0, "", ha='left', va='bottom', color='red', animated=True)
+        # Abstand von links bis zum 1. Schlitz und Abstand des letzten Schlitzpaars
+        self.mass_links = ax.annotate('', xy=(0, 0), xytext=(0, 0), animated=True,
+                                      arrowprops=dict(arrowstyle='<->', color='green'))
+        self.text_links = ax.text(0, 0, "", ha='center', va='bottom', color='green', animated=True)
+        self.mass_paar = ax.annotate('', xy=(0, 0), xytext=(0, 0), animated=True,
+                                     arrowprops=dict(arrowstyle='<->', color='blue'))
+        self.text_paar = ax.text(0, 0, "", ha='center', va='bottom', color='blue', animated=True)
+        self.artists = [self.kontur, self.mittellinie, self.schlitze, self.text_laenge, self.text_hoehe,
+                        self.text_schlitz, self.mass_links, self.text_links, self.mass_paar, self.text_paar]
+
+        self.segmente = {}        # zuletzt gesetzte Segmente je LineCollection
+        self.werte = None
+        self.groesse = None       # (laenge, hoehe) der aktuellen Achsengrenzen
+        self.hintergrund = None
+        self.auftrag = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def widget(self):
+        return self.canvas.get_tk_widget()
+
+    def schedule(self, *_):
+        # Entprellen: erst nach einer kurzen Eingabepause zeichnen
+        if self.auftrag is not None:
+            self.master.after_cancel(self.auftrag)
+        self.auftrag = self.master.after(self.VERZOEGERUNG, self.refresh)
+
+    def refresh(self):
+        self.auftrag = None
+        werte = self.quelle()
+        if werte is not None:
+            self.show(werte)
+
+    def show(self, werte, neu_skalieren=False):
+        if werte == self.werte and not neu_skalieren:
+            return
+        self.werte = werte
+        laenge, hoehe, schlitzbreite, erstes, anzahl, abstand = werte
+        kontur, schlitze, mittellinie = strip_geometry(laenge, hoehe, schlitzbreite, erstes, anzahl, abstand)
+        y_oben = float(schlitze[0, 2, 1])
+        y_mass = hoehe * 1.15
+
+        self._set_segments(self.kontur, kontur[None])
+        self._set_segments(self.mittellinie, mittellinie)
+        self._set_segments(self.schlitze, schlitze)
+        self._set_text(self.text_laenge, (laenge/2, hoehe), f"Länge: {laenge:.2f} mm")
+        self._set_text(self.text_hoehe, (-0.02*laenge, hoehe/2), f"Höhe: {hoehe:.2f} mm")
+        self._set_text(self.text_schlitz, (erstes, y_oben + 0.05*hoehe), f"Schlitzbreite: {schlitzbreite:.2f} mm")
+
+        self._set_mass(self.mass_links, self.text_links, 0, erstes, y_mass, hoehe)
+        if anzahl >= 2:
+            letzter = erstes + (anzahl-1)*abstand
+            self._set_mass(self.mass_paar, self.text_paar, letzter - abstand, letzter, y_mass, hoehe)
+        self.mass_paar.set_visible(anzahl >= 2)
+        self.text_paar.set_visible(anzahl >= 2)
+
+        if neu_skalieren or self.groesse != (laenge, hoehe):
+            # neue Achsengrenzen -> einmal komplett zeichnen, draw_event holt den Hintergrund
+            self.groesse = (laenge, hoehe)
+            self.ax.set_xlim(-0.1*laenge, 1.1*laenge)
+            self.ax.set_ylim(-0.1*hoehe, 1.35*hoehe)
+            self.canvas.draw_idle()
+        else:
+            self._blit()
+
+    def _set_segments(self, collection, segmente):
+        # segmente: Array (n, punkte, 2) aus strip_geometry, nur bei geänderten Werten neu setzen
+        alt = self.segmente.get(id(collection))
+        if alt is None or alt.shape != segmente.shape or (alt != segmente).any():
+            collection.set_segments(segmente)
+            self.segmente[id(collection)] = segmente
+
+    @staticmethod
+    def _set_text(artist, position, text):
+        if artist.get_position() != position:
+            artist.set_position(position)
+        if artist.get_text() != text:
+            artist.set_text(text)
+
+    def _set_mass(self, pfeil, text, x1, x2, y, hoehe):
+        if (pfeil.xy, pfeil.xyann) != ((x1, y), (x2, y)):
+            pfeil.xy = (x1, y)
+            pfeil.xyann = (x2, y)
+        self._set_text(text, ((x1+x2)/2, y + 0.02*hoehe), f"{(x2-x1):.4f} mm")
+
+    def _on_draw(self, event):
+        self.hintergrund = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    def _blit(self):
+        if self.hintergrund is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.hintergrund)
+        self._draw_artists()
 
 
+def read_preview_values():
+    # Eingaben für die Live-Vorschau, None bei unvollständigen Werten (ohne Meldung, es wird noch getippt)
+    try:
+        laenge = float(entry_laenge.get().replace(',', '.'))
+        hoehe = float(entry_hoehe.get().replace(',', '.'))*2
+        schlitzbreite = float(entry_schlitz.get().replace(',', '.'))
+    except ValueError:
+        return None
+    if laenge <= 0 or hoehe <= 0 or schlitzbreite <= 0 or not 1 <= ANZAHL_SCHLITZE <= 24:
+        return None
+    erstes_schlitzauslinks = erstes_schlitz_links(laenge, position, ANZAHL_SCHLITZE,
+                                                  SCHLITZABSTAND, VERSCHIEBUNG)
+    return (laenge, hoehe, schlitzbreite, erstes_schlitzauslinks, ANZAHL_SCHLITZE, SCHLITZABSTAND)
 
 
-def create_dxf(laenge, hoehe, schlitzbreite, erstes_schlitzauslinks, dateipfad):
-    schlitzhoehe = round(hoehe / 2 , 2)
-    y_unten = round((hoehe - schlitzhoehe) / 2, 2)
-    y_oben = round(y_unten + schlitzhoehe, 2)
+def build_strip_doc(laenge, hoehe, schlitzbreite, erstes_schlitzauslinks, anzahl_schlitze, schlitzabstand):
+    # DXF-Dokument eines Trennstegs ohne GUI (auch für Benchmarks)
+    with span("import ezdxf"):
+        import ezdxf
 
     doc = ezdxf.new(dxfversion='AC1015', units=3)
     msp = doc.modelspace()
 
-    msp.add_lwpolyline([(0, 0), (laenge, 0), (laenge, hoehe),
-                        (0, hoehe), (0, 0)], close=True, dxfattribs={"layer": "Kontur"})
-
-    x = erstes_schlitzauslinks
-    linie_x_start = 0
-    for i in range(ANZAHL_SCHLITZE):
-        msp.add_line((linie_x_start, hoehe/2),
-                     (x - schlitzbreite/2, hoehe/2),
-                     dxfattribs={"layer": "Mittellinie"})
-        msp.add_lwpolyline([
-            (x - schlitzbreite/2, y_unten),
-            (x + schlitzbreite/2, y_unten),
-            (x + schlitzbreite/2, y_oben),
-            (x - schlitzbreite/2, y_oben),
-            (x - schlitzbreite/2, y_unten)
-        ], close=True, dxfattribs={"layer": "Schlitze"})
-        linie_x_start = x + schlitzbreite/2
-        x += SCHLITZABSTAND
-
-    msp.add_line((linie_x_start, hoehe/2),
-                 (laenge, hoehe/2), dxfattribs={"layer": "Mittellinie"})
-
-    doc.saveas(dateipfad)
+    with span("geometrie", schlitze=anzahl_schlitze) as s:
+        add_strip_entities(msp, strip_geometry(laenge, hoehe, schlitzbreite, erstes_schlitzauslinks,
+                                               anzahl_schlitze, schlitzabstand))
+        s.set(entities=len(msp))
+    # Mittellinie in einem Zug (über die Schlitze hinweg), Reihenfolge für kurze Leerfahrten
+    with span("laserpfad") as s:
+        merge_collinear_lines(msp, "Mittellinie", schlitzbreite)
+        vorher, nachher = optimize_cut_order(msp)
+        s.set(entities=len(msp), leerweg_vorher=round(vorher, 1), leerweg_nachher=round(nachher, 1))
+    return doc
+
+
+@traced("create_dxf")
+def create_dxf(laenge, hoehe, schlitzbreite, erstes_schlitzauslinks, dateipfad):
+    with span("build_strip_doc") as s:
+        doc = build_strip_doc(laenge, hoehe, schlitzbreite, erstes_schlitzauslinks, ANZAHL_SCHLITZE, SCHLITZABSTAND)
+        s.set(entities=len(doc.modelspace()))
+    with span("saveas", datei=dateipfad) as s:
+        doc.saveas(dateipfad)
+        s.set(bytes=file_size(dateipfad))
     messagebox.showinfo("Erfolg", f"DXF gespeichert unter:\n{dateipfad}")
 
 
@@ -146,14 +224,11 @@ def start_preview():
             return
         # ------------------
 
-        if position == "Waagerecht":
-            erstes_schlitzauslinks = round(
-                (laenge - (ANZAHL_SCHLITZE-1)*SCHLITZABSTAND)/2 + VERSCHIEBUNG, 4)
-        else:
-            erstes_schlitzauslinks = round(
-                (laenge - (ANZAHL_SCHLITZE-1)*SCHLITZABSTAND)/2, 4)
+        erstes_schlitzauslinks = erstes_schlitz_links(laenge, position, ANZAHL_SCHLITZE,
+                                                      SCHLITZABSTAND, VERSCHIEBUNG)
 
-        draw_preview(laenge, hoehe, schlitzbreite, erstes_schlitzauslinks)
+        create_preview().show((laenge, hoehe, schlitzbreite, erstes_schlitzauslinks, ANZAHL_SCHLITZE, SCHLITZABSTAND),
+                     neu_skalieren=True)
     except ValueError:
         messagebox.showerror("Fehler", "Bitte gültige Zahlen eingeben.")
 
@@ -165,14 +240,9 @@ def start_save():
         schlitzbreite = float(entry_schlitz.get().replace(',', '.'))
 
         # --- Prüfungen Eingabewerte ---
-        if laenge <= 0:
-            messagebox.showerror("Fehler", "Länge muss größer als 0 sein.")
-            return
-        if hoehe <= 0:
-            messagebox.showerror("Fehler", "Höhe muss größer als 0 sein.")
-            return
-        if schlitzbreite < 0.1:
-            messagebox.showerror("Fehler", "Schlitzbreite darf nicht kleiner als 0.1 mm sein.")
+        fehler = validate_dimensions(laenge, hoehe, schlitzbreite)
+        if fehler:
+            messagebox.showerror("Fehler", fehler)
             return
         # ------------------------------
 
@@ -181,15 +251,12 @@ def start_save():
             return
         # -------------------------------
 
-        if position == "Waagerecht":
-            erstes_schlitzauslinks = round(
-                (laenge - (ANZAHL_SCHLITZE-1)*SCHLITZABSTAND)/2 + VERSCHIEBUNG, 4)
-        else:
-            erstes_schlitzauslinks = round(
-                (laenge - (ANZAHL_SCHLITZE-1)*SCHLITZABSTAND)/2, 4)
+        erstes_schlitzauslinks = erstes_schlitz_links(laenge, position, ANZAHL_SCHLITZE,
+                                                      SCHLITZABSTAND, VERSCHIEBUNG)
 
-        dateipfad = filedialog.asksaveasfilename(
-            defaultextension=".dxf", filetypes=[("DXF-Dateien", "*.dxf")])
+        with span("dialog_datei"):
+            dateipfad = filedialog.asksaveasfilename(
+                defaultextension=".dxf", filetypes=[("DXF-Dateien", "*.dxf")])
         if dateipfad:
             create_dxf(laenge, hoehe, schlitzbreite, erstes_schlitzauslinks, dateipfad)
 
@@ -197,22 +264,151 @@ def start_save():
         messagebox.showerror("Fehler", "Bitte gültige Zahlen eingeben.")
 
 
- # Überprüfung der Eingabewerte
+ # Überprüfung der Eingabewerte (Regeln in trennsteg_geometrie.validate_values, hier nur die Meldung)
 def check_values(schlitzbreite, anzahl_schlitze, verschiebung, schlitzabstand):
-    if schlitzbreite < 0.1:
-        messagebox.showerror("Fehler", "Die Schlitzbreite darf nicht kleiner als 0,1 mm sein.")
-        return False
-    if schlitzbreite > schlitzabstand - 1:
-        messagebox.showerror("Fehler", f"Schlitzbreite darf maximal {schlitzabstand - 1:.2f} mm betragen.")
-        return False
-    if anzahl_schlitze < 1 or anzahl_schlitze > 24:
-        messagebox.showerror("Fehler", "Die Anzahl der Schlitze muss zwischen 1 und 24 liegen.")
-        return False
-    if verschiebung > schlitzabstand:
-        messagebox.showerror("Fehler", f"Die Verschiebung darf maximal {schlitzabstand:.2f} mm betragen.")
+    fehler = validate_values(schlitzbreite, anzahl_schlitze, verschiebung, schlitzabstand)
+    if fehler:
+        messagebox.showerror("Fehler", fehler)
         return False
     return True
 
+
+# -----------------------------
+# Serien-Export (ohne GUI): alle Varianten aus Rahmengrößen × Materialien × Positionen
+# -----------------------------
+# Format der Serien-Datei (JSON), "hoehe" wie im Feld Höhe (wird verdoppelt):
+#   {"rahmen": [{"name": "ikea250", "laenge": 239.5, "hoehe": 44.8}, ...],
+#    "material": [{"name": "pappel3", "schlitzbreite": 3.0, "kerf": [0.1, 0.15]}, ...],
+#    "positionen": ["Senkrecht", "Waagerecht"]}
+# optional je Rahmen (oder für alle auf oberster Ebene): "anzahl_schlitze", "schlitzabstand", "verschiebung"
+# schlitzbreite und kerf dürfen einzelne Zahlen oder Listen sein, jede Kombination ist eine Variante.
+# kerf = Schnittbreite des Lasers: Schlitze werden um kerf schmaler, Länge und Höhe um kerf größer gezeichnet,
+# damit die fertigen Teile die Nennmaße haben.
+POSITIONEN = ("Senkrecht", "Waagerecht")
+
+
+def _zahlen(wert):
+    return [float(str(v).replace(",", ".")) for v in (wert if isinstance(wert, list) else [wert])]
+
+
+def load_sweep(path):
+    # Serien-Datei lesen, Rückgabe: Liste der Varianten (dicts); ValueError bei falschem Aufbau
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not data.get("rahmen") or not data.get("material"):
+        raise ValueError("Die Serien-Datei braucht ein JSON-Objekt mit \"rahmen\" und \"material\".")
+    positionen = data.get("positionen", list(POSITIONEN))
+    falsch = [p for p in positionen if p not in POSITIONEN]
+    if falsch:
+        raise ValueError(f"Unbekannte Position: {', '.join(map(str, falsch))} (erlaubt: {', '.join(POSITIONEN)})")
+
+    varianten = []
+    try:
+        for n, (rahmen, material) in enumerate(product(data["rahmen"], data["material"])):
+            vorgaben = {k: rahmen.get(k, data.get(k, standard)) for k, standard in
+                        (("anzahl_schlitze", ANZAHL_SCHLITZE), ("schlitzabstand", SCHLITZABSTAND),
+                         ("verschiebung", VERSCHIEBUNG))}
+            for schlitzbreite, kerf, position in product(_zahlen(material["schlitzbreite"]),
+                                                         _zahlen(material.get("kerf", 0)), positionen):
+                varianten.append(dict(
+                    rahmen=str(rahmen["name"]), material=str(material["name"]),
+                    laenge=float(str(rahmen["laenge"]).replace(",", ".")),
+                    hoehe=float(str(rahmen.get("hoehe", TRENNSTEGHOEHE)).replace(",", ".")) * 2,
+                    schlitzbreite=schlitzbreite, kerf=kerf, position=position,
+                    anzahl_schlitze=int(vorgaben["anzahl_schlitze"]),
+                    schlitzabstand=float(vorgaben["schlitzabstand"]),
+                    verschiebung=float(vorgaben["verschiebung"]),
+                ))
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Serien-Datei ungültig: {e!r}")
+    return varianten
+
+
+def variant_name(v):
+    return (f"{v['rahmen']}_{v['material']}_s{v['schlitzbreite']:g}_k{v['kerf']:g}_{v['position'].lower()}"
+            .replace(" ", "_"))
+
+
+def assign_file_names(varianten):
+    # v["datei"] je Variante; gleiche Namen (z.B. doppelte Einträge, gerundete Werte) bekommen _2, _3 ...
+    # Rückgabe Liste der Hinweise zu umbenannten Varianten
+    vergeben, hinweise = {}, []
+    for v in varianten:
+        name = variant_name(v)
+        n = vergeben.get(name, 0) + 1
+        vergeben[name] = n
+        v["datei"] = name if n == 1 else f"{name}_{n}"
+        while n > 1 and v["datei"] in vergeben:        # Suffix selbst schon als Name vergeben
+            n += 1
+            v["datei"] = f"{name}_{n}"
+        if n > 1:
+            vergeben[v["datei"]] = 1
+            hinweise.append(f"Name {name} doppelt, Variante als {v['datei']}")
+    return hinweise
+
+
+def validate_variant(v):
+    # dieselben Regeln wie start_save/check_values, geprüft wird die gezeichnete Schlitzbreite (nach kerf)
+    if v["kerf"] < 0:
+        return "Kerf darf nicht negativ sein."
+    schlitz = v["schlitzbreite"] - v["kerf"]
+    return (validate_dimensions(v["laenge"], v["hoehe"], schlitz)
+            or validate_values(schlitz, v["anzahl_schlitze"], v["verschiebung"], v["schlitzabstand"]))
+
+
+def export_variant(v, ausgabe):
+    # Worker-Prozess: eine geprüfte Variante als DXF schreiben; Rückgabe (name, dauer_s)
+    start = time.perf_counter()
+    name = v.get("datei") or variant_name(v)
+    laenge = v["laenge"] + v["kerf"]
+    erstes = erstes_schlitz_links(laenge, v["position"], v["anzahl_schlitze"], v["schlitzabstand"],
+                                  v["verschiebung"])
+    doc = build_strip_doc(laenge, v["hoehe"] + v["kerf"], v["schlitzbreite"] - v["kerf"], erstes,
+                          v["anzahl_schlitze"], v["schlitzabstand"])
+    write_atomic(os.path.join(ausgabe, name + ".dxf"), doc.saveas)
+    return name, time.perf_counter() - start
+
+
+def run_sweep(path, ausgabe, jobs=None):
+    # alle Varianten parallel erzeugen; ungültige oder fehlgeschlagene werden gemeldet und übersprungen,
+    # die übrigen laufen weiter (Rückgabe am Ende 1)
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    try:
+        varianten = load_sweep(path)
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+    os.makedirs(ausgabe, exist_ok=True)
+
+    start = time.perf_counter()
+    for hinweis in assign_file_names(varianten):
+        print(f"Hinweis: {hinweis}")
+    # erst alle prüfen (schnell, ohne Prozesse), nur gültige Varianten gehen an die Worker
+    gueltig, fehler = [], 0
+    for v in varianten:
+        meldung = validate_variant(v)
+        if meldung:
+            print(f"FEHLER              {v['datei']}  {meldung}")
+            fehler += 1
+        else:
+            gueltig.append(v)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(run_traced, export_variant, v, ausgabe): v for v in gueltig}
+        for future in as_completed(futures):
+            try:
+                (name, dauer), events = future.result()
+            except Exception as e:          # eine kaputte Variante bricht die Serie nicht ab
+                print(f"FEHLER              {futures[future]['datei']}  {e}")
+                fehler += 1
+                continue
+            merge(events)
+            print(f"OK     {dauer*1000:8.1f} ms  {name}")
+
+    print(f"{len(varianten)} Varianten in {time.perf_counter() - start:.2f} s, {fehler} fehlerhaft -> {ausgabe}")
+    return 1 if fehler else 0
+
 # -----------------------------
 # Einstellungsfenster
 # -----------------------------
@@ -334,6 +530,8 @@ def open_settings():
                  f"ANZAHL_SCHLITZE = {ANZAHL_SCHLITZE} | "
                  f"VERSCHIEBUNG = {VERSCHIEBUNG} mm"
         )
+        if preview is not None:
+            preview.schedule()
         settings.destroy()
 
     settings = tk.Toplevel(root)
@@ -362,57 +560,38 @@ def open_settings():
 # -----------------------------
 # Haupt-GUI
 # -----------------------------
-root = tk.Tk()
-root.title("Trennsteg Generator by Michael Mahrt")
-root.geometry("460x200")
-
-Pmw.initialise(root)
-# Überschrift
-tk.Label(root, text="Trennsteg Generator", font=("Arial", 16, "bold")).grid(row=0, column=0, columnspan=4, pady=10)
-
-# Eingabefelder
-tk.Label(root, text="Länge [mm]").grid(row=1, column=0, sticky="e")
-entry_laenge = tk.Entry(root)
-entry_laenge.grid(row=1, column=1)
-entry_laenge.insert(0, "239.50")
-Pmw.Balloon(root).bind(entry_laenge, "Hier die Länge des Trennstegs in mm eingeben")
-
-tk.Label(root, text="Höhe [mm]").grid(row=2, column=0, sticky="e")
-entry_hoehe = tk.Entry(root)
-entry_hoehe.grid(row=2, column=1)
-entry_hoehe.insert(0, "44.8")
-Pmw.Balloon(root).bind(entry_hoehe, "Hier die Höhe des Trennstegs in mm eingeben")
-
-tk.Label(root, text="Schlitzbreite [mm]").grid(row=3, column=0, sticky="e")
-entry_schlitz = tk.Entry(root)
-entry_schlitz.grid(row=3, column=1)
-entry_schlitz.insert(0, "0.3")
-Pmw.Balloon(root).bind(entry_schlitz, "Hier die Breite der Schlitze in mm eingeben")
-
-# Radiobuttons
-position_var = tk.StringVar(value="Senkrecht")
+preview = None    # Live-Vorschau, wird erst nach dem Anzeigen des Fensters aufgebaut (matplotlib)
+
+
+def create_preview():
+    global preview
+    if preview is None:
+        preview = LivePreview(root, read_preview_values)
+        preview.widget().grid(row=6, column=0, columnspan=4, sticky="nsew")
+        root.grid_rowconfigure(6, weight=1)
+        for var in (var_laenge, var_hoehe, var_schlitz):
+            var.trace_add("write", preview.schedule)
+        preview.refresh()
+    return preview
+
+
+def add_tooltips():
+    import Pmw
+
+    Pmw.initialise(root)
+    Pmw.Balloon(root).bind(entry_laenge, "Hier die Länge des Trennstegs in mm eingeben")
+    Pmw.Balloon(root).bind(entry_hoehe, "Hier die Höhe des Trennstegs in mm eingeben")
+    Pmw.Balloon(root).bind(entry_schlitz, "Hier die Breite der Schlitze in mm eingeben")
+    Pmw.Balloon(root).bind(r1, "Bei Wahl Senkrecht werden die Schlitze mittig angeordnet.")
+    Pmw.Balloon(root).bind(r2, "Bei Wahl Waagerecht werden die Schlitze verschoben angeordnet.")
+
+
 def update_position():
     global position
     position = position_var.get()
-r1=tk.Radiobutton(root, text="Senkrecht   ", variable=position_var, value="Senkrecht", command=update_position)
-r1.grid(row=1, column=2)
-r2=tk.Radiobutton(root, text="Waagerecht", variable=position_var, value="Waagerecht", command=update_position)
-r2.grid(row=2, column=2)
-
-Pmw.Balloon(root).bind(r1, "Bei Wahl Senkrecht werden die Schlitze mittig angeordnet.")
-Pmw.Balloon(root).bind(r2, "Bei Wahl Waagerecht werden die Schlitze verschoben angeordnet.")
-
-# Vorgaben-Label
-label_vorgaben = tk.Label(root,
-    text=f"SCHLITZABSTAND = {SCHLITZABSTAND} mm | ANZAHL_SCHLITZE = {ANZAHL_SCHLITZE} | VERSCHIEBUNG = {VERSCHIEBUNG} mm",
-    font=("Arial", 8))
-label_vorgaben.grid(row=4, column=0, columnspan=4, pady=5)
-
-# Buttons in Reihe
-tk.Button(root, text="Vorschau", command=start_preview).grid(row=5, column=0, pady=10)
-tk.Button(root, text="DXF speichern", command=start_save).grid(row=5, column=1, pady=10)
-tk.Button(root, text="Einstellungen", command=open_settings).grid(row=5, column=2, pady=10)
-tk.Button(root, text="Beenden", command=root.destroy).grid(row=5, column=3, pady=10)
+    if preview is not None:
+        preview.schedule()
+
 
 def verdopple_hoehe(event=None):
     try:
@@ -423,7 +602,79 @@ def verdopple_hoehe(event=None):
     except ValueError:
         pass  # Ignoriert ungültige Eingaben
 
-# Event-Bindung: wenn Enter gedrückt wird
-# entry_hoehe.bind("<FocusOut>", verdopple_hoehe)
 
-root.mainloop()
+def main(argv=None):
+    global root, var_laenge, var_hoehe, var_schlitz, entry_laenge, entry_hoehe, entry_schlitz
+    global position_var, r1, r2, label_vorgaben
+
+    parser = argparse.ArgumentParser(description="Trennsteg Generator")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Startzeit messen und Importzeiten der Module ausgeben")
+    parser.add_argument(startprofil.EXIT_FLAG, action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--serie", metavar="JSON",
+                        help="ohne GUI: alle Varianten der Serien-Datei als DXF erzeugen")
+    parser.add_argument("--ausgabe", default="trennstege", help="Zielverzeichnis für --serie")
+    parser.add_argument("--jobs", type=int, default=None, help="Anzahl Prozesse für --serie (Standard: alle Kerne)")
+    args = parser.parse_args(argv)
+    if args.startup_profile:
+        return startprofil.run_profile(__file__)
+    if args.serie:
+        return run_sweep(args.serie, args.ausgabe, args.jobs)
+
+    root = tk.Tk()
+    root.title("Trennsteg Generator by Michael Mahrt")
+    root.geometry("760x480")
+
+    # Überschrift
+    tk.Label(root, text="Trennsteg Generator", font=("Arial", 16, "bold")).grid(row=0, column=0, columnspan=4, pady=10)
+
+    # Eingabefelder
+    tk.Label(root, text="Länge [mm]").grid(row=1, column=0, sticky="e")
+    var_laenge = tk.StringVar(value="239.50")
+    entry_laenge = tk.Entry(root, textvariable=var_laenge)
+    entry_laenge.grid(row=1, column=1)
+
+    tk.Label(root, text="Höhe [mm]").grid(row=2, column=0, sticky="e")
+    var_hoehe = tk.StringVar(value="44.8")
+    entry_hoehe = tk.Entry(root, textvariable=var_hoehe)
+    entry_hoehe.grid(row=2, column=1)
+
+    tk.Label(root, text="Schlitzbreite [mm]").grid(row=3, column=0, sticky="e")
+    var_schlitz = tk.StringVar(value="0.3")
+    entry_schlitz = tk.Entry(root, textvariable=var_schlitz)
+    entry_schlitz.grid(row=3, column=1)
+
+    # Radiobuttons
+    position_var = tk.StringVar(value="Senkrecht")
+    r1=tk.Radiobutton(root, text="Senkrecht   ", variable=position_var, value="Senkrecht", command=update_position)
+    r1.grid(row=1, column=2)
+    r2=tk.Radiobutton(root, text="Waagerecht", variable=position_var, value="Waagerecht", command=update_position)
+    r2.grid(row=2, column=2)
+
+    # Vorgaben-Label
+    label_vorgaben = tk.Label(root,
+        text=f"SCHLITZABSTAND = {SCHLITZABSTAND} mm | ANZAHL_SCHLITZE = {ANZAHL_SCHLITZE} | VERSCHIEBUNG = {VERSCHIEBUNG} mm",
+        font=("Arial", 8))
+    label_vorgaben.grid(row=4, column=0, columnspan=4, pady=5)
+
+    # Buttons in Reihe
+    tk.Button(root, text="Vorschau", command=start_preview).grid(row=5, column=0, pady=10)
+    tk.Button(root, text="DXF speichern", command=start_save).grid(row=5, column=1, pady=10)
+    tk.Button(root, text="Einstellungen", command=open_settings).grid(row=5, column=2, pady=10)
+    tk.Button(root, text="Beenden", command=root.destroy).grid(row=5, column=3, pady=10)
+
+    # Event-Bindung: wenn Enter gedrückt wird
+    # entry_hoehe.bind("<FocusOut>", verdopple_hoehe)
+
+    if args.startup_exit:
+        return startprofil.window_ready(root)
+
+    # Tooltips und Live-Vorschau, sobald das Fenster steht
+    root.after_idle(add_tooltips)
+    root.after_idle(create_preview)
+    root.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,47 +8,675 @@
 
 # -*- coding: utf-8 -*-
 
-import subprocess
 import tkinter as tk
-from tkinter import filedialog, messagebox
-from tkinter.scrolledtext import ScrolledText  # <-- neu
-from matplotlib import font_manager
+from tkinter import filedialog, messagebox, simpledialog
 import json
-
-import ezdxf
-from ezdxf.enums import TextEntityAlignment
-
-COLS = 11
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from wortsuche import WordIndex, missing_words, matcher_for
+from sprachpaket import sprachpaket, available as sprachpakete, STANDARD as STANDARD_SPRACHE
+from icon_bibliothek import IconBibliothek, FORMATE as ICON_FORMATE, build_icon_library_text, flash_bytes
+from raster_modell import Raster
+from zeitsimulation import simulate_day
+from bildtabelle import FORMATE as BILD_FORMATE, TAKTE as BILD_TAKTE, build_frame_table_text, zeitbilder
+from bildtabelle import flash_bytes as frame_flash_bytes
+from laserpfad import optimize_cut_order
+from trennsteg_geometrie import RAHMEN_MM, SCHLITZABSTAND as RASTER_MM, grid_lines
+import startprofil
+from zeitspur import span, traced, file_size, merge, run_traced
+from hintergrund import Hintergrundexport, write_atomic, write_atomic_all, write_text, text_writer
+import ausgabe_cache
+
+# ezdxf und glyph_konturen (matplotlib) werden erst beim DXF-Export geladen -> schneller Programmstart
+
+COLS = 11                    # Größe eines neuen Rasters beim Start, danach gilt self.raster
 ROWS = 10
+SPRACHE = STANDARD_SPRACHE   # Sprachpaket (sprachen/<name>.json)
 CELL_SIZE = 30
 LABEL_MARGIN_LEFT = 20  # Platz für Zeilenbeschriftung links
 LABEL_MARGIN_TOP = 20   # Platz für Spaltenbeschriftung oben
+ZEITEN_PAUSE_MS = 150   # Tagessimulation erst, wenn so lange keine Eingabe kam
+MAX_RASTER = 64         # größte Anzahl Reihen/Spalten in den Einstellungen
 
 DEBUG = False # True  # auf False setzen, um alle Debug-Ausgaben zu unterdrücken
 
 def debug_print(*args, **kwargs):
     if DEBUG:
-        print(*args, **kwargs) 
+        print(*args, **kwargs)
+
+
+# Vorgaben für die DXF Frontplatte (IKEA Rahmen 250x250), RAHMEN_MM und RASTER_MM kommen aus
+# trennsteg_geometrie.py - dieselben Werte wie bei den Trennstegen
+TEXT_HOEHE = 11.55
+TEXT_FONT = "MS UI Gothic"
+
+
+# ---------- Export ohne Tk (auch für den Batch-Modus) ----------
+
+def grid_layout_text(raster):
+    ROWS, COLS = raster.rows, raster.cols
+    header = """#pragma once
+
+#include "Uhrtype.hpp"
+
+"""
+    header += "/*\n"
+    header += """* Script erstellt mit Scriptmaker by M. Mahrt\n"""
+
+    header += " *           Layout Front \n"
+    header += " *                COL\n"
+    header += " *    X " + " ".join(str(c) for c in reversed(range(COLS))) + "\n"
+    header += " * ROW + " + " ".join("-" for _ in range(COLS)) + "\n"
+
+    rows_text = ""
+    for r in range(ROWS):
+        # Zellen in Reihe, von links nach rechts im Raster, werden aber rechtsbündig mit Spalten 10..0 angezeigt
+        row_letters = [letter if letter else " " for letter in raster.row(r)]
+        # Die Ausgabe soll von Spalte 10 bis 0, also reversed
+        row_letters_reversed = list((row_letters))
+        rows_text += f" *  {r}  | " + " ".join(row_letters_reversed) + "\n"
+
+    footer = " */\n"
+    return header + rows_text + footer
+
+
+# Geschätzter Flash-Bedarf von show() (Xtensa, ESP8266/ESP32, -Os) - nur für den Vergleich der beiden Varianten
+SWITCH_BYTES_FIX = 16        # Bereichsprüfung + Sprung über die Sprungtabelle
+SWITCH_BYTES_CASE = 7        # Eintrag in der Sprungtabelle (4) + break (3)
+SWITCH_BYTES_CALL = 11       # setFrontMatrixWord(r, s, e): drei Konstanten laden, this, call8
+TABELLE_BYTES_LOOP = 56      # Suchschleife + Schleife über die Spannen in show()
+
+
+def firmware_cases(words, word_positions, varzwanzig, varviertel, paket=None):
+    # Alle Fälle von show() einschließlich funk (falls das Paket es hat): [(symbole, [(reihe, start, ende), ...]), ...]
+    paket = paket or sprachpaket()
+    optionen = {"varzwanzig": varzwanzig, "varviertel": varviertel}
+    faelle = paket.cases(words, word_positions, optionen)
+    if "funk" in paket.firmware:
+        faelle.append((("funk",), [tuple(p) for p in paket.firmware["funk"]]))
+    return faelle
+
+
+def _script_head(raster, paket, varzwanzig, varviertel, tabellen=""):
+    # Layout-Kommentar, (Tabellen,) Klassenkopf bis vor show()
+    text_block = grid_layout_text(raster) + tabellen
+    text_block += f"""
+class {paket.firmware["klasse"]} : public iUhrType {{
+public:
+    virtual LanguageAbbreviation usedLang() override {{
+        return LanguageAbbreviation::{paket.kuerzel};
+    }};
+
+    virtual const bool hasZwanzig() override {{ return """
+    if varzwanzig == 1:
+        text_block += """false"""
+    elif varzwanzig == 0:
+        text_block += """true"""
+    text_block += """; }
+    virtual const bool hasDreiviertel() override { return """
+    if varviertel == 1:
+        text_block += """false"""
+    elif varviertel == 0:
+        text_block += """true"""
+    text_block += """; }
+
+"""
+    return text_block
+
+
+def build_script_text(raster, words, word_positions, varzwanzig, varviertel, paket=None):
+    # Kompletter Inhalt der .hpp Datei für die Uhr-Firmware
+    # Symbole, Reihenregeln und Verbunde (es_ist, dreiviertel) kommen aus dem Sprachpaket
+    paket = paket or sprachpaket()
+    firmware = paket.firmware
+    optionen = {"varzwanzig": varzwanzig, "varviertel": varviertel}
+
+    lines = []
+    for symbole, positionen in paket.cases(words, word_positions, optionen):
+        for symbol in symbole:
+            lines.append(f"        case FrontWord::{symbol}:")
+        for reihe, start_col, end_col in positionen:
+            lines.append(f"            setFrontMatrixWord({reihe}, {start_col}, {end_col});")
+        lines.append("             break;")
+        lines.append("")
+
+    text_block = _script_head(raster, paket, varzwanzig, varviertel)
+    text_block += """    void show(FrontWord word) override {
+        switch (word) {
+"""
+    funk = ""
+    if "funk" in firmware:
+        # nur Pakete mit Funkanzeige (firmware.funk), sonst bliebe ein leerer case stehen
+        funk = "".join(f"            setFrontMatrixWord({r}, {s}, {e});\n" for r, s, e in firmware["funk"])
+        funk = f"""
+        case FrontWord::funk:
+{funk}            break;
+"""
+    text_block_end = f"""{funk}
+        default:
+            break;
+        }};
+    }};
+}};
+
+{firmware["klasse"]} {firmware["instanz"]};
+    """
+    return text_block + "\n".join(lines) + text_block_end
+
+
+def _uint_type(max_wert):
+    # kleinster passender C-Typ und pgm_read-Funktion
+    for bits, typ, lesen in ((8, "uint8_t", "pgm_read_byte"), (16, "uint16_t", "pgm_read_word")):
+        if max_wert < 1 << bits:
+            return typ, lesen, bits
+    return "uint32_t", "pgm_read_dword", 32
+
+
+def span_table(faelle):
+    # Gemeinsames Spannen-Array und Wort-Tabelle [(symbol, offset, anzahl)]
+    # Gleiche Spannenfolgen werden nur einmal abgelegt (vor/v_vor, es_ist ...), doppelte Symbole: erster Fall gilt
+    spannen = []
+    eintraege = []
+    vorhanden = set()
+    for symbole, positionen in faelle:
+        positionen = [tuple(p) for p in positionen]
+        offset = None
+        for start in range(len(spannen) - len(positionen) + 1):
+            if spannen[start:start + len(positionen)] == positionen:
+                offset = start
+                break
+        if offset is None:
+            offset = len(spannen)
+            spannen += positionen
+        for symbol in symbole:
+            if symbol not in vorhanden:
+                vorhanden.add(symbol)
+                eintraege.append((symbol, offset, len(positionen)))
+    return spannen, eintraege
+
+
+def firmware_bytes(faelle):
+    # Geschätzte Flash-Größe von show() in Byte: {"switch": ..., "tabelle": ...}
+    switch = SWITCH_BYTES_FIX + sum(len(symbole) * SWITCH_BYTES_CASE + len(positionen) * SWITCH_BYTES_CALL
+                                    for symbole, positionen in faelle)
+    spannen, eintraege = span_table(faelle)
+    feld_bits = max(max((max(p) for p in spannen), default=0).bit_length(), 1)
+    span_bytes = _uint_type((1 << 3 * feld_bits) - 1)[2] // 8
+    index_bytes = _uint_type(max(len(spannen), 1))[2] // 8
+    tabelle = TABELLE_BYTES_LOOP + len(spannen) * span_bytes + len(eintraege) * (1 + 2 * index_bytes)
+    return {"switch": switch, "tabelle": tabelle}
+
+
+def build_table_script_text(raster, words, word_positions, varzwanzig, varviertel, paket=None):
+    # Wie build_script_text, aber show() liest gepackte Spannen (reihe, start, ende) aus einer PROGMEM-Tabelle
+    # statt eines switch; Wörter aus mehreren Teilen (es_ist, dreiviertel, funk) über Offset + Anzahl
+    paket = paket or sprachpaket()
+    firmware = paket.firmware
+    faelle = firmware_cases(words, word_positions, varzwanzig, varviertel, paket)
+    spannen, eintraege = span_table(faelle)
+    groesse = firmware_bytes(faelle)
+
+    feld_bits = max(max((max(p) for p in spannen), default=0).bit_length(), 1)
+    maske = (1 << feld_bits) - 1
+    span_typ, span_lesen, span_bits = _uint_type((1 << 3 * feld_bits) - 1)
+    index_typ, index_lesen, _ = _uint_type(max(len(spannen), 1))
+    ziffern = span_bits // 4
+    name = firmware["klasse"].removesuffix("_t")        # Tabellennamen je Klasse, z.B. De10x11Spans
+
+    tabellen = f"""
+/* show() über Tabellen: {len(eintraege)} Wörter, {len(spannen)} Spannen
+ * Flash (geschätzt): Tabelle {groesse["tabelle"]} Byte, switch {groesse["switch"]} Byte
+ * Spanne gepackt: reihe << {2 * feld_bits} | start << {feld_bits} | ende
+ */
+static const {span_typ} {name}Spans[] PROGMEM = {{
+"""
+    for offset, (r, s, e) in enumerate(spannen):
+        gepackt = r << 2 * feld_bits | s << feld_bits | e
+        tabellen += f"    0x{gepackt:0{ziffern}x},  // {offset:3d}: {r}, {s}, {e}\n"
+    tabellen += f"""}};
+
+struct {name}Word {{
+    uint8_t word;
+    {index_typ} offset;
+    {index_typ} count;
+}};
+
+static const {name}Word {name}Words[] PROGMEM = {{
+"""
+    for symbol, offset, anzahl in eintraege:
+        tabellen += f"    {{static_cast<uint8_t>(FrontWord::{symbol}), {offset}, {anzahl}}},\n"
+    tabellen += "};\n"
+
+    text_block = _script_head(raster, paket, varzwanzig, varviertel, tabellen)
+    text_block += f"""    void show(FrontWord word) override {{
+        const uint8_t w = static_cast<uint8_t>(word);
+        for (uint16_t i = 0; i < sizeof({name}Words) / sizeof({name}Words[0]); i++) {{
+            if (pgm_read_byte(&{name}Words[i].word) != w) {{
+                continue;
+            }}
+            const {index_typ} offset = {index_lesen}(&{name}Words[i].offset);
+            const {index_typ} count = {index_lesen}(&{name}Words[i].count);
+            for ({index_typ} k = 0; k < count; k++) {{
+                const {span_typ} span = {span_lesen}(&{name}Spans[offset + k]);
+                setFrontMatrixWord(span >> {2 * feld_bits}, (span >> {feld_bits}) & 0x{maske:x}, span & 0x{maske:x});
+            }}
+            return;
+        }}
+    }};
+}};
+
+{firmware["klasse"]} {firmware["instanz"]};
+"""
+    return text_block
+
+
+ICON_HEADER = """#pragma once
+
+#define GRAFIK_11X10_ROWS 10
+#define GRAFIK_11X10_COLS 11
+
+const uint16_t grafik_11x10[][11] PROGMEM = {
+"""
+
+ICON_HEND = """
+    {0b00110001100,  // 0  7 HEART  0: . . 0 0 . . . 0 0 . . : 10
+     0b01111011110,  // 1          21: . 0 0 0 0 . 0 0 0 0 . : 11
+     0b11111111111,  // 2          22: 0 0 0 0 0 0 0 0 0 0 0 : 32
+     0b11111111111,  // 3          43: 0 0 0 0 0 0 0 0 0 0 0 : 33
+     0b11111111111,  // 4          44: 0 0 0 0 0 0 0 0 0 0 0 : 54
+     0b01111111110,  // 5          65: . 0 0 0 0 0 0 0 0 0 . : 55
+     0b00111111100,  // 6          66: . . 0 0 0 0 0 0 0 . . : 76
+     0b00011111000,  // 7          87: . . . 0 0 0 0 0 . . . : 77
+     0b00001110000,  // 8          88: . . . . 0 0 0 . . . . : 98
+     0b00000100000}, // 9         109: . . . . . 0 . . . . . : 99
+
+    {0b00011111000,  // 0   8       0: . . . 0 0 0 0 0 . . . : 10
+     0b00111111100,  // 1          21: . . 0 0 0 0 0 0 0 . . : 11
+     0b01101110110,  // 2          22: . 0 0 . 0 0 0 . 0 0 . : 32
+     0b11111111111,  // 3          43: 0 0 0 0 0 0 0 0 0 0 0 : 33
+     0b11111111111,  // 4          44: 0 0 0 0 0 0 0 0 0 0 0 : 54
+     0b10111111101,  // 5          65: 0 . 0 0 0 0 0 0 0 . 0 : 55
+     0b11001110011,  // 6          66: 0 0 . . 0 0 0 . . 0 0 : 76
+     0b01110001110,  // 7          87: . 0 0 0 . . . 0 0 0 . : 77
+     0b00111111100,  // 8          88: . . 0 0 0 0 0 0 0 . . : 98
+     0b00011111000}, // 9         109: . . . 0 0 0 0 0 . . . : 99
+
+    {0b00110000000,  // 0   9       0: . . . . . 0 . . . . . : 10
+     0b00000000000,  // 1          21: . . . . . 0 . . . . . : 11
+     0b00000000000,  // 2          22: . . 0 0 . 0 . 0 0 . . : 32
+     0b00000000000,  // 3          43: . . 0 0 . 0 . 0 0 . . : 33
+     0b00000001100,  // 4          44: . . . . 0 0 0 . . . . : 54
+     0b00000000000,  // 5          65: . 0 0 0 0 0 0 0 0 0 . : 55
+     0b00000000000,  // 6          66: . . . . 0 0 0 . . . . : 76
+     0b00000000000,  // 7          87: . . 0 0 . 0 . 0 0 . . : 77
+     0b00000000000,  // 8          88: . . 0 0 . 0 . 0 0 . . : 98
+     0b00000111000}, // 9         109: . . . . . 0 . . . . . : 99
+
+    {0b00000000000,  //   10        0: . . . . . . . . . . . : 10
+     0b00000000000,  //             0: . . . . . . . . . . . : 21
+     0b00000000000,  //             0: . . . . . . . . . . . : 32
+     0b10001010001,  //             0: 0 . . . 0 . 0 . . . 0 : 43
+     0b11011011011,  //             0: 0 0 . 0 0 . 0 0 . 0 0 : 54
+     0b10101010101,  //             0: 0 . 0 . 0 . 0 . 0 . 0 : 65
+     0b10001010001,  //             0: 0 . . . 0. .0. . . .0.: 76
+     0b10001010001,  //             0: 0. . . .0 . 0 . . . 0 : 87
+     0b00000000000,  //             0: . . . . . . . . . . . : 98
+     0b00000000000}, //             0: . . . . . . . . . . . : 99
+};
+    """
+
+
+def build_icon_text(raster):
+    # Inhalt der Icon.h Datei im bisherigen Format (aktuelle Markierung 7x + feste Icons), Format "alt"
+    ROWS, COLS = raster.rows, raster.cols
+    lines = []
+    bin_strs = []
+    letters_list = []
+
+    # Erzeuge alle Binärstrings + Buchstaben separat
+    for r in range(ROWS):
+        bits = raster.row_bits(r)
+        letters = ' '.join(letter if letter else ' ' for letter in raster.row(r))
+        bin_strs.append(bits)
+        letters_list.append(letters)
+
+    # Formatiere jede Zeile mit korrektem Abstand
+    for r in range(ROWS):
+        if r == 0:
+            bin_part = f'{{0b{bin_strs[r]}, '   # öffnende Klammer voran, Komma dahinter
+        elif r == ROWS - 1:
+            bin_part = f' 0b{bin_strs[r]}}},'  # schließende Klammer hinten, Komma dahinter
+        else:
+            bin_part = f' 0b{bin_strs[r]}, '    # normal mit Komma
+
+        # Definiere Gesamtabstand bis zu den Buchstaben (z.B. 15 Zeichen)
+        total_bin_width = len(f'{{0b{"0"*COLS},')
+
+
+        # Berechne wie viele Leerzeichen noch, damit alle Buchstaben bei gleicher Spalte starten
+        spaces_needed = total_bin_width - len(bin_part)
+        spaces_needed = max(spaces_needed, 0)
+
+        # Erzeuge Leerzeichen, dann Buchstaben mit Kommentar
+        line = bin_part + (" " * spaces_needed) + " " + f"//           {letters_list[r]}//"
+        lines.append(line)
+
+    frame = "\n".join("    " + line for line in lines) + "\n" + "\n"
+    return ICON_HEADER + frame * 7 + ICON_HEND
+
+
+def selection_rows(raster):
+    # aktuelle Markierung als Icon-Zeilen (höchste Spalte = höchstes Bit, wie row_bits)
+    return [raster.row_mask(r) for r in range(raster.rows)]
+
+
+def build_icons(raster, format="alt", bibliothek=None):
+    # Icon .h Datei: "alt" wie bisher, sonst Icon-Bibliothek (Markierung = Icon "auswahl") im gewählten Format
+    # Rückgabe (text, format, hinweis): passt die Bibliothek nicht zur Rastergröße, wird das bisherige Format
+    # je Vorlage geschrieben (format "alt") und hinweis sagt warum, sonst ist hinweis None
+    if format == "alt":
+        return build_icon_text(raster), "alt", None
+    bibliothek = bibliothek or IconBibliothek.load()
+    if (bibliothek.zeilen, bibliothek.spalten) != (raster.rows, raster.cols):
+        return build_icon_text(raster), "alt", (f"Icon-Bibliothek ist für {bibliothek.spalten}×{bibliothek.zeilen} "
+                                                f"Felder, Raster {raster.cols}×{raster.rows}: Icons im Format alt")
+    return build_icon_library_text(bibliothek, selection_rows(raster), format), format, None
+
+
+def build_frames(bericht, raster, takt=5, format="delta", paket=None):
+    # Bildtabelle .h aus der Tagessimulation: (text, Flash-Bedarf je Format)
+    paket = paket or sprachpaket()
+    bilder = zeitbilder(bericht, takt)
+    groessen = frame_flash_bytes(bilder, len(bilder[0]), raster.cols, 60 // takt)
+    text = build_frame_table_text(bericht, raster.cells, takt, format, f"{paket.kuerzel} {raster.cols}x{raster.rows}")
+    return text, groessen
+
+
+def frame_size_text(groessen, format):
+    return f"{format} {groessen[format]} B, Kompression {groessen['roh'] / groessen[format]:.1f}:1"
+
+
+def letter_style(letter, text_height):
+    # (Texthöhe, Breitenfaktor, Versatz in y) für einen Buchstaben
+    # Zu hohe Glyphen (Umlaute) werden gestaucht - Faktor aus den gemessenen Glyph-Grenzen der Schrift
+    import glyph_konturen
+    path = glyph_konturen.font_file(TEXT_FONT, fallback=False)
+    if path and letter.strip():
+        factor = glyph_konturen.height_factor(letter, path)
+        Buchbreite = str(round(1 / factor, 3)) if factor < 1 else "1.0"
+    elif letter =="Ü" or letter =="Ö" or letter =="Ä":
+        factor, Buchbreite = 0.8571, "1.15"   # Schrift nicht installiert: bisherige Werte
+    else:
+        factor, Buchbreite = 1.0, "1.0"
+    if factor < 1:
+        umlaut_height = text_height * factor
+        return umlaut_height, Buchbreite, -((text_height - umlaut_height) / 2)
+    return text_height, Buchbreite, 0
+
+
+def build_letter_grid_doc(letters, row_count, col_count, x_spacing, y_spacing, text_height, rahmen_mm,
+                          minanzeige=0, use_blocks=False, outlines=False, fortschritt=None):
+    # fortschritt(anteil, text): Rückmeldung für den Hintergrund-Export (darf Abgebrochen werfen)
+    fortschritt = fortschritt or (lambda anteil, text=None: None)
+    fortschritt(0.0, "Schrift laden" if outlines else "Buchstaben")
+    with span("import ezdxf"):
+        import ezdxf
+        from ezdxf.enums import TextEntityAlignment
+        import glyph_konturen
+
+    # Neue DXF-Datei
+    doc = ezdxf.new(dxfversion='AC1027')
+    doc.units = ezdxf.units.MM
+    msp = doc.modelspace()
+
+    # Textstil anlegen (falls nicht vorhanden)
+    if "myStandard" not in doc.styles:
+        doc.styles.new("myStandard", dxfattribs={"font": "MS UI Gothic.ttf"})
+
+    font_path = glyph_konturen.font_file(TEXT_FONT) if outlines else None
+
+    def add_letter(layout, letter, x, y):
+        if outlines:
+            # echte Konturen statt TEXT, unabhängig von den Schriften beim Laserdienst
+            for polygon in glyph_konturen.glyph_outline(letter, font_path, text_height):
+                layout.add_lwpolyline([(x + px, y + py) for px, py in polygon], close=True)
+            return
+
+        height, Buchbreite, dy = letter_style(letter, text_height)
+        text_entity = layout.add_text(
+            letter,
+            dxfattribs={
+                "height": height,
+                "style": "myStandard",
+                "width": Buchbreite
+            }
+        )
+        # zentrierte Platzierung
+        text_entity.set_placement((x, y + dy), align=TextEntityAlignment.MIDDLE_CENTER)
+
+    # Block-Modus: jeder Buchstabe wird nur einmal als BLOCK definiert und per INSERT platziert
+    blocks = {}
+
+    def letter_block(letter):
+        name = blocks.get(letter)
+        if name is None:
+            name = f"ZEICHEN_{ord(letter):04X}"
+            add_letter(doc.blocks.new(name=name), letter, 0, 0)
+            blocks[letter] = name
+        return name
+
+    # Buchstaben platzieren, mittig im Rahmen (gleiches Raster wie die Schlitze der Trennstege)
+    x_mitten, y_mitten, _, _ = grid_lines(row_count, col_count, x_spacing, y_spacing, rahmen_mm)
+    x_mitten, y_mitten = x_mitten.tolist(), y_mitten.tolist()
+    with span("buchstaben", bloecke=bool(use_blocks), konturen=bool(outlines)) as s:
+        for row in range(row_count):
+            fortschritt(0.9 * row / row_count, "Buchstaben")
+            for col in range(col_count):
+                if row < len(letters) and col < len(letters[row]):
+                    letter = letters[row][col]
+                    x = x_mitten[col]
+                    y = y_mitten[row]  # Reihen nach unten
+
+                    if not use_blocks:
+                        add_letter(msp, letter, x, y)
+                    elif letter:
+                        msp.add_blockref(letter_block(letter), (x, y))
+        s.set(entities=len(msp), zeichen_bloecke=len(blocks))
+
+    # Minutenpunkte
+    if minanzeige != 1:
+        radius = y_spacing/8
+        y = y_mitten[-1] - y_spacing  # eine Reihe unter der letzten
+        if use_blocks:
+            doc.blocks.new(name="MINUTENPUNKT").add_circle(center=(0, 0), radius=radius)
+        for i in range(4):
+            x = (rahmen_mm/2) -(3 * x_spacing) + (i * x_spacing * 2)
+            center = (x, y)
+            if use_blocks:
+                msp.add_blockref("MINUTENPUNKT", center)
+            else:
+                msp.add_circle(center=center, radius=radius)
+
+    # RRahmen
+    square_points = [
+        (0, 0),
+        (rahmen_mm, 0),
+        (rahmen_mm, rahmen_mm),
+        (0, rahmen_mm),
+    ]
+   # geschlossenes Quadrat als eine Polyline
+    rahmen = msp.add_lwpolyline(square_points, close=True)
+
+    # Schneidreihenfolge für kurze Leerfahrten, der Rahmen zuletzt
+    fortschritt(0.9, "Laserpfad")
+    with span("laserpfad", entities=len(msp)) as s:
+        vorher, nachher = optimize_cut_order(msp, ist_aussen=lambda entity: entity is rahmen)
+        s.set(leerweg_vorher=round(vorher, 1), leerweg_nachher=round(nachher, 1))
+    return doc
+
+
+def load_template_file(path):
+    # Liest eine Vorlage - Format von save_template oder reines 2D-Array (z.B. TEMP/bundes.json)
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    raster = Raster.from_template(data)
+    options = data if isinstance(data, dict) else {}
+    return {
+        "raster": raster,
+        "varzwanzig": int(options.get("varzwanzig", 0)),
+        "varviertel": int(options.get("varviertel", 0)),
+        "minanzeige": int(options.get("minanzeige", 0)),
+        "sprache": options.get("sprache"),
+    }
+
+
+# ---------- Batch-Modus ----------
+
+def export_parameter(paket, use_blocks, outlines, tabelle, icon_format, bildtabelle, bildtakt):
+    # alles außer der Vorlage, was die Dateien eines Exports bestimmt (Schlüssel für den Ausgabe-Cache)
+    from trennsteg_geometrie import SCHLITZABSTAND, ANZAHL_SCHLITZE, VERSCHIEBUNG, TRENNSTEGHOEHE
+    return {
+        "sprache": paket.name, "bloecke": bool(use_blocks), "konturen": bool(outlines), "tabelle": bool(tabelle),
+        "icons": icon_format, "bildtabelle": bildtabelle, "bildtakt": bildtakt if bildtabelle else None,
+        "raster_mm": RASTER_MM, "text_hoehe": TEXT_HOEHE, "text_font": TEXT_FONT, "rahmen_mm": RAHMEN_MM,
+        "trennsteg": [SCHLITZABSTAND, ANZAHL_SCHLITZE, VERSCHIEBUNG, TRENNSTEGHOEHE],
+    }
+
+
+def export_template(path, out_dir, use_blocks=False, outlines=False, sprache=None, tabelle=False,
+                    icon_format="alt", nur_pruefen=False, bildtabelle=None, bildtakt=5, cache=True):
+    # Worker für den Prozesspool: schreibt .hpp, Icon .h und .dxf zu einer Vorlage
+    # Sprachpaket aus der Vorlage, sonst sprache (Standard: deutsch); tabelle: .hpp mit PROGMEM-Tabelle
+    # icon_format: bits/rle/delta (Icon-Bibliothek) oder alt; nur_pruefen: Wortprüfung und Tagessimulation ohne Dateien
+    # bildtabelle: dict/delta schreibt zusätzlich _frames.h mit einem LED-Bild je bildtakt Minuten
+    # cache: unveränderte Vorlagen aus dem Ausgabe-Cache kopieren statt neu zu erzeugen
+    # Rückgabe: (pfad, ok, meldung, dauer_s)
+    start = time.perf_counter()
+    name = os.path.splitext(os.path.basename(path))[0]
+    try:
+        vorlage = load_template_file(path)
+    except (OSError, ValueError) as e:
+        return path, False, f"Vorlage konnte nicht geladen werden: {e}", time.perf_counter() - start
+
+    try:
+        paket = sprachpaket(vorlage["sprache"] or sprache or STANDARD_SPRACHE)
+    except ValueError as e:
+        return path, False, str(e), time.perf_counter() - start
+
+    ziele = {endung: os.path.join(out_dir, name + endung)
+             for endung in (".hpp", "_icons.h", ".dxf") + (("_frames.h",) if bildtabelle else ())}
+    key = None
+    if cache and not nur_pruefen:
+        key = ausgabe_cache.cache_key(vorlage, export_parameter(paket, use_blocks, outlines, tabelle, icon_format,
+                                                                bildtabelle, bildtakt))
+        meldung = ausgabe_cache.lookup(key, ziele)
+        if meldung is not None:
+            return path, True, f"(Cache) {meldung}".rstrip(), time.perf_counter() - start
+
+    raster = vorlage["raster"]
+    word_positions, _ = raster.find_words(paket.words, paket)
+    fehlend = missing_words(paket.words, word_positions, vorlage["varzwanzig"], vorlage["varviertel"], paket)
+    if fehlend:
+        return path, False, "Wörter nicht gefunden: " + ", ".join(fehlend), time.perf_counter() - start
+
+    optionen = {"varzwanzig": vorlage["varzwanzig"], "varviertel": vorlage["varviertel"]}
+    bericht = simulate_day(paket.words, word_positions, raster.rows, raster.cols, optionen, vorlage["minanzeige"],
+                           paket)
+    if not bericht.ok:
+        return path, False, "; ".join(bericht.meldungen()), time.perf_counter() - start
+    if nur_pruefen:
+        return path, True, "; ".join(bericht.meldungen()), time.perf_counter() - start
+
+    # alle Ausgaben erst im Speicher erzeugen, geschrieben wird nur, wenn jeder Schritt gelungen ist
+    # (sonst bliebe z.B. ein neues .hpp neben einem alten .dxf liegen)
+    build = build_table_script_text if tabelle else build_script_text
+    script = build(raster, paket.words, word_positions, vorlage["varzwanzig"], vorlage["varviertel"], paket)
+    meldungen = bericht.meldungen()
+
+    try:
+        icons, _, hinweis = build_icons(raster, icon_format)
+    except (OSError, ValueError) as e:
+        return path, False, f"Icons: {e}", time.perf_counter() - start
+    if hinweis:
+        meldungen.append(hinweis)
+
+    auftraege = {ziele[".hpp"]: text_writer(script), ziele["_icons.h"]: text_writer(icons)}
+    if bildtabelle:
+        try:
+            text, groessen = build_frames(bericht, raster, bildtakt, bildtabelle, paket)
+        except ValueError as e:
+            return path, False, f"Bildtabelle: {e}", time.perf_counter() - start
+        auftraege[ziele["_frames.h"]] = text_writer(text)
+        meldungen.append("Bildtabelle " + frame_size_text(groessen, bildtabelle))
+
+    doc = build_letter_grid_doc(raster.cells, raster.rows, raster.cols, RASTER_MM, RASTER_MM,
+                                TEXT_HOEHE, RAHMEN_MM, vorlage["minanzeige"], use_blocks, outlines)
+    auftraege[ziele[".dxf"]] = doc.saveas
+    try:
+        write_atomic_all(auftraege)
+    except OSError as e:
+        return path, False, f"Schreiben: {e}", time.perf_counter() - start
+    meldung = "; ".join(meldungen + (["leere Felder"] if raster.has_empty() else []))
+    if tabelle:
+        groesse = firmware_bytes(firmware_cases(paket.words, word_positions, vorlage["varzwanzig"],
+                                                vorlage["varviertel"], paket))
+        meldung = f"Tabelle ~{groesse['tabelle']} B, switch ~{groesse['switch']} B  {meldung}"
+    if key is not None:
+        ausgabe_cache.store(key, ziele, meldung)
+    return path, True, meldung, time.perf_counter() - start
+
+
+def run_batch(vorlagen_dir, out_dir=None, jobs=None, use_blocks=False, outlines=False, sprache=None,
+              tabelle=False, icon_format="alt", nur_pruefen=False, bildtabelle=None, bildtakt=5, cache=True):
+    out_dir = out_dir or vorlagen_dir
+    if not nur_pruefen:
+        os.makedirs(out_dir, exist_ok=True)
+    paths = sorted(glob.glob(os.path.join(vorlagen_dir, "*.json")))
+    if not paths:
+        print(f"Keine Vorlagen (*.json) in {vorlagen_dir} gefunden")
+        return 2
+
+    start = time.perf_counter()
+    fehler = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_traced, export_template, p, out_dir, use_blocks, outlines, sprache, tabelle,
+                               icon_format, nur_pruefen, bildtabelle, bildtakt, cache) for p in paths]
+        for future in as_completed(futures):
+            (path, ok, meldung, dauer), events = future.result()
+            merge(events)
+            status = "OK    " if ok else "FEHLER"
+            print(f"{status} {dauer*1000:8.1f} ms  {os.path.basename(path)}  {meldung}".rstrip())
+            if not ok:
+                fehler += 1
+
+    gesamt = time.perf_counter() - start
+    print(f"{len(paths)} Vorlagen in {gesamt:.2f} s, {fehler} fehlerhaft")
+    if cache and not nur_pruefen:
+        eintraege, geloescht, groesse = ausgabe_cache.trim()
+        print(f"Ausgabe-Cache: {eintraege} Einträge, {groesse / 1024 / 1024:.1f} MB"
+              + (f", {geloescht} alte gelöscht" if geloescht else ""))
+    return 1 if fehler else 0
 
 class GridApp(tk.Tk):  # Hauptklasse für die Anwendung
 
 
-    def __init__(self):  # Konstruktor der Hauptklasse
+    def __init__(self, raster=None):  # Konstruktor der Hauptklasse, raster: Inhalt übernehmen (ROWS×COLS)
 
         super().__init__()  # Aufruf des Konstruktors der Basisklasse
 
         self.title("Scriptmaker by MAHTec (C) M.Mahrt V2.1")  # Fenster Titel
         self.configure(bg="#f0f0f0")  # Hintergrundfarbe
 
-        self.cells = [["" for _ in range(COLS)] for _ in range(ROWS)] #
-        self.selected = [[False for _ in range(COLS)] for _ in range(ROWS)]
+        self.raster = raster if raster is not None else Raster(ROWS, COLS)  # Buchstaben + Markierung, die GUI ist nur die Ansicht dazu
 
-        self.words = [
-            "UHR","EINS", "ZWEI", "DREI",
-            "VIER", "FÜNF", "SECHS", "SIEBEN", "ACHT", "NEUN", "ZEHN",
-            "ELF", "ZWÖLF", "EIN", "ES", "IST", "FÜNF", "ZEHN", "HALB", "ZWANZIG",
-            "VOR", "NACH", "DREI", "VIERTEL"
-        ]                                                          # Wortliste
+        self.paket = sprachpaket(SPRACHE)                         # Wortliste, Regeln, Firmware-Symbole
+        self.words = self.paket.words                              # Wortliste
 
         # Main frame für Wörter und Raster nebeneinander
         main_frame = tk.Frame(self, bg="#f0f0f0")
@@ -59,6 +687,7 @@ class GridApp(tk.Tk):  # Hauptklasse für die Anwendung
         self.word_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0,10))
 
         self.word_labels = []
+        self.label_colors = {}   # aktuelle Farbe je Label, nur Änderungen werden gesetzt
         for i, w in enumerate(self.words):
             lbl = tk.Label(self.word_frame, text=w, font=("Helvetica", 12), anchor="w", width=15, bg="#f0f0f0")
             r = i % 12
@@ -69,17 +698,25 @@ class GridApp(tk.Tk):  # Hauptklasse für die Anwendung
         self.varzwanzig = tk.IntVar()
         self.varviertel = tk.IntVar()
         self.minanzeige = tk.IntVar()
+        self.dxf_bloecke = tk.IntVar()
+        self.dxf_konturen = tk.IntVar()
+        self.script_tabelle = tk.IntVar()
+
+        self.optionen = {"varzwanzig": self.varzwanzig, "varviertel": self.varviertel}
 
+        # Texte aus dem Sprachpaket, Optionen ohne Wort in dieser Sprache sind gesperrt
         cb1 = tk.Checkbutton(
             self.word_frame,
-            text="Uhr hat KEINE Anzeige ZWANZIG",
+            text=self.paket.optionen.get("varzwanzig", "Uhr hat KEINE Anzeige ZWANZIG"),
             variable=self.varzwanzig,
+            state=tk.NORMAL if "varzwanzig" in self.paket.optionen else tk.DISABLED,
             command=self.check_words  # <-- hier
         )
         cb2 = tk.Checkbutton(
             self.word_frame,
-            text="Uhr hat KEINE Anzeige DREIVIERTEL",
+            text=self.paket.optionen.get("varviertel", "Uhr hat KEINE Anzeige DREIVIERTEL"),
             variable=self.varviertel,
+            state=tk.NORMAL if "varviertel" in self.paket.optionen else tk.DISABLED,
             command=self.check_words  # <-- hier
         )
 
@@ -98,35 +735,64 @@ class GridApp(tk.Tk):  # Hauptklasse für die Anwendung
         cb2.grid(row=max_rows+1, column=0, columnspan=max_cols, sticky="w", padx=7, pady=1)
         cb3.grid(row=max_rows+2, column=0, columnspan=max_cols, sticky="w", padx=7, pady=1)
 
+        cb4 = tk.Checkbutton(
+            self.word_frame,
+            text="DXF: Buchstaben als Blöcke",
+            variable=self.dxf_bloecke
+        )
+        cb4.grid(row=max_rows+3, column=0, columnspan=max_cols, sticky="w", padx=7, pady=1)
+
+        cb5 = tk.Checkbutton(
+            self.word_frame,
+            text="DXF: Buchstaben als Konturen",
+            variable=self.dxf_konturen
+        )
+        cb5.grid(row=max_rows+4, column=0, columnspan=max_cols, sticky="w", padx=7, pady=1)
+
+        cb6 = tk.Checkbutton(
+            self.word_frame,
+            text="Script: Tabelle (PROGMEM) statt switch",
+            variable=self.script_tabelle
+        )
+        cb6.grid(row=max_rows+5, column=0, columnspan=max_cols, sticky="w", padx=7, pady=1)
+
         # Raster rechts
         right_frame = tk.Frame(main_frame, bg="#f0f0f0")
         right_frame.pack(side=tk.LEFT, fill=tk.NONE)
 
         #tk.Label(right_frame, text="Raster 11×10", font=("Helvetica", 14, "bold"), bg="#f0f0f0").pack(pady=(10, 0))
-        tk.Label(
+        self.raster_label = tk.Label(
             right_frame,
-             text=f"Raster {COLS}×{ROWS}",   # f-String für Variablen
+             text=f"Raster {self.raster.cols}×{self.raster.rows}",   # f-String für Variablen
             font=("Helvetica", 14, "bold"),
             bg="#f0f0f0"
-            ).pack(pady=(10, 0))
+            )
+        self.raster_label.pack(pady=(10, 0))
 
-        self.canvas = tk.Canvas(right_frame, width=COLS*CELL_SIZE, height=ROWS*CELL_SIZE,
+        self.canvas = tk.Canvas(right_frame, width=self.raster.cols*CELL_SIZE, height=self.raster.rows*CELL_SIZE,
                                 bg="white", highlightthickness=2, highlightbackground="#999999")
         self.canvas.pack(side=tk.TOP, padx=10, pady=10)
 
+        # Ergebnis der Tagessimulation (alle 1440 Minuten), wird nach jeder Änderung neu berechnet
+        self.zeiten_label = tk.Label(right_frame, text="", font=("Helvetica", 9), bg="#f0f0f0",
+                                     wraplength=self.raster.cols*CELL_SIZE, justify="left")
+        self.zeiten_label.pack(side=tk.TOP, padx=10)
+        self.zeiten_job = None
+        self.export = None       # laufender Hintergrund-Export (hintergrund.Hintergrundexport)
+
         self.rectangles, self.text_items = {}, {}
-        for r in range(ROWS):
-            for c in range(COLS):
-                x0, y0 = c*CELL_SIZE, r*CELL_SIZE
-                rect = self.canvas.create_rectangle(x0, y0, x0+CELL_SIZE, y0+CELL_SIZE,
-                                                     outline="#cccccc", fill="white")
-                text = self.canvas.create_text(x0+CELL_SIZE/2, y0+CELL_SIZE/2,
-                                                text="", font=("Helvetica", 14), )
-                self.rectangles[(r,c)], self.text_items[(r,c)] = rect, text
+        self.drawn = {}        # (fill, text, outline) wie aktuell auf dem Canvas
+        self.dirty = set()     # Zellen, die neu gezeichnet werden müssen
+        for r in range(self.raster.rows):
+            for c in range(self.raster.cols):
+                self.create_cell(r, c)
+        if raster is not None:
+            self.dirty.update(self.rectangles)
 
         self.canvas.bind("<Button-1>", self.click_cell)
         self.bind("<Key>", self.key_press)
         self.current_cell = (0, 0)
+        self.drawn_cursor = None
         self.highlight_current_cell()
         self.focus_set()
 
@@ -152,113 +818,164 @@ class GridApp(tk.Tk):  # Hauptklasse für die Anwendung
         self.export_button = tk.Button(btn_frame, text="icons erstellen", command=self.export_txt)
         self.export_button.pack(side="left", padx=4)
 
+        self.icon_format = tk.StringVar(value="alt")     # Format der Icon .h Datei, Bibliothek nur auf Wunsch
+        tk.OptionMenu(btn_frame, self.icon_format, "alt", *ICON_FORMATE).pack(side="left", padx=4)
+
+        tk.Button(btn_frame, text="Icon merken", command=self.save_icon).pack(side="left", padx=4)
+
+        # Bildtabelle: fertige LED-Bilder je Uhrzeit für Firmware ohne Wortlogik
+        bild_frame = tk.Frame(right_frame, bg="#f0f0f0")
+        bild_frame.pack(side=tk.TOP, pady=(0,10))
+        tk.Button(bild_frame, text="Bildtabelle erstellen", command=self.generate_frame_table).pack(side="left", padx=4)
+        self.bild_format = tk.StringVar(value="delta")
+        tk.OptionMenu(bild_frame, self.bild_format, *BILD_FORMATE).pack(side="left", padx=4)
+        self.bild_takt = tk.StringVar(value=str(BILD_TAKTE[0]))
+        tk.OptionMenu(bild_frame, self.bild_takt, *map(str, BILD_TAKTE)).pack(side="left", padx=4)
+        tk.Label(bild_frame, text="Minuten je Bild", bg="#f0f0f0").pack(side="left")
+
         self.check_words()
 
     
+    def create_cell(self, r, c):
+        # Canvas-Objekte eines Feldes (leer gezeichnet, den Inhalt setzt render)
+        x0, y0 = c*CELL_SIZE, r*CELL_SIZE
+        rect = self.canvas.create_rectangle(x0, y0, x0+CELL_SIZE, y0+CELL_SIZE,
+                                             outline="#cccccc", fill="white")
+        text = self.canvas.create_text(x0+CELL_SIZE/2, y0+CELL_SIZE/2,
+                                        text="", font=("Helvetica", 14), )
+        self.rectangles[(r,c)], self.text_items[(r,c)] = rect, text
+        self.drawn[(r,c)] = ("white", "", "#cccccc")
+
+    def resize_grid(self, rows, cols):
+        # Raster ohne Neustart vergrößern/verkleinern, der Inhalt bleibt erhalten
+        self.raster.resize(rows, cols)
+        self.fit_canvas()
+        self.check_words()
+
+    def fit_canvas(self):
+        # Canvas an die Größe von self.raster anpassen: nur Felder, die hinzukommen oder wegfallen,
+        # bekommen neue bzw. verlieren ihre Canvas-Objekte
+        rows, cols = self.raster.rows, self.raster.cols
+        for cell in [cell for cell in self.rectangles if cell[0] >= rows or cell[1] >= cols]:
+            self.canvas.delete(self.rectangles.pop(cell), self.text_items.pop(cell))
+            del self.drawn[cell]
+        self.dirty.intersection_update(self.rectangles)
+        for r in range(rows):
+            for c in range(cols):
+                if (r, c) not in self.rectangles:
+                    self.create_cell(r, c)
+                    self.dirty.add((r, c))
+
+        self.canvas.config(width=cols*CELL_SIZE, height=rows*CELL_SIZE)
+        self.raster_label.config(text=f"Raster {cols}×{rows}")
+        self.zeiten_label.config(wraplength=cols*CELL_SIZE)
+        if self.drawn_cursor not in self.rectangles:
+            self.drawn_cursor = None
+        r, c = self.current_cell
+        self.current_cell = (min(r, rows-1), min(c, cols-1))
+        self.highlight_current_cell()
+
     def click_cell(self, event):
         col, row = event.x//CELL_SIZE, event.y//CELL_SIZE
         debug_print(f"Clicked cell: ({row}, {col})")  # Debug-Ausgabe
-        if 0<=row<ROWS and 0<=col<COLS:
+        if 0<=row<self.raster.rows and 0<=col<self.raster.cols:
             self.current_cell = (row,col)
-            if self.cells[row][col]:
-                self.selected[row][col] = not self.selected[row][col]
+            if self.raster.get(row, col):
+                self.raster.toggle(row, col)
             else:
-                self.selected[row][col] = False
-            self.refresh_all()
+                self.raster.set_selected(row, col, False)
+            self.dirty.add((row, col))
+            self.highlight_current_cell()
 
     def key_press(self, event):
         if self.current_cell is None: return
         r, c = self.current_cell
+        old = self.raster.get(r, c)
         if event.keysym in ("BackSpace", "Delete", "space"):
-            self.cells[r][c] = ""
-            self.selected[r][c] = False
+            self.raster.set(r, c, "")
+            self.raster.set_selected(r, c, False)
             self.move_to_next_cell()
         else:
             ch = event.char.upper()
             if ch.isalnum() and len(ch) == 1:
-                self.cells[r][c] = ch
-                self.selected[r][c] = False
+                self.raster.set(r, c, ch)
+                self.raster.set_selected(r, c, False)
                 self.move_to_next_cell()
-        self.refresh_all()
-        self.check_words() # <= Hier aktualisieren
+        self.dirty.add((r, c))
+        self.highlight_current_cell()
+        if self.raster.get(r, c) != old:
+            self.check_row(r) # <= nur die geänderte Reihe prüfen
 
  
+    @traced("check_words")
     def check_words(self):
-        
-        ROWS = len(self.cells)
-        COLS = len(self.cells[0])
-        
-        # Vorherige Positionen leeren
-        self.word_positions = []
-        results = [False] * len(self.words)
-        
-        # Hilfsfunktion zur Positionssuche
-        def find_word_positions(word):
-            positions = []
-            length = len(word)
-            for r in range(ROWS):
-                for c in range(COLS - length + 1):
-                    segment = ''.join(self.cells[r][c + i] for i in range(length))
-                    if segment.upper() == word.upper():
-                        # Positionszählung von rechts nach links
-                        start_rev = COLS - 1 - (c + length - 1)
-                        end_rev = COLS - 1 - c
-                        positions.append((r, start_rev, end_rev))
-            return positions
-
-        for i, word in enumerate(self.words):
-            # EIN wird zu Zahlenwort (Index 13 in self.words)
-            if word == "EIN":
-                word_index = 13
-            else:
-                word_index = i
-            
-            found_positions = find_word_positions(word)
-            
-            # Bereichsregel
-            if word_index == 0 or (1 <= word_index <= 12) or word_index == 13:  # Zahlenwörter
-                allowed_rows = set(range(3, ROWS))  # ab Reihe 3
-            else:  # sonstige Wörter
-                allowed_rows = set(range(0, 5))  # bis Reihe 4
-
-            # Filter auf erlaubte Reihen
-            valid_positions = [(r, s, e) for r, s, e in found_positions if r in allowed_rows]
-            
-            if valid_positions:
-                for r, s, e in valid_positions:
-                    self.word_positions.append((word_index, word, r, s, e, True))
-                results[i] = True
-            else:
-                self.word_positions.append((word_index, word, None, None, None, False))
-                results[i] = False
+
+        # Trefferindex für das ganze Raster neu aufbauen
+        self.word_index = WordIndex(self.words, self.raster, self.paket)
+        self.word_positions = self.word_index.word_positions()
 
         # Debug-Ausgabe
         for idx, wort, r, s, e, gefunden in self.word_positions:
             debug_print(f"Index {idx}: Wort '{wort}', Reihe={r}, Start={s}, Ende={e}, Gefunden={'Ja' if gefunden else 'Nein'}")
-        
-        # Farben setzen
-        for idx, wort, r, s, e, gefunden in self.word_positions:
-            # Zuerst die Sonderfälle prüfen
-            if (wort == "ZWANZIG" and getattr(self, "varzwanzig", tk.IntVar()).get()) \
-            or (wort == "DREI" and getattr(self, "varviertel", tk.IntVar()).get() and idx >= 13):
+
+        self.update_word_labels(range(len(self.words)))
+        self.schedule_check_times()
+
+    def check_row(self, r):
+        # Inkrementelle Prüfung nach einer Eingabe in Reihe r
+        changed = self.word_index.update_row(self.raster, r)
+        if changed:
+            self.update_word_labels(changed)
+        self.schedule_check_times()
+
+    def schedule_check_times(self):
+        # mehrere Eingaben hintereinander -> nur eine Simulation nach der letzten (auch der erste Aufbau
+        # des Fensters wartet nicht auf NumPy)
+        if self.zeiten_job is not None:
+            self.after_cancel(self.zeiten_job)
+        self.zeiten_job = self.after(ZEITEN_PAUSE_MS, self.check_times)
+
+    @traced("check_times")
+    def check_times(self):
+        self.zeiten_job = None
+        optionen = {name: var.get() for name, var in self.optionen.items()}
+        bericht = simulate_day(self.words, self.word_index.word_positions(), self.raster.rows, self.raster.cols,
+                               optionen, self.minanzeige.get(), self.paket)
+        meldungen = bericht.meldungen()
+        if not bericht.ok:
+            text, farbe = "\n".join(meldungen), "red"
+        elif meldungen:
+            text, farbe = "Alle Uhrzeiten darstellbar, aber:\n" + "\n".join(meldungen), "#b36b00"
+        else:
+            text, farbe = "Alle 1440 Minuten darstellbar", "green"
+        self.zeiten_label.config(text=text, fg=farbe)
+
+    def update_word_labels(self, indices):
+        # Farben setzen - nur Labels, deren Farbe sich ändert
+        optionen = {name: var.get() for name, var in self.optionen.items()}
+        for idx in indices:
+            # Zuerst die Sonderfälle prüfen (Wort entfällt durch eine Checkbox)
+            if self.paket.optional(idx, optionen):
                 fg_color = "blue"
             else:
                 # Normale Logik
-                if gefunden:
+                if self.word_index.found(idx):
                     fg_color = "green"
                 else:
                     fg_color = "red"
 
-            self.word_labels[idx].config(fg=fg_color)
+            if self.label_colors.get(idx) != fg_color:
+                self.word_labels[idx].config(fg=fg_color)
+                self.label_colors[idx] = fg_color
 
 
     def move_to_next_cell(self):
         r, c = self.current_cell
         c += 1
-        if c >= COLS:
+        if c >= self.raster.cols:
             c = 0
             r += 1
-            if r >= ROWS:
+            if r >= self.raster.rows:
                 r = 0
         self.current_cell = (r, c)
 
@@ -267,135 +984,101 @@ class GridApp(tk.Tk):  # Hauptklasse für die Anwendung
         if (r, c) == self.current_cell:
             bg = "#add8e6"
         else:
-            bg = "#ffcc66" if self.selected[r][c] else ("#aaffaa" if self.cells[r][c] else "white")
-        self.canvas.itemconfig(self.rectangles[(r,c)], fill=bg)
-        self.canvas.itemconfig(self.text_items[(r,c)], text=self.cells[r][c])
+            bg = "#ffcc66" if self.raster.is_selected(r, c) else ("#aaffaa" if self.raster.get(r, c) else "white")
+        outline = "blue" if (r, c) == self.current_cell else "#cccccc"
+        text = self.raster.get(r, c)
+
+        # nur geänderte Eigenschaften an den Canvas geben
+        old_bg, old_text, old_outline = self.drawn[(r,c)]
+        if bg != old_bg or outline != old_outline:
+            self.canvas.itemconfig(self.rectangles[(r,c)], fill=bg, outline=outline)
+        if text != old_text:
+            self.canvas.itemconfig(self.text_items[(r,c)], text=text)
+        self.drawn[(r,c)] = (bg, text, outline)
+
+
+    def render(self):
+        # Nur die als geändert markierten Zellen neu zeichnen
+        for r, c in self.dirty:
+            self.refresh_cell(r, c)
+        self.dirty.clear()
 
 
     def refresh_all(self):
-        for r in range(ROWS):
-            for c in range(COLS):
-                self.refresh_cell(r,c)
-                self.highlight_current_cell()
+        self.dirty.update(self.rectangles)
+        self.render()
 
                 
     def highlight_current_cell(self):
-        for (r, c), rect in self.rectangles.items():
-            self.canvas.itemconfig(rect, outline="#cccccc")
-        r, c = self.current_cell
-        self.canvas.itemconfig(self.rectangles[(r,c)], outline="blue")
+        # alte und neue Cursorzelle neu zeichnen
+        if self.drawn_cursor is not None:
+            self.dirty.add(self.drawn_cursor)
+        self.dirty.add(self.current_cell)
+        self.drawn_cursor = self.current_cell
+        self.render()
     
 
 
     # ---------- IO ----------
+    @traced("export_txt")
     def export_txt(self):
-        lines = []
-        bin_strs = []
-        letters_list = []
-
-        # Erzeuge alle Binärstrings + Buchstaben separat
-        for r in range(ROWS):
-            bits = ''.join('1' if self.selected[r][col] else '0' for col in reversed(range(COLS)))
-            letters = ' '.join(self.cells[r][col] if self.cells[r][col] else ' ' for col in range(COLS))
-            bin_strs.append(bits)
-            letters_list.append(letters)
-
-        # Formatiere jede Zeile mit korrektem Abstand
-        for r in range(ROWS):
-            if r == 0:
-                bin_part = f'{{0b{bin_strs[r]}, '   # öffnende Klammer voran, Komma dahinter
-            elif r == ROWS - 1:
-                bin_part = f' 0b{bin_strs[r]}}},'  # schließende Klammer hinten, Komma dahinter
-            else:
-                bin_part = f' 0b{bin_strs[r]}, '    # normal mit Komma
-
-            # Definiere Gesamtabstand bis zu den Buchstaben (z.B. 15 Zeichen)
-            total_bin_width = len(f'{{0b{"0"*COLS},') 
-
-
-            # Berechne wie viele Leerzeichen noch, damit alle Buchstaben bei gleicher Spalte starten
-            spaces_needed = total_bin_width - len(bin_part)
-            spaces_needed = max(spaces_needed, 0)
-
-            # Erzeuge Leerzeichen, dann Buchstaben mit Kommentar
-            line = bin_part + (" " * spaces_needed) + " " + f"//           {letters_list[r]}//"
-            lines.append(line)
+        format = self.icon_format.get()
+        try:
+            with span("build_icon_text", format=format) as s:
+                text, format, hinweis = build_icons(self.raster, format)
+                s.set(zeichen=len(text))
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Icons", f"Die Icon-Bibliothek konnte nicht verwendet werden:\n{e}")
+            return
+        if hinweis:
+            messagebox.showinfo("Icons", hinweis + ".")
+        with span("dialog_datei"):
+            path = filedialog.asksaveasfilename(defaultextension=".h", filetypes=[("icon files","*.h")])
+        if not path:
+            return
+        auswahl = selection_rows(self.raster)
 
-        header = """#pragma once
+        def arbeit(fortschritt):
+            self.write_file(path, text, fortschritt)
+            return None if format == "alt" else flash_bytes(IconBibliothek.load(), auswahl)
 
-#define GRAFIK_11X10_ROWS 10
-#define GRAFIK_11X10_COLS 11
-
-const uint16_t grafik_11x10[][11] PROGMEM = {
-"""
-        Hend = """ 
-    {0b00110001100,  // 0  7 HEART  0: . . 0 0 . . . 0 0 . . : 10
-     0b01111011110,  // 1          21: . 0 0 0 0 . 0 0 0 0 . : 11
-     0b11111111111,  // 2          22: 0 0 0 0 0 0 0 0 0 0 0 : 32
-     0b11111111111,  // 3          43: 0 0 0 0 0 0 0 0 0 0 0 : 33
-     0b11111111111,  // 4          44: 0 0 0 0 0 0 0 0 0 0 0 : 54
-     0b01111111110,  // 5          65: . 0 0 0 0 0 0 0 0 0 . : 55
-     0b00111111100,  // 6          66: . . 0 0 0 0 0 0 0 . . : 76
-     0b00011111000,  // 7          87: . . . 0 0 0 0 0 . . . : 77
-     0b00001110000,  // 8          88: . . . . 0 0 0 . . . . : 98
-     0b00000100000}, // 9         109: . . . . . 0 . . . . . : 99
+        def fertig(groessen):
+            if groessen is None:
+                messagebox.showinfo("Export", "Gespeichert als " + path)
+            else:
+                messagebox.showinfo("Export", "Gespeichert als " + path + "\n\nFlash (Daten + Tabellen):\n"
+                                    + ", ".join(f"{k} {v} Byte" for k, v in groessen.items()))
 
-    {0b00011111000,  // 0   8       0: . . . 0 0 0 0 0 . . . : 10
-     0b00111111100,  // 1          21: . . 0 0 0 0 0 0 0 . . : 11
-     0b01101110110,  // 2          22: . 0 0 . 0 0 0 . 0 0 . : 32
-     0b11111111111,  // 3          43: 0 0 0 0 0 0 0 0 0 0 0 : 33
-     0b11111111111,  // 4          44: 0 0 0 0 0 0 0 0 0 0 0 : 54
-     0b10111111101,  // 5          65: 0 . 0 0 0 0 0 0 0 . 0 : 55
-     0b11001110011,  // 6          66: 0 0 . . 0 0 0 . . 0 0 : 76
-     0b01110001110,  // 7          87: . 0 0 0 . . . 0 0 0 . : 77
-     0b00111111100,  // 8          88: . . 0 0 0 0 0 0 0 . . : 98
-     0b00011111000}, // 9         109: . . . 0 0 0 0 0 . . . : 99
+        self.start_export("Icons", arbeit, fertig)
 
-    {0b00110000000,  // 0   9       0: . . . . . 0 . . . . . : 10
-     0b00000000000,  // 1          21: . . . . . 0 . . . . . : 11
-     0b00000000000,  // 2          22: . . 0 0 . 0 . 0 0 . . : 32
-     0b00000000000,  // 3          43: . . 0 0 . 0 . 0 0 . . : 33
-     0b00000001100,  // 4          44: . . . . 0 0 0 . . . . : 54
-     0b00000000000,  // 5          65: . 0 0 0 0 0 0 0 0 0 . : 55
-     0b00000000000,  // 6          66: . . . . 0 0 0 . . . . : 76
-     0b00000000000,  // 7          87: . . 0 0 . 0 . 0 0 . . : 77
-     0b00000000000,  // 8          88: . . 0 0 . 0 . 0 0 . . : 98
-     0b00000111000}, // 9         109: . . . . . 0 . . . . . : 99
-
-    {0b00000000000,  //   10        0: . . . . . . . . . . . : 10
-     0b00000000000,  //             0: . . . . . . . . . . . : 21
-     0b00000000000,  //             0: . . . . . . . . . . . : 32
-     0b10001010001,  //             0: 0 . . . 0 . 0 . . . 0 : 43
-     0b11011011011,  //             0: 0 0 . 0 0 . 0 0 . 0 0 : 54
-     0b10101010101,  //             0: 0 . 0 . 0 . 0 . 0 . 0 : 65
-     0b10001010001,  //             0: 0 . . . 0. .0. . . .0.: 76
-     0b10001010001,  //             0: 0. . . .0 . 0 . . . 0 : 87
-     0b00000000000,  //             0: . . . . . . . . . . . : 98
-     0b00000000000}, //             0: . . . . . . . . . . . : 99
-};
-    """
+    def save_icon(self):
+        # aktuelle Markierung als benanntes Icon in die Bibliothek (neuer Platz am Ende)
+        name = simpledialog.askstring("Icon merken", "Name des Icons:", parent=self)
+        if not name:
+            return
         try:
-            path = filedialog.asksaveasfilename(defaultextension=".h", filetypes=[("icon files","*.h")])
-            if path:
-                with open(path, 'w', encoding='utf-8') as f:
-                    f.write(header)
-                    for _ in range(7):
-                        f.write("\n".join("    " + line for line in lines) + "\n"+ "\n")
-                    f.write(Hend)
-                messagebox.showinfo("Export", "Gespeichert als " + path)
-        except Exception as e:
-            messagebox.showerror("Fehler beim Speichern", f"Das Icon.h konnte nicht gespeichert werden:\n{e}")
+            bibliothek = IconBibliothek.load()
+            if (bibliothek.zeilen, bibliothek.spalten) != (self.raster.rows, self.raster.cols):
+                raise ValueError(f"Die Icon-Bibliothek ist für {bibliothek.spalten}×{bibliothek.zeilen} Felder.")
+            bibliothek.add(name, selection_rows(self.raster))
+            if name not in bibliothek.plaetze:
+                bibliothek.plaetze.append(name)
+            bibliothek.save()
+            messagebox.showinfo("Icon merken", f"Icon '{name}' gespeichert (Platz {bibliothek.plaetze.index(name)})")
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Icon merken", f"Das Icon konnte nicht gespeichert werden:\n{e}")
+        self.canvas.focus_set()
 
     def save_template(self):
         try:
             path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON","*.json")])
             if path:
-                data = {
-                    "cells": self.cells,
-                    "selected": self.selected,
-                    "varzwanzig": self.varzwanzig.get(),   # Wert der Checkbox ZWANZIG
-                    "varviertel": self.varviertel.get()  # Wert der Checkbox DREIVIERTEL
-                }
+                data = self.raster.to_template(
+                    varzwanzig=self.varzwanzig.get(),   # Wert der Checkbox ZWANZIG
+                    varviertel=self.varviertel.get(),   # Wert der Checkbox DREIVIERTEL
+                    minanzeige=self.minanzeige.get(),   # Wert der Checkbox Minutenanzeige
+                    sprache=self.paket.name
+                )
                 with open(path, 'w', encoding='utf-8') as f:
                     json.dump(data, f)
                 messagebox.showinfo("Vorlage", "Vorlage gespeichert")
@@ -407,15 +1090,23 @@ const uint16_t grafik_11x10[][11] PROGMEM = {
         path = filedialog.askopenfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
         if path:
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                self.cells = data.get("cells", self.cells)
-                self.selected = data.get("selected", [[False] * COLS for _ in range(ROWS)])
+                data = load_template_file(path)
+
+                raster = data["raster"]
+                sprache = data["sprache"] or STANDARD_SPRACHE
+                if sprache != self.paket.name:
+                    raise ValueError(f"Die Vorlage ist für das Sprachpaket '{sprache}', "
+                                     f"eingestellt ist '{self.paket.name}'.")
+                if not (1 <= raster.rows <= MAX_RASTER and 1 <= raster.cols <= MAX_RASTER):
+                    raise ValueError(f"Die Vorlage hat {raster.cols}×{raster.rows} Felder, "
+                                     f"höchstens {MAX_RASTER}×{MAX_RASTER} möglich.")
+                self.raster = raster
+                self.fit_canvas()     # Vorlage mit anderer Größe: Raster passt sich an
 
                 # Checkboxen wiederherstellen
-                self.varzwanzig.set(data.get("varzwanzig", 0))
-                self.varviertel.set(data.get("varviertel", 0))
+                self.varzwanzig.set(data["varzwanzig"])
+                self.varviertel.set(data["varviertel"])
+                self.minanzeige.set(data["minanzeige"])
 
                 self.refresh_all()
                 messagebox.showinfo("Vorlage", "Vorlage geladen")
@@ -425,15 +1116,16 @@ const uint16_t grafik_11x10[][11] PROGMEM = {
                 messagebox.showerror("Fehler", f"Die Datei wurde nicht gefunden:\n{path}")
             except json.JSONDecodeError:
                 messagebox.showerror("Fehler", "Die Vorlage ist keine gültige JSON-Datei.")
+            except ValueError as e:
+                messagebox.showerror("Fehler", str(e))
             except Exception as e:
                 messagebox.showerror("Fehler beim Laden", f"Die Vorlage konnte nicht geladen werden:\n{e}")
 
 
 
     def clear_grid(self):
-        self.cells = [["" for _ in range(COLS)] for _ in range(ROWS)]
-        self.selected = [[False for _ in range(COLS)] for _ in range(ROWS)]
-        
+        self.raster.clear()
+
         # Checkboxen zurücksetzen
         self.varzwanzig.set(0)
         self.varviertel.set(0)
@@ -442,349 +1134,155 @@ const uint16_t grafik_11x10[][11] PROGMEM = {
         self.check_words()
 
     def find_word_in_row(self, word, row):
-        length = len(word)
-        for start_col in range(COLS - length + 1):
-            matched = True
-            for i in range(length):
-                col = start_col + i
-                if self.cells[row][col].upper() != word[i].upper():
-                    matched = False
-                    break
-            if matched:
-                # Gefunden an Reihe 'row', von Spalte start_col bis start_col+length-1
-                return (row, start_col, start_col + length - 1)
-        return None    
-    
-    def get_grid_layout_text(self):
-        # cells: 2D-Liste (ROWS x COLS) mit Großbuchstaben-Strings
-        ROWS, COLS = len(self.cells), len(self.cells[0])
-        header = """#pragma once
-
-#include "Uhrtype.hpp"
-
-"""
-        header += "/*\n"
-        header += """* Script erstellt mit Scriptmaker by M. Mahrt\n"""
-        
-        header += " *           Layout Front \n"
-        header += " *                COL\n"
-        header += " *    X " + " ".join(str(c) for c in reversed(range(COLS))) + "\n"
-        header += " * ROW + " + " ".join("-" for _ in range(COLS)) + "\n"
-
-        rows_text = ""
-        for r in range(ROWS):
-            # Zellen in Reihe, von links nach rechts in cells, werden aber rechtsbündig mit Spalten 10..0 angezeigt
-            row_letters = [self.cells[r][c] if self.cells[r][c] else " " for c in range(COLS)]
-            # Die Ausgabe soll von Spalte 10 bis 0, also reversed
-            row_letters_reversed = list((row_letters))
-            rows_text += f" *  {r}  | " + " ".join(row_letters_reversed) + "\n"
+        for _, start_col in matcher_for((word,)).find_all(self.raster.row(row)):
+            # Gefunden an Reihe 'row', von Spalte start_col bis start_col+length-1
+            return (row, start_col, start_col + len(word) - 1)
+        return None
 
-        footer = " */\n"
-        return header + rows_text + footer
+    def get_grid_layout_text(self):
+        return grid_layout_text(self.raster)
 
 
        
+    @traced("generate_script")
     def generate_script(self):
 
-        tesv = ""
-        tesh = ""
-        tdreiv = ""
-        tdreih = ""
-
-        word_map = {
-            "EIN": "hour_1",
-            "ZWEI": "hour_2",
-            "DREI": "hour_3",
-            "VIER": "hour_4",
-            "FÜNF": "min_5",
-            "SECHS": "hour_6",
-            "SIEBEN": "hour_7",
-            "ACHT": "hour_8",
-            "NEUN": "hour_9",
-            "ZEHN": "hour_10",
-            "ELF": "hour_11",
-            "ZWÖLF": "hour_12",
-            "EINS": "eins",
-            "UHR": "uhr",
-            "FÜNF": "hour_5",
-            "ZEHN": "min_10",
-            "HALB": "halb",
-            "ZWANZIG": "min_20",
-            "VOR": "vor",
-            "NACH": "nach",
-            "VIERTEL": "viertel",
-            #DREI": "drei",
-            "ES": "es",
-            "IST": "ist",
-        }
-
-
-        # Status der Wörter
-        words_fg = [lbl.cget("fg") for lbl in self.word_labels]
-
-        # Indizes der Sonderwörter
-        # idx_viertel = self.words.index(22)  #("DREI")
-        idx_zwanzig = self.words.index("ZWANZIG")
-
-        # Alle Indizes des Wortes "DREI" finden
-        drei_indices = [i for i, w in enumerate(self.words) if w == "DREI"]
-
-        # Angenommen, wir wollen den zweiten DREI prüfen:
-        idx_viertel = drei_indices[1]
-
-        # Normale Wörter außer Sonderwörter
-        normal_indices = [i for i in range(len(self.words)) if i not in (idx_viertel, idx_zwanzig)]
-        normal_all_green = all(words_fg[i] == "green" for i in normal_indices)
-
-        # Sonderwörter: nur Warnung, wenn sie **nicht grün** **und** Checkbox **nicht aktiviert** ist
-        viertel_problem = (words_fg[idx_viertel] != "green") and (not self.varviertel.get())
-        zwanzig_problem = (words_fg[idx_zwanzig] != "green") and (not self.varzwanzig.get())
- 
+        with span("word_positions") as s:
+            self.word_positions = self.word_index.word_positions()
+            fehlend = missing_words(self.words, self.word_positions, self.varzwanzig.get(), self.varviertel.get(),
+                                    self.paket)
+            s.set(positionen=len(self.word_positions), fehlend=len(fehlend))
 
         # Meldung nur anzeigen, wenn irgendein Problem vorliegt
-        if not normal_all_green or viertel_problem or zwanzig_problem :
-            result = messagebox.askyesno(
-                "Warnung",
-                "Nicht alle Wörter sind korrekt markiert.\nTrotzdem speichern?"
-            )
+        if fehlend:
+            with span("dialog_warnung"):
+                result = messagebox.askyesno(
+                    "Warnung",
+                    "Nicht alle Wörter sind korrekt markiert.\nTrotzdem speichern?"
+                )
             if not result:
                 return
 
-
-        lines = []
-        skip_next = False
-
-        # self.word_positions ist: [(wort, reihe, start, ende), ...]
-        for i, (word_index, _, reihe, start_col, end_col, _) in enumerate(self.word_positions):
-            wort = self.words[word_index]  # echtes Wort holen
-
-            if skip_next:
-                skip_next = False
-                continue
-
-            mapped_name = None
-
-
-            # Einzelwort-Mapping
-            if mapped_name is None:
-                mapped_name = word_map.get(wort, wort)
-
-            if reihe is not None:
-                start_script_col = start_col
-                end_script_col = end_col
-                if mapped_name=="hour_3" and reihe <=4:
-                    mapped_name = ""
-                    tdreiv = reihe, start_script_col, end_script_col 
-
-                if mapped_name=="hour_5" and reihe < 4:
-                    
-                    mapped_name = "min_5"
-                if mapped_name=="min_10" and reihe > 4:
-                    mapped_name = "hour_10"
-                if mapped_name == "es":
-                    tesv = reihe, start_script_col, end_script_col
-                    mapped_name = ""
-                if mapped_name == "ist":
-                    tesh = reihe, start_script_col, end_script_col    
-                    mapped_name = ""
-                
-                     
-                if mapped_name == "viertel":
-                    tdreih = reihe, start_script_col, end_script_col 
-                if self.varzwanzig.get() == 1 and mapped_name =="min_20":
-                    mapped_name =""
-                if mapped_name == "vor":
-                    mapped_name = "vor:\n        case FrontWord::v_vor"
-                if mapped_name == "nach":
-                    mapped_name = "nach:\n        case FrontWord::v_nach"
-                
-                if mapped_name != "":
-                    lines.append(f"        case FrontWord::{mapped_name}:")
-                    lines.append(f"            setFrontMatrixWord({reihe}, {start_script_col}, {end_script_col});")
-                    lines.append("             break;")
-                    lines.append("")
-            #lse:
-                # lines.append(f"        case FrontWord::{mapped_name}:")
-                # lines.append("            setFrontMatrixWord(0, 0, 0);")
-                # lines.append("            setFrontMatrixWord(0, 10, 10);")
-                # lines.append("           break;")
-                # lines.append("")
-           
-        lines.append(f"        case FrontWord::es_ist:")
-        lines.append(f"            setFrontMatrixWord({tesv[0]}, {tesv[1]}, {tesv[2]});")
-        lines.append(f"            setFrontMatrixWord({tesh[0]}, {tesh[1]}, {tesh[2]});")
-        lines.append("             break;")
-        lines.append("")   
-
-        if self.varviertel.get() == 0 and mapped_name =="viertel":
-            lines.append(f"        case FrontWord::dreiviertel:")
-            lines.append(f"            setFrontMatrixWord({tdreiv[0]}, {tdreih[1]}, {tdreiv[2]});")
-            lines.append("             break;")
-            lines.append("") 
-        
-        if self.varzwanzig.get() == 0 and mapped_name =="min_20":
-            lines.append(f"        case FrontWord::zwanzig:")
-            lines.append(f"            setFrontMatrixWord({tdreiv[0]}, {tdreih[1]}, {tdreiv[2]});")
-            lines.append("             break;")
-            lines.append("") 
+        with span("build_script_text", tabelle=self.script_tabelle.get()) as s:
+            build = build_table_script_text if self.script_tabelle.get() else build_script_text
+            text = build(self.raster, self.words, self.word_positions,
+                         self.varzwanzig.get(), self.varviertel.get(), self.paket)
+            groesse = firmware_bytes(firmware_cases(self.words, self.word_positions,
+                                                    self.varzwanzig.get(), self.varviertel.get(), self.paket))
+            s.set(zeichen=len(text), **groesse)
 
         # Datei speichern
+        with span("dialog_datei"):
+            file_path = filedialog.asksaveasfilename(defaultextension=".hpp", filetypes=[("HeaderTextdatei","*.hpp")])
 
-        text_block = self.get_grid_layout_text()
-        text_block += """
-class De10x11_t : public iUhrType {
-public:
-    virtual LanguageAbbreviation usedLang() override {
-        return LanguageAbbreviation::DE;
-    };
-
-    virtual const bool hasZwanzig() override { return """
-        if self.varzwanzig.get() == 1:
-            text_block += """false"""
-        elif self.varzwanzig.get() == 0:
-            text_block += """true"""
-        text_block += """; }
-    virtual const bool hasDreiviertel() override { return """
-        if self.varviertel.get() == 1:
-            text_block += """false"""
-        elif self.varviertel.get() == 0:
-            text_block += """true"""
-        text_block += """; }
-
-    void show(FrontWord word) override {
-        switch (word) {
-"""
-        text_block_end = """
-        case FrontWord::funk:
-            setFrontMatrixWord(3, 4, 7);
-			setFrontMatrixWord(8, 5, 10);
-			setFrontMatrixWord(9, 2, 4);
-            break;
+        if file_path:
+            def fertig(_):
+                messagebox.showinfo("Script", "Script gespeichert\n\nFlash für show() (geschätzt):\n"
+                                              f"Tabelle ~{groesse['tabelle']} Byte, switch ~{groesse['switch']} Byte")
+                self.canvas.focus_set()
 
-        default:
-            break;
-        };
-    };
-};
+            self.start_export("Script", lambda fortschritt: self.write_file(file_path, text, fortschritt), fertig)
+           
 
-De10x11_t _de10x11;
-    """
-        file_path = filedialog.asksaveasfilename(defaultextension=".hpp", filetypes=[("HeaderTextdatei","*.hpp")])
+    @traced("generate_frame_table")
+    def generate_frame_table(self):
+        optionen = {name: var.get() for name, var in self.optionen.items()}
+        with span("simulate_day"):
+            bericht = simulate_day(self.words, self.word_index.word_positions(), self.raster.rows,
+                                   self.raster.cols, optionen, self.minanzeige.get(), self.paket)
+        if not bericht.ok:
+            if not messagebox.askyesno("Warnung", "\n".join(bericht.meldungen()) + "\n\nTrotzdem speichern?"):
+                return
 
+        format, takt = self.bild_format.get(), int(self.bild_takt.get())
+        try:
+            with span("build_frame_table", format=format, takt=takt) as s:
+                text, groessen = build_frames(bericht, self.raster, takt, format, self.paket)
+                s.set(zeichen=len(text), **groessen)
+        except ValueError as e:
+            messagebox.showerror("Bildtabelle", str(e))
+            return
+
+        with span("dialog_datei"):
+            file_path = filedialog.asksaveasfilename(defaultextension=".h", filetypes=[("Headerdatei", "*.h")])
         if file_path:
-            try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(text_block)    
-                    f.write("\n".join(lines))
-                    f.write(text_block_end)
-                messagebox.showinfo("Script","Script gespeichert")
+            def fertig(_):
+                messagebox.showinfo("Bildtabelle", "Bildtabelle gespeichert\n\nFlash (Daten + Tabellen):\n"
+                                    + ", ".join(f"{k} {v} Byte" for k, v in groessen.items())
+                                    + "\n" + frame_size_text(groessen, format))
                 self.canvas.focus_set()
-            except Exception as e:
-                messagebox.showerror("Fehler beim Speichern", f"Das Script konnte nicht gespeichert werden:\n{e}")
-           
+
+            self.start_export("Bildtabelle", lambda fortschritt: self.write_file(file_path, text, fortschritt), fertig)
 
     def save_letter_grid(self):
-        letters = self.cells
+        letters = self.raster.cells
 
 
 #for i in range(ROWS):
  #           letters.append([f"{chr(65 + j)}" for j in range(COLS)])
 
-        row_count = ROWS
-        col_count = COLS
-        rahmen_mm = 250
-        x_spacing = 16.6666
-        y_spacing = 16.6666
-        text_height = 11.55
+        row_count = self.raster.rows
+        col_count = self.raster.cols
+        rahmen_mm = RAHMEN_MM
+        x_spacing = RASTER_MM
+        y_spacing = RASTER_MM
+        text_height = TEXT_HOEHE
         filename = "buchstaben.dxf"
 
         self.create_letter_grid(letters, row_count, col_count, x_spacing, y_spacing, text_height, rahmen_mm, filename)
 
+    @traced("create_letter_grid")
     def create_letter_grid(self, letters, row_count, col_count, x_spacing, y_spacing, text_height, rahmen_mm, filename):
-        # Neue DXF-Datei
-        doc = ezdxf.new(dxfversion='AC1027')
-        doc.units = ezdxf.units.MM
-        msp = doc.modelspace()
-        old_text_height = text_height   
-
-        # Textstil anlegen (falls nicht vorhanden)
-        if "myStandard" not in doc.styles:
-            doc.styles.new("myStandard", dxfattribs={"font": "MS UI Gothic.ttf"})
-
-        # Buchstaben platzieren
-        for row in range(row_count):
-            for col in range(col_count):
-                if row < len(letters) and col < len(letters[row]):
-                    letter = letters[row][col]
-                    x = col * x_spacing
-                    y = -row * y_spacing  # Reihen nach unten
-                    x=x+((rahmen_mm/2)-(5*x_spacing))
-                    y=y+((rahmen_mm/2)+(4.5001*y_spacing))
-
-                    if letter =="Ü" or letter =="Ö" or letter =="Ä":
-                        old_text_height = text_height
-                        text_height = text_height * 0.8571
-                        y = y - ((old_text_height-text_height) / 2)
-                        Buchbreite ="1.15"
-                        
-                    else:
-                        text_height = old_text_height
-                        Buchbreite ="1.0"
-
-                    text_entity = msp.add_text(
-                        letter,
-                        dxfattribs={
-                            "height": text_height,
-                            "style": "myStandard",
-                            "width": Buchbreite
-                        }
-                    )
-                    # zentrierte Platzierung
-                    text_entity.set_placement((x, y), align=TextEntityAlignment.MIDDLE_CENTER)
-
-        # Minutenpunkte
-        if self.minanzeige.get() != 1:
-            radius = y_spacing/8
-            y = (rahmen_mm/2) - (5.5 * y_spacing)  # Reihen nach unten
-            for i in range(4):
-                x = (rahmen_mm/2) -(3 * x_spacing) + (i * x_spacing * 2)
-                center = (x, y)
-                msp.add_circle(center=center, radius=radius)
-
-        # RRahmen
-        square_points = [
-            (0, 0),
-            (rahmen_mm, 0),
-            (rahmen_mm, rahmen_mm),
-            (0, rahmen_mm),
-        ]
-       # geschlossenes Quadrat als eine Polyline
-        msp.add_lwpolyline(square_points, close=True)
-        # DXF speichern
-
         # Alle Felder gefüllt? Sonst Warnung
-        for row in range(row_count):
-            for col in range(col_count):
-                bu=letters[row][col]
-                if bu == "":
-                    #print(f"Leeres Feld bei {row},{col}")
-                    result = messagebox.askyesno(
-                        "Warnung",
-                        "Nicht alle Felder gefüllt.\nTrotzdem speichern?"
-                    )
-                    if not result:
-                        return
-            
-        
-        try:
-            
+        if self.raster.has_empty():
+            with span("dialog_warnung"):
+                result = messagebox.askyesno(
+                    "Warnung",
+                    "Nicht alle Felder gefüllt.\nTrotzdem speichern?"
+                )
+            if not result:
+                return
+
+        with span("dialog_datei"):
             path = filedialog.asksaveasfilename(defaultextension=".dxf", filetypes=[("DXF files","*.dxf")])
-            if path:
-                doc.saveas(path)
-                print(f"DXF gespeichert: {path}")
-                messagebox.showinfo("DXF Vorlage", "Gespeichert als " + path)
-        except Exception as e:
-            messagebox.showerror("Fehler beim Speichern", f"Die DXF Vorlage konnte nicht gespeichert werden:\n{e}")
+        if not path:
+            return
+
+        # Stand zum Zeitpunkt des Klicks - im Raster darf während des Exports weitergeschrieben werden
+        letters = [list(reihe) for reihe in letters]
+        optionen = (self.minanzeige.get(), self.dxf_bloecke.get(), self.dxf_konturen.get())
+
+        def arbeit(fortschritt):
+            with span("build_letter_grid_doc") as s:
+                doc = build_letter_grid_doc(letters, row_count, col_count, x_spacing, y_spacing,
+                                            text_height, rahmen_mm, *optionen, fortschritt.teil(0.0, 0.8))
+                s.set(entities=len(doc.modelspace()))
+            fortschritt.melde(0.8, "Speichern")
+            with span("saveas", datei=path) as s:
+                write_atomic(path, doc.saveas, fortschritt)
+                s.set(bytes=file_size(path))
+            return path
+
+        def fertig(path):
+            print(f"DXF gespeichert: {path}")
+            messagebox.showinfo("DXF Vorlage", "Gespeichert als " + path)
+
+        self.start_export("DXF Vorlage", arbeit, fertig)
+
+    def start_export(self, titel, arbeit, fertig):
+        # arbeit(fortschritt) im Hintergrund, fertig(ergebnis) danach im Tk-Thread; immer nur ein Export
+        if self.export is not None and self.export.laeuft:
+            messagebox.showinfo(titel, f"Es läuft noch ein Export ({self.export.titel}).")
+            return
+        self.export = Hintergrundexport(self, titel, arbeit, fertig)
+
+    @staticmethod
+    def write_file(path, text, fortschritt):
+        # Worker-Thread: Textdatei schreiben
+        fortschritt.melde(0.5, "Speichern")
+        with span("write", datei=path) as s:
+            write_text(path, text, fortschritt)
+            s.set(bytes=file_size(path))
     
 
 
@@ -800,29 +1298,50 @@ De10x11_t _de10x11;
         
         
         tk.Label(settings_win, text="Anzahl Spalten:").grid(row=1, column=0, padx=10, pady=5, sticky="w")
-        cols_var = tk.DoubleVar(value=COLS)  # Standardwert
+        cols_var = tk.DoubleVar(value=self.raster.cols)  # Standardwert
         tk.Entry(settings_win, textvariable=cols_var, width=5).grid(row=1, column=1, padx=10, pady=5)
         
         tk.Label(settings_win, text="Anzahl Reihen:").grid(row=0, column=0, padx=10, pady=5, sticky="w")
-        rows_var = tk.DoubleVar(value=ROWS)  # Standardwert
+        rows_var = tk.DoubleVar(value=self.raster.rows)  # Standardwert
         tk.Entry(settings_win, textvariable=rows_var, width=5).grid(row=0, column=1, padx=10, pady=5)
 
         show_grid_var = tk.BooleanVar(value=True)
         tk.Checkbutton(settings_win, text="Raster anzeigen", variable=show_grid_var).grid(row=0, column=3, padx=10, pady=5)
 
+        tk.Label(settings_win, text="Sprache:").grid(row=2, column=0, padx=10, pady=5, sticky="w")
+        sprache_var = tk.StringVar(value=self.paket.name)
+        tk.OptionMenu(settings_win, sprache_var, *sprachpakete()).grid(row=2, column=1, padx=10, pady=5)
+
         # Buttons
         def save_and_close():
             # Hier kannst du Werte übernehmen
-            print("Spalten:", cols_var.get())
-            print("Reihen:", rows_var.get())
-            global ROWS
-            ROWS=int(rows_var.get())
-            global COLS
-            COLS=int(cols_var.get())    
-            print("Raster anzeigen:", show_grid_var.get())
+            try:
+                rows, cols = int(rows_var.get()), int(cols_var.get())
+            except (tk.TclError, ValueError):
+                messagebox.showerror("Einstellungen", "Reihen und Spalten müssen Zahlen sein.", parent=settings_win)
+                return
+            if not (1 <= rows <= MAX_RASTER and 1 <= cols <= MAX_RASTER):
+                messagebox.showerror("Einstellungen", f"Reihen und Spalten: 1 bis {MAX_RASTER}.", parent=settings_win)
+                return
+            if sprache_var.get() != self.paket.name and self.export is not None and self.export.laeuft:
+                # der Neuaufbau zerstört das Fenster, an dem Fortschrittsfenster und after() des Exports hängen
+                messagebox.showinfo("Einstellungen", f"Es läuft noch ein Export ({self.export.titel}).\n"
+                                    "Die Sprache kann erst danach geändert werden.", parent=settings_win)
+                return
+            debug_print("Spalten:", cols, "Reihen:", rows, "Raster anzeigen:", show_grid_var.get())
             settings_win.destroy()
+
+            if sprache_var.get() == self.paket.name:
+                self.resize_grid(rows, cols)      # nur die Größe: ohne Neustart, Inhalt bleibt
+                return
+
+            # andere Sprache = andere Wortliste und Checkboxen -> Fenster neu aufbauen, das Raster wird übernommen
+            global SPRACHE
+            SPRACHE = sprache_var.get()
+            self.raster.resize(rows, cols)
+            raster = self.raster
             self.destroy()           # Fenster schließen
-            GridApp().mainloop()     # neue Instanz starten
+            GridApp(raster).mainloop()     # neue Instanz starten
 
         tk.Button(settings_win, text="Speichern", command=save_and_close).grid(pady=10)
         tk.Button(settings_win, text="Abbrechen", command=settings_win.destroy).grid()
@@ -832,5 +1351,53 @@ De10x11_t _de10x11;
 
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scriptmaker V2 - Layout-Vorlagen für Wortuhren")
+    parser.add_argument("--batch", metavar="VERZEICHNIS",
+                        help="alle Vorlagen (*.json) im Verzeichnis ohne GUI exportieren (.hpp, _icons.h, .dxf)")
+    parser.add_argument("--ausgabe", metavar="VERZEICHNIS",
+                        help="Zielverzeichnis für den Batch-Export (Standard: Vorlagenverzeichnis)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Anzahl paralleler Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--bloecke", action="store_true",
+                        help="DXF: jeden Buchstaben nur einmal als Block definieren und per INSERT platzieren")
+    parser.add_argument("--konturen", action="store_true",
+                        help="DXF: Buchstaben als Glyph-Konturen statt TEXT ausgeben")
+    parser.add_argument("--tabelle", action="store_true",
+                        help="Layoutscript: show() über PROGMEM-Tabelle statt switch (mit Größenvergleich)")
+    parser.add_argument("--icons", choices=("alt",) + ICON_FORMATE, default="alt",
+                        help="Icon .h: alt = bisheriges grafik_11x10 (Standard); bits, rle oder delta = Bibliothek "
+                             "icons/bibliothek.json (Firmware braucht iconDecode)")
+    parser.add_argument("--bildtabelle", choices=BILD_FORMATE,
+                        help="zusätzlich _frames.h: fertige LED-Bilder je Uhrzeit (dict oder delta) mit Kompression")
+    parser.add_argument("--bildtakt", type=int, choices=BILD_TAKTE, default=5,
+                        help="Minuten je Bild in der Bildtabelle (Standard: 5)")
+    parser.add_argument("--ohne-cache", action="store_true",
+                        help="Batch: alles neu erzeugen, Ausgabe-Cache weder lesen noch füllen")
+    parser.add_argument("--pruefen", action="store_true",
+                        help="Batch: nur Wortprüfung und Tagessimulation (alle 1440 Minuten), keine Dateien schreiben")
+    parser.add_argument("--sprache", choices=sprachpakete(), default=STANDARD_SPRACHE,
+                        help="Sprachpaket aus sprachen/ (Batch: nur für Vorlagen ohne eigene Sprachangabe)")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Startzeit messen und Importzeiten der Module ausgeben")
+    parser.add_argument(startprofil.EXIT_FLAG, action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.startup_profile:
+        return startprofil.run_profile(__file__)
+    if args.batch:
+        return run_batch(args.batch, args.ausgabe, args.jobs, args.bloecke, args.konturen, args.sprache,
+                         args.tabelle, args.icons, args.pruefen, args.bildtabelle, args.bildtakt,
+                         not args.ohne_cache)
+
+    global SPRACHE
+    SPRACHE = args.sprache
+    app = GridApp()
+    if args.startup_exit:
+        return startprofil.window_ready(app)
+    app.mainloop()
+    return 0
+
+
 if __name__=="__main__":
-    GridApp().mainloop()
+    sys.exit(main())
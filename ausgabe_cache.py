@@ -0,0 +1,138 @@
+## Ausgabe-Cache für den Batch-Export
+## Gleiche Vorlage + gleiche Exportparameter + gleiche Programmversion = gleiche Dateien:
+## - Schlüssel: SHA-1 über den Inhalt der Vorlage (cells, selected, varzwanzig, varviertel, minanzeige, Sprache),
+##   die Exportparameter (Rastermaß, Texthöhe, Rahmen, Trennsteg-Vorgaben, Formate) und die Generator-Version
+##   (Quelltexte, Sprachpakete, Icon-Bibliothek, ezdxf-Version)
+## - Eintrag: Verzeichnis mit den fertigen Dateien und der Meldung des Exports, beim Treffer wird nur kopiert
+## - LRU: ein Treffer setzt die Zeit des Eintrags neu, trim() löscht die ältesten Einträge über der Größengrenze
+##
+## Cache-Verzeichnis: ~/.cache/scriptmaker/ausgabe (änderbar über SCRIPTMAKER_AUSGABE_CACHE),
+## Größengrenze 200 MB (SCRIPTMAKER_AUSGABE_CACHE_MB)
+
+# -*- coding: utf-8 -*-
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+from functools import lru_cache
+
+from hintergrund import write_atomic_all
+
+CACHE_VERSION = 1
+CACHE_DIR = os.environ.get("SCRIPTMAKER_AUSGABE_CACHE",
+                           os.path.join(os.path.expanduser("~"), ".cache", "scriptmaker", "ausgabe"))
+MAX_MB = 200           # Standard für SCRIPTMAKER_AUSGABE_CACHE_MB
+META = "meta.json"
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+_QUELLEN = ("*.py", os.path.join("sprachen", "*.json"), os.path.join("icons", "*.json"))
+
+
+@lru_cache(maxsize=None)
+def generator_version():
+    # Hash über alles, was die Ausgabe beeinflusst: jede Änderung am Programm macht den Cache ungültig
+    from importlib import metadata
+
+    h = hashlib.sha1(f"{CACHE_VERSION}".encode())
+    for muster in _QUELLEN:
+        for pfad in sorted(glob.glob(os.path.join(_ROOT, muster))):
+            h.update(os.path.relpath(pfad, _ROOT).encode("utf-8"))
+            with open(pfad, "rb") as f:
+                h.update(f.read())
+    try:
+        h.update(metadata.version("ezdxf").encode())
+    except metadata.PackageNotFoundError:
+        pass
+    return h.hexdigest()
+
+
+def cache_key(vorlage, parameter):
+    # vorlage: Werte wie load_template_file (raster, varzwanzig, ...), parameter: dict der Exportoptionen
+    raster = vorlage["raster"]
+    roh = json.dumps([generator_version(), raster.cells, raster.selected, vorlage["varzwanzig"],
+                      vorlage["varviertel"], vorlage["minanzeige"], parameter],
+                     sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(roh.encode("utf-8")).hexdigest()
+
+
+def _eintrag(key):
+    return os.path.join(CACHE_DIR, key[:2], key)
+
+
+def lookup(key, ziele):
+    # Treffer: Dateien nach ziele {endung: pfad} kopieren (alle oder keine), Rückgabe Meldung; sonst None
+    eintrag = _eintrag(key)
+    try:
+        with open(os.path.join(eintrag, META), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if sorted(meta["dateien"]) != sorted(ziele):
+            return None
+        write_atomic_all({ziel: _kopierer(os.path.join(eintrag, "ausgabe" + endung))
+                          for endung, ziel in ziele.items()})
+        os.utime(eintrag)                  # zuletzt benutzt (LRU)
+        return meta["meldung"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _kopierer(quelle):
+    return lambda ziel: shutil.copyfile(quelle, ziel)
+
+
+def store(key, dateien, meldung):
+    # dateien {endung: pfad} der gerade erzeugten Ausgabe übernehmen; Fehler ignorieren (ohne Cache geht es auch)
+    eintrag = _eintrag(key)
+    tmp = f"{eintrag}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(tmp, exist_ok=True)
+        for endung, pfad in dateien.items():
+            shutil.copyfile(pfad, os.path.join(tmp, "ausgabe" + endung))
+        with open(os.path.join(tmp, META), "w", encoding="utf-8") as f:
+            json.dump({"dateien": sorted(dateien), "meldung": meldung}, f, ensure_ascii=False)
+        os.rename(tmp, eintrag)            # atomar; gibt es den Eintrag schon (paralleler Batch), bleibt er
+    except OSError:
+        pass
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _groesse(pfad):
+    return sum(e.stat().st_size for e in os.scandir(pfad) if e.is_file())
+
+
+def size_limit_mb():
+    # Größengrenze aus SCRIPTMAKER_AUSGABE_CACHE_MB, bei ungültigem Wert Warnung und Standard
+    wert = os.environ.get("SCRIPTMAKER_AUSGABE_CACHE_MB")
+    if wert is None:
+        return MAX_MB
+    try:
+        return float(wert.replace(",", "."))
+    except ValueError:
+        print(f"Warnung: SCRIPTMAKER_AUSGABE_CACHE_MB={wert!r} ist keine Zahl, Grenze {MAX_MB} MB",
+              file=sys.stderr)
+        return MAX_MB
+
+
+def trim(max_mb=None):
+    # älteste Einträge löschen, bis der Cache unter die Grenze passt; Rückgabe (Einträge, gelöscht, Bytes)
+    grenze = (size_limit_mb() if max_mb is None else max_mb) * 1024 * 1024
+    eintraege = []
+    for pfad in glob.glob(os.path.join(CACHE_DIR, "??", "*")):
+        if pfad.endswith(".tmp"):
+            continue
+        try:
+            eintraege.append((os.stat(pfad).st_mtime, _groesse(pfad), pfad))
+        except OSError:
+            pass
+    gesamt = sum(g for _, g, _ in eintraege)
+    geloescht = 0
+    for _, groesse, pfad in sorted(eintraege):
+        if gesamt <= grenze:
+            break
+        shutil.rmtree(pfad, ignore_errors=True)
+        gesamt -= groesse
+        geloescht += 1
+    return len(eintraege) - geloescht, geloescht, gesamt
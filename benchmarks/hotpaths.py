@@ -0,0 +1,238 @@
+## Benchmark der Hot Paths von Scriptmaker und Trennsteg Generator (ohne GUI)
+## Gemessen werden die Funktionen, die hinter den GUI-Aktionen stehen:
+##   check_words          -> WordIndex über das ganze Raster (plus check_row: eine Reihe nach einer Eingabe)
+##   check_times          -> simulate_day, Tagessimulation aller 1440 Minuten
+##   generate_script      -> Wortpositionen, Prüfung fehlender Wörter, build_script_text
+##   get_grid_layout_text -> grid_layout_text
+##   create_letter_grid   -> build_letter_grid_doc + DXF schreiben (in den Speicher)
+##   create_dxf           -> build_strip_doc + DXF schreiben (in den Speicher)
+## Synthetische Raster (11x10 bis 64x64, Wörter nach den Reihenregeln eingestreut, mehrere Wortlisten) und
+## Trennstege mit 1 bis 96 Schlitzen. Ausgabe: Laufzeit, Durchsatz und Spitzenspeicher (tracemalloc), als JSON
+## gespeichert, damit sich Läufe verschiedener Commits vergleichen lassen.
+##
+## Aufruf:
+##   python benchmarks/hotpaths.py                         # alles, Ergebnis nach benchmarks/ergebnisse/
+##   python benchmarks/hotpaths.py --schnell --nur check_words,create_dxf
+##   python benchmarks/hotpaths.py --vergleich benchmarks/ergebnisse/alt.json
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import ScriptmakerV2 as sm
+import DXF_Generator_TrennungenV1 as trennsteg
+from raster_modell import Raster
+from trennsteg_geometrie import SCHLITZABSTAND, VERSCHIEBUNG, erstes_schlitz_links
+from wortsuche import WORDS, WordIndex, missing_words, word_allowed_rows
+from zeitsimulation import MINUTEN, simulate_day
+
+RASTER = [(11, 10), (16, 16), (32, 32), (64, 64)]          # (Spalten, Reihen)
+RASTER_SCHNELL = [(11, 10), (16, 16)]
+SCHLITZE = [1, 6, 12, 24, 48, 96]
+SCHLITZE_SCHNELL = [1, 12, 24]
+BUCHSTABEN = "ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÜ"
+FAELLE = ("check_words", "check_row", "check_times", "generate_script", "get_grid_layout_text", "create_letter_grid", "create_dxf")
+
+
+def word_lists():
+    # Originalliste und zwei vergrößerte Listen mit zusätzlichen (nicht-Stunden-)Wörtern
+    rng = random.Random(7)
+    extra = ["".join(rng.choice(BUCHSTABEN) for _ in range(rng.randint(3, 8))) for _ in range(200)]
+    return {
+        "de": list(WORDS),
+        "de+40": list(WORDS) + extra[:40],
+        "de+200": list(WORDS) + extra,
+    }
+
+
+def synthetic_raster(cols, rows, words, seed=1):
+    # Zufallsbuchstaben, jedes Wort einmal ohne Überschneidung in einer erlaubten Reihe
+    # (erste freie Lücke, lange Wörter zuerst, die Originalwörter vor den zusätzlichen)
+    rng = random.Random(seed)
+    cells = [[rng.choice(BUCHSTABEN) for _ in range(cols)] for _ in range(rows)]
+    frei = [0] * rows      # erste freie Spalte je Reihe
+    reihenfolge = sorted(range(len(words)), key=lambda i: (i >= len(WORDS), -len(words[i])))
+    for i in reihenfolge:
+        wort = words[i]
+        reihen = [r for r in word_allowed_rows(i, rows) if r < rows]
+        rng.shuffle(reihen)
+        for r in reihen:
+            if frei[r] + len(wort) <= cols:
+                cells[r][frei[r]:frei[r] + len(wort)] = list(wort)
+                frei[r] += len(wort)
+                break
+    return Raster.from_cells(cells)
+
+
+def measure(fn, min_zeit, max_laeufe):
+    # Laufzeiten in s: ein Aufwärmlauf (Importe, Caches), dann mindestens ein Lauf bis min_zeit erreicht ist
+    fn()
+    zeiten = []
+    gesamt = time.perf_counter()
+    while not zeiten or (time.perf_counter() - gesamt < min_zeit and len(zeiten) < max_laeufe):
+        start = time.perf_counter()
+        fn()
+        zeiten.append(time.perf_counter() - start)
+    return zeiten
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def grid_cases(cols, rows, name, words):
+    raster = synthetic_raster(cols, rows, words)
+    index = WordIndex(words, raster)
+    zellen = cols * rows
+
+    # Eingaben auf einer Kopie, das Raster für die übrigen Fälle bleibt unverändert
+    eingabe = Raster.from_cells(raster.cells)
+    eingabe_index = WordIndex(words, eingabe)
+    rng = random.Random(3)
+
+    def check_row():
+        r, c = rng.randrange(rows), rng.randrange(cols)
+        eingabe.set(r, c, rng.choice(BUCHSTABEN))
+        eingabe_index.update_row(eingabe, r)
+
+    def generate_script():
+        positions = index.word_positions()
+        missing_words(words, positions, 0, 0)
+        sm.build_script_text(raster, words, positions, 0, 0)
+
+    def create_letter_grid():
+        doc = sm.build_letter_grid_doc(raster.cells, rows, cols, sm.RASTER_MM, sm.RASTER_MM,
+                                       sm.TEXT_HOEHE, sm.RAHMEN_MM)
+        doc.write(io.StringIO())
+
+    parameter = {"raster": f"{cols}x{rows}", "woerter": name}
+    yield "check_words", parameter, lambda: WordIndex(words, raster), zellen, "Zellen/s"
+    yield "check_row", parameter, check_row, 1, "Eingaben/s"
+    optionen = {"varzwanzig": 0, "varviertel": 0}
+    yield ("check_times", parameter, lambda: simulate_day(words, index.word_positions(), rows, cols, optionen),
+           MINUTEN, "Minuten/s")
+    # Script nur für Raster, in denen alle Originalwörter vorkommen (sonst bricht auch die GUI ab)
+    if not set(missing_words(words, index.word_positions(), 0, 0)) & set(WORDS):
+        yield "generate_script", parameter, generate_script, zellen, "Zellen/s"
+    else:
+        print(f"generate_script {parameter}: nicht alle Wörter untergebracht, übersprungen")
+    if name == "de":
+        # hängen nicht von der Wortliste ab
+        yield "get_grid_layout_text", parameter, lambda: sm.grid_layout_text(raster), zellen, "Zellen/s"
+        yield "create_letter_grid", parameter, create_letter_grid, zellen, "Zellen/s"
+
+
+def strip_cases(anzahl):
+    laenge = round((anzahl - 1) * SCHLITZABSTAND + 2 * 20, 2)
+    hoehe = 44.8 * 2
+    erstes = erstes_schlitz_links(laenge, "Senkrecht", anzahl, SCHLITZABSTAND, VERSCHIEBUNG)
+
+    def create_dxf():
+        doc = trennsteg.build_strip_doc(laenge, hoehe, 0.3, erstes, anzahl, SCHLITZABSTAND)
+        doc.write(io.StringIO())
+
+    yield "create_dxf", {"schlitze": anzahl, "laenge": laenge}, create_dxf, anzahl, "Schlitze/s"
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def case_key(eintrag):
+    return eintrag["fall"] + " " + " ".join(f"{k}={v}" for k, v in sorted(eintrag["parameter"].items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark der Hot Paths (headless)")
+    parser.add_argument("--schnell", action="store_true", help="nur kleine Raster und Stege")
+    parser.add_argument("--nur", help="Komma-getrennte Fälle: " + ", ".join(FAELLE))
+    parser.add_argument("--min-zeit", type=float, default=0.3, help="Messzeit je Fall [s]")
+    parser.add_argument("--max-laeufe", type=int, default=200)
+    parser.add_argument("--ausgabe", help="JSON-Datei (Standard: benchmarks/ergebnisse/hotpaths_<commit>_<zeit>.json)")
+    parser.add_argument("--vergleich", metavar="JSON", help="frühere Ergebnisdatei zum Vergleich")
+    args = parser.parse_args(argv)
+
+    nur = set(args.nur.split(",")) if args.nur else set(FAELLE)
+    unbekannt = nur - set(FAELLE)
+    if unbekannt:
+        parser.error(f"unbekannte Fälle: {', '.join(sorted(unbekannt))}")
+
+    faelle = []
+    for cols, rows in (RASTER_SCHNELL if args.schnell else RASTER):
+        for name, words in word_lists().items():
+            faelle += grid_cases(cols, rows, name, words)
+    for anzahl in (SCHLITZE_SCHNELL if args.schnell else SCHLITZE):
+        faelle += strip_cases(anzahl)
+
+    alt = {}
+    if args.vergleich:
+        with open(args.vergleich, "r", encoding="utf-8") as f:
+            alt = {case_key(e): e for e in json.load(f)["ergebnisse"]}
+
+    ergebnisse = []
+    for fall, parameter, fn, einheiten, einheit in faelle:
+        if fall not in nur:
+            continue
+        zeiten = measure(fn, args.min_zeit, args.max_laeufe)
+        median = statistics.median(zeiten)
+        eintrag = {
+            "fall": fall,
+            "parameter": parameter,
+            "laeufe": len(zeiten),
+            "median_ms": round(median * 1000, 4),
+            "min_ms": round(min(zeiten) * 1000, 4),
+            "durchsatz": round(einheiten / median, 1),
+            "einheit": einheit,
+            "spitze_kib": round(peak_memory(fn) / 1024, 1),
+        }
+        ergebnisse.append(eintrag)
+
+        zeile = (f"{fall:22s} {' '.join(f'{k}={v}' for k, v in parameter.items()):32s} "
+                 f"{eintrag['median_ms']:10.3f} ms {eintrag['durchsatz']:14,.0f} {einheit:11s} "
+                 f"{eintrag['spitze_kib']:10.1f} KiB")
+        frueher = alt.get(case_key(eintrag))
+        if frueher:
+            zeile += f"   x{frueher['median_ms'] / eintrag['median_ms']:.2f} ggü. {frueher['median_ms']:.3f} ms"
+        print(zeile, flush=True)
+
+    commit = git_commit()
+    ausgabe = args.ausgabe or os.path.join(
+        ROOT, "benchmarks", "ergebnisse", f"hotpaths_{commit or 'unbekannt'}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(ausgabe)), exist_ok=True)
+    with open(ausgabe, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "zeit": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "plattform": platform.platform(),
+                "schnell": args.schnell,
+            },
+            "ergebnisse": ergebnisse,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"Ergebnisse gespeichert: {ausgabe}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
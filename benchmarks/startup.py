@@ -0,0 +1,62 @@
+## Startzeit-Benchmark für Scriptmaker und Trennsteg Generator
+## Importiert beide Programme in frischen Prozessen (Median aus mehreren Läufen) und prüft,
+## dass ezdxf, matplotlib und Pmw beim Start nicht geladen werden (die kommen erst beim Export/Vorschau).
+## Rückgabewert 1, wenn das Zeitbudget überschritten oder ein schweres Modul geladen wird.
+##
+## Aufruf: python benchmarks/startup.py [--laeufe 7] [--max-ms 150]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from startprofil import parse_importtime
+
+PROGRAMME = ("ScriptmakerV2", "DXF_Generator_TrennungenV1")
+SCHWER = ("ezdxf", "matplotlib", "Pmw", "numpy")
+
+
+def measure(modul):
+    # (Prozess-Wandzeit ms, Importzeit des Moduls ms, geladene schwere Module)
+    code = f"import sys, {modul}; print(','.join(m for m in {SCHWER!r} if m in sys.modules))"
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, cwd=ROOT)
+    wand = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    importzeit = sum(e[2] for e in parse_importtime(proc.stderr) if e[0] == modul) / 1000
+    geladen = [m for m in proc.stdout.strip().split(",") if m]
+    return wand, importzeit, geladen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startzeit-Benchmark")
+    parser.add_argument("--laeufe", type=int, default=7, help="Läufe je Programm (Median)")
+    parser.add_argument("--max-ms", type=float, default=150.0, help="Budget für den Import je Programm [ms]")
+    args = parser.parse_args(argv)
+
+    fehler = 0
+    for modul in PROGRAMME:
+        messungen = [measure(modul) for _ in range(args.laeufe)]
+        wand = statistics.median(m[0] for m in messungen)
+        importzeit = statistics.median(m[1] for m in messungen)
+        geladen = sorted({name for m in messungen for name in m[2]})
+        status = "ok"
+        if importzeit > args.max_ms:
+            status = f"ZU LANGSAM (> {args.max_ms:.0f} ms)"
+            fehler += 1
+        if geladen:
+            status = f"lädt beim Start: {', '.join(geladen)}"
+            fehler += 1
+        print(f"{modul:28s} Import {importzeit:7.1f} ms   Prozess {wand:7.1f} ms   {status}")
+    return 1 if fehler else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
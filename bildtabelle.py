@@ -0,0 +1,178 @@
+## Bildtabelle für Scriptmaker
+## Fertige LED-Bilder für jede Uhrzeit als Headerdatei - die Firmware braucht keine Wortlogik mehr,
+## ein Update der Anzeige ist ein Tabellenzugriff:
+## - Bilder aus der Tagessimulation (zeitsimulation.py), 12 Stunden je 5 Minuten (144 Einträge) oder je Minute
+##   (720 Einträge, die Minutenpunkte als zusätzliche Zeile, links beginnend)
+## - Zeilen wie im Icon-Export (höchstes Bit = linke Spalte)
+## - Formate: dict  (verschiedene Bilder einmal, Bits ohne Auffüllen, dazu Bildindex je Eintrag)
+##            delta (XOR zum vorherigen Eintrag, Lauflängen; zu jeder vollen Stunde ein Schlüsselbild)
+## - frameEntry(stunde, minute) und frameDecode(eintrag, rows) im Header, der Kopfkommentar nennt den
+##   Flash-Bedarf aller Formate und die Kompression gegenüber der ungepackten Tabelle
+
+# -*- coding: utf-8 -*-
+
+from icon_bibliothek import encode
+
+FORMATE = ("dict", "delta")
+TAKTE = (5, 1)                 # Minuten je Eintrag
+MINUTENPUNKTE = 4
+
+
+def zeitbilder(bericht, takt=5):
+    # Bilder (Tupel von Zeilen-Ints) für 12 Stunden, Eintrag = stunde * (60 / takt) + minute / takt
+    # je Minute mit Minutenpunkten als letzte Zeile (nur wenn die Uhr Minutenpunkte hat)
+    import numpy as np
+
+    if takt not in TAKTE:
+        raise ValueError(f"Takt {takt} Minuten nicht möglich ({', '.join(map(str, TAKTE))})")
+    _, zeilen, spalten = bericht.leds.shape
+    gewichte = 1 << np.arange(spalten - 1, -1, -1, dtype=np.int64)
+    reihen = (bericht.leds.astype(np.int64) @ gewichte).tolist()            # (144, zeilen)
+    if takt == 5:
+        return [tuple(r) for r in reihen]
+
+    bilder = []
+    for satz in reihen:
+        for punkte in range(5):
+            if bericht.minanzeige or spalten < MINUTENPUNKTE:
+                bilder.append(tuple(satz))
+            else:
+                bilder.append(tuple(satz) + (((1 << punkte) - 1) << (spalten - punkte),))
+    return bilder
+
+
+def encode_frames(bilder, zeilen, spalten, format="dict", schluessel=12):
+    # dict: (daten, bildindex je Eintrag, anzahl verschiedener Bilder)
+    # delta: (daten, offsets je Eintrag plus Ende, Einträge je Schlüsselbild)
+    if format == "dict":
+        index, verschieden = {}, []
+        for rows in bilder:
+            if rows not in index:
+                index[rows] = len(verschieden)
+                verschieden.append(rows)
+        data, _ = encode(verschieden, zeilen, spalten, "bits")
+        return data, [index[rows] for rows in bilder], len(verschieden)
+    if format != "delta":
+        raise ValueError(f"unbekanntes Tabellenformat {format} ({', '.join(FORMATE)})")
+    data, offsets = bytearray(), []
+    for start in range(0, len(bilder), schluessel):
+        teil, teil_offsets = encode(bilder[start:start + schluessel], zeilen, spalten, "delta")
+        offsets += [len(data) + o for o in teil_offsets[:-1]]
+        data += teil
+    offsets.append(len(data))
+    return bytes(data), offsets, schluessel
+
+
+def flash_bytes(bilder, zeilen, spalten, schluessel=12):
+    # Daten + Tabellen in Byte je Format, "roh" = eine Zeile (uint16_t/uint32_t) je Zeile und Eintrag
+    zeile_bytes = 2 if spalten <= 16 else 4
+    groessen = {"roh": zeile_bytes * zeilen * len(bilder)}
+    data, index, verschieden = encode_frames(bilder, zeilen, spalten, "dict")
+    groessen["dict"] = len(data) + len(index) * (1 if verschieden <= 256 else 2)
+    data, offsets, _ = encode_frames(bilder, zeilen, spalten, "delta", schluessel)
+    groessen["delta"] = len(data) + 2 * len(offsets)
+    return groessen
+
+
+DECODER_DICT = """
+static uint16_t frameEntry(uint8_t hour, uint8_t minute) {
+    return (hour % 12) * (60 / FRAME_MINUTES) + minute / FRAME_MINUTES;
+}
+
+static void frameDecode(uint16_t entry, frame_row_t rows[FRAME_ROWS]) {
+    uint32_t bit = (uint32_t)FRAME_INDEX_READ(&frameIndex[entry]) * FRAME_ROWS * FRAME_COLS;
+    for (uint8_t r = 0; r < FRAME_ROWS; r++) {
+        frame_row_t value = 0;
+        for (uint8_t c = 0; c < FRAME_COLS; c++, bit++) {
+            value = value << 1 | ((pgm_read_byte(&frameData[bit >> 3]) >> (7 - (bit & 7))) & 1);
+        }
+        rows[r] = value;
+    }
+}
+"""
+
+DECODER_DELTA = """
+static uint16_t frameEntry(uint8_t hour, uint8_t minute) {
+    return (hour % 12) * (60 / FRAME_MINUTES) + minute / FRAME_MINUTES;
+}
+
+static void frameRuns(uint16_t entry, frame_row_t rows[FRAME_ROWS]) {
+    // Lauflängen eines Eintrags per XOR in rows eintragen
+    uint16_t pos = pgm_read_word(&frameOffsets[entry]);
+    const uint16_t end = pgm_read_word(&frameOffsets[entry + 1]);
+    uint16_t bit = 0;
+    uint8_t value = 0;
+    while (pos < end) {
+        for (uint8_t run = pgm_read_byte(&frameData[pos++]); run; run--, bit++) {
+            if (value) {
+                rows[bit / FRAME_COLS] ^= (frame_row_t)1 << (FRAME_COLS - 1 - bit % FRAME_COLS);
+            }
+        }
+        value ^= 1;
+    }
+}
+
+static void frameDecode(uint16_t entry, frame_row_t rows[FRAME_ROWS]) {
+    // vom Schlüsselbild der Stunde bis zum Eintrag
+    for (uint8_t r = 0; r < FRAME_ROWS; r++) {
+        rows[r] = 0;
+    }
+    for (uint16_t e = entry - entry % FRAME_KEY; e <= entry; e++) {
+        frameRuns(e, rows);
+    }
+}
+"""
+
+
+def build_frame_table_text(bericht, letters, takt=5, format="dict", titel=""):
+    # Inhalt der Bildtabelle .h; letters = Buchstaben je Reihe (für den Kommentar), titel z.B. "DE 11x10"
+    bilder = zeitbilder(bericht, takt)
+    zeilen, spalten = len(bilder[0]), bericht.leds.shape[2]
+    if spalten > 32:
+        raise ValueError("höchstens 32 Spalten (frame_row_t)")
+    schluessel = 60 // takt
+    groessen = flash_bytes(bilder, zeilen, spalten, schluessel)
+    if format == "dict":
+        data, index, verschieden = encode_frames(bilder, zeilen, spalten, "dict")
+    else:
+        data, offsets, _ = encode_frames(bilder, zeilen, spalten, format, schluessel)
+        if len(data) > 0xFFFF:
+            raise ValueError("Tabelle zu groß für uint16_t-Offsets, Format dict verwenden")
+
+    text = "#pragma once\n\n"
+    text += f"/* Bildtabelle {titel}: {len(bilder)} Einträge je {takt} Minute{'n' if takt > 1 else ''}, "
+    text += f"Format {format}"
+    text += f", {verschieden} verschiedene Bilder\n" if format == "dict" else "\n"
+    text += " * Flash (Daten + Tabellen): " + ", ".join(f"{k} {v} Byte" for k, v in groessen.items()) + "\n"
+    text += f" * Kompression: {groessen['roh'] / groessen[format]:.1f} : 1 gegenüber roh\n"
+    if bericht.fehlend:
+        text += " * ACHTUNG: " + "; ".join(bericht.meldungen()) + "\n"
+    text += " *\n"
+    text += "".join(f" *   {' '.join(l or ' ' for l in reihe)}\n" for reihe in letters)
+    if zeilen > len(letters):
+        text += f" *   Minutenpunkte (Zeile {zeilen - 1})\n"
+    text += " */\n\n"
+
+    text += (f"#define FRAME_ROWS {zeilen}\n#define FRAME_COLS {spalten}\n#define FRAME_COUNT {len(bilder)}\n"
+             f"#define FRAME_MINUTES {takt}\n")
+    text += f"\ntypedef {'uint16_t' if spalten <= 16 else 'uint32_t'} frame_row_t;\n\n"
+    if format == "dict":
+        klein = verschieden <= 256
+        text += (f"static const {'uint8_t' if klein else 'uint16_t'} frameIndex[FRAME_COUNT] PROGMEM = {{\n"
+                 + _numbers_text(index) + "\n};\n\n")
+        text += f"static const uint8_t frameData[{len(data)}] PROGMEM = {{\n{_numbers_text(data, hexa=True)}\n}};\n"
+        text += f"\n#define FRAME_INDEX_READ {'pgm_read_byte' if klein else 'pgm_read_word'}\n"
+        text += DECODER_DICT
+    else:
+        text += f"#define FRAME_KEY {schluessel}\n\n"
+        text += (f"static const uint16_t frameOffsets[{len(offsets)}] PROGMEM = {{\n"
+                 + _numbers_text(offsets) + "\n};\n\n")
+        text += f"static const uint8_t frameData[{len(data)}] PROGMEM = {{\n{_numbers_text(data, hexa=True)}\n}};\n"
+        text += DECODER_DELTA
+    return text
+
+
+def _numbers_text(werte, pro_zeile=16, hexa=False):
+    zahl = (lambda w: f"0x{w:02x}") if hexa else str
+    zeilen = [", ".join(map(zahl, werte[i:i + pro_zeile])) for i in range(0, len(werte), pro_zeile)]
+    return ",\n".join("    " + z for z in zeilen)
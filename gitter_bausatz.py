@@ -0,0 +1,173 @@
+# gitter_bausatz.py
+# Kompletter Gitter-Bausatz aus einer Scriptmaker-Vorlage
+# Frontplatte (DXF Vorlage) und alle passenden Trennstege in einem Schritt, für beliebige Rastergrößen.
+# - Buchstabenmitten und Schlitzmitten kommen aus demselben Raster (trennsteg_geometrie.grid_lines)
+# - Stege zwischen den Reihen (waagerecht, Schlitze an den Spaltengrenzen) und zwischen den Spalten (senkrecht,
+#   Schlitze an den Reihengrenzen); je Richtung ein Steg an jeder Grenze, die Außenkanten eingeschlossen
+# - vor dem Schreiben wird geprüft, ob die gezeichneten Schlitze auf den Grenzen liegen und jeder Buchstabe
+#   mittig zwischen zwei Stegen sitzt
+# - Unterschied zum Trennsteg Generator: der schneidet immer ANZAHL_SCHLITZE (12) Schlitze. Hier hat jeder Steg
+#   genau einen Schlitz je Grenze der Gegenrichtung. Bei 11×10 sind die Stege zwischen den Reihen gleich
+#   ("Senkrecht", 12 Schlitze ab 28.0837 mm), den Stegen zwischen den Spalten fehlt der 12. Schlitz von
+#   "Waagerecht" (11 Schlitze ab 36.4170 mm) - der läge außerhalb des Rasters und bleibt leer
+#
+# Aufruf:
+#   python gitter_bausatz.py --vorlage uhr.json --ausgabe bausatz/
+#   python gitter_bausatz.py --vorlage uhr.json --rahmen 300 --schlitzbreite 3 --bogen 600x400
+# ------------------------------------------------------
+
+import argparse
+import os
+import sys
+
+from trennsteg_geometrie import (SCHLITZABSTAND, TRENNSTEGHOEHE, RAHMEN_MM, STEGLAENGE, grid_lines,
+                                 strip_geometry, validate_dimensions, validate_values)
+
+TOLERANZ = 0.001    # mm erlaubte Abweichung zwischen Schlitz und Rastergrenze
+
+
+class Stegsatz:
+    # alle gleichen Stege einer Richtung
+    __slots__ = ("name", "stueck", "versatz", "laenge", "hoehe", "schlitzbreite", "erstes", "abstand",
+                 "soll", "geometrie")
+
+    def __init__(self, name, stueck, soll, abstand, laenge, hoehe, schlitzbreite, rahmen_mm):
+        import numpy as np
+
+        self.name = name
+        self.stueck = stueck
+        self.soll = np.sort(soll)                       # Schlitzmitten in Rahmenkoordinaten
+        self.versatz = (rahmen_mm - laenge) / 2         # Steg mittig im Rahmen
+        self.laenge = laenge
+        self.hoehe = hoehe                              # bereits verdoppelt
+        self.schlitzbreite = schlitzbreite
+        self.erstes = round(float(self.soll[0]) - self.versatz, 4)
+        self.abstand = abstand
+        self.geometrie = strip_geometry(laenge, hoehe, schlitzbreite, self.erstes, len(self.soll), abstand)
+
+    def schlitz_mitten(self):
+        # Schlitzmitten so, wie sie gezeichnet werden, in Rahmenkoordinaten
+        schlitze = self.geometrie[1]
+        return (schlitze[:, 0, 0] + schlitze[:, 1, 0]) / 2 + self.versatz
+
+
+def kit_strips(rows, cols, pitch=SCHLITZABSTAND, rahmen_mm=RAHMEN_MM, laenge=STEGLAENGE,
+               hoehe=TRENNSTEGHOEHE, schlitzbreite=0.3):
+    # hoehe wie im Trennsteg Generator eingegeben (wird verdoppelt); Rückgabe (x_mitten, y_mitten, [Stegsatz])
+    x_mitten, y_mitten, x_stege, y_stege = grid_lines(rows, cols, pitch, pitch, rahmen_mm)
+    saetze = [
+        Stegsatz("reihen", rows + 1, x_stege, pitch, laenge, hoehe * 2, schlitzbreite, rahmen_mm),
+        Stegsatz("spalten", cols + 1, y_stege, pitch, laenge, hoehe * 2, schlitzbreite, rahmen_mm),
+    ]
+    return x_mitten, y_mitten, saetze
+
+
+def check_kit(x_mitten, y_mitten, saetze, rahmen_mm, text_hoehe=None):
+    # Regeln des Trennsteg Generators + Passung Frontplatte/Stege; Rückgabe Liste der Fehlermeldungen
+    import numpy as np
+
+    fehler = []
+    for satz in saetze:
+        meldung = (validate_dimensions(satz.laenge, satz.hoehe, satz.schlitzbreite)
+                   or validate_values(satz.schlitzbreite, len(satz.soll), 0, satz.abstand))
+        if meldung:
+            fehler.append(f"Stege ({satz.name}): {meldung}")
+            continue
+        if satz.versatz < 0:
+            fehler.append(f"Stege ({satz.name}): {satz.laenge:.2f} mm lang, der Rahmen hat nur {rahmen_mm:.2f} mm.")
+
+        ist = satz.schlitz_mitten()
+        abweichung = float(np.abs(ist - satz.soll).max())
+        if abweichung > TOLERANZ:
+            fehler.append(f"Stege ({satz.name}): Schlitze weichen bis {abweichung:.4f} mm vom Raster ab.")
+        links = float(satz.geometrie[1][0, 0, 0])
+        rechts = float(satz.geometrie[1][-1, 1, 0])
+        if links <= 0 or rechts >= satz.laenge:
+            fehler.append(f"Stege ({satz.name}): die äußeren Schlitze liegen nicht ganz im Steg "
+                          f"(Raster {float(satz.soll[-1] - satz.soll[0]):.2f} mm, Steg {satz.laenge:.2f} mm).")
+
+        # Buchstaben der Frontplatte mittig zwischen den gezeichneten Schlitzen der quer laufenden Stege
+        mitten = np.sort(x_mitten if satz.name == "reihen" else y_mitten)
+        versatz = float(np.abs(mitten - (ist[:-1] + ist[1:]) / 2).max())
+        if versatz > TOLERANZ:
+            fehler.append(f"Frontplatte/Stege ({satz.name}): Buchstaben bis {versatz:.4f} mm neben der Feldmitte.")
+        if text_hoehe is not None and text_hoehe > satz.abstand - satz.schlitzbreite:
+            fehler.append(f"Frontplatte: Texthöhe {text_hoehe:.2f} mm passt nicht zwischen die Stege "
+                          f"({satz.abstand - satz.schlitzbreite:.2f} mm).")
+    return fehler
+
+
+def build_kit(vorlage, ausgabe, pitch=SCHLITZABSTAND, rahmen_mm=RAHMEN_MM, laenge=None, hoehe=TRENNSTEGHOEHE,
+              schlitzbreite=0.3, use_blocks=False, outlines=False, bogen=None, rand=5.0):
+    # Frontplatte + Trennstege einer Vorlage schreiben; Rückgabe (raster, [Stegsatz], dateien), ValueError bei Fehlern
+    from ScriptmakerV2 import TEXT_HOEHE, build_letter_grid_doc, load_template_file
+    from DXF_Generator_TrennungenV1 import build_strip_doc
+
+    if laenge is None:
+        laenge = rahmen_mm - (RAHMEN_MM - STEGLAENGE)       # gleiches Spiel im Rahmen wie beim IKEA Rahmen
+    daten = load_template_file(vorlage)
+    raster = daten["raster"]
+    x_mitten, y_mitten, saetze = kit_strips(raster.rows, raster.cols, pitch, rahmen_mm, laenge, hoehe,
+                                            schlitzbreite)
+    fehler = check_kit(x_mitten, y_mitten, saetze, rahmen_mm, TEXT_HOEHE)
+    if fehler:
+        raise ValueError("\n".join(fehler))
+
+    os.makedirs(ausgabe, exist_ok=True)
+    name = os.path.splitext(os.path.basename(vorlage))[0]
+    dateien = [os.path.join(ausgabe, f"{name}_front.dxf")]
+    build_letter_grid_doc(raster.cells, raster.rows, raster.cols, pitch, pitch, TEXT_HOEHE, rahmen_mm,
+                          daten["minanzeige"], use_blocks, outlines).saveas(dateien[0])
+
+    if bogen is None:
+        for satz in saetze:
+            pfad = os.path.join(ausgabe, f"{name}_steg_{satz.name}.dxf")
+            build_strip_doc(satz.laenge, satz.hoehe, satz.schlitzbreite, satz.erstes, len(satz.soll),
+                            satz.abstand).saveas(pfad)
+            dateien.append(pfad)
+    else:
+        from trennsteg_nesting import Steg, write_sheets
+
+        stege = [Steg(f"{satz.name} {i + 1}", satz.laenge, satz.hoehe, satz.schlitzbreite, satz.geometrie)
+                 for satz in saetze for i in range(satz.stueck)]
+        dateien += write_sheets(stege, *bogen, ausgabe, rand)
+    return raster, saetze, dateien
+
+
+def main(argv=None):
+    from trennsteg_nesting import _sheet_size
+
+    parser = argparse.ArgumentParser(description="Frontplatte und alle Trennstege zu einer Scriptmaker-Vorlage")
+    parser.add_argument("--vorlage", required=True, metavar="JSON", help="Vorlage aus dem Scriptmaker")
+    parser.add_argument("--ausgabe", default="bausatz", help="Zielverzeichnis")
+    parser.add_argument("--raster", type=float, default=SCHLITZABSTAND, help="Rastermaß Mitte -> Mitte [mm]")
+    parser.add_argument("--rahmen", type=float, default=RAHMEN_MM, help="Außenmaß des Rahmens [mm]")
+    parser.add_argument("--laenge", type=float, default=None,
+                        help=f"Länge der Stege [mm] (Standard: Rahmen - {RAHMEN_MM - STEGLAENGE:g})")
+    parser.add_argument("--hoehe", type=float, default=TRENNSTEGHOEHE, help="Höhe wie im Trennsteg Generator [mm]")
+    parser.add_argument("--schlitzbreite", type=float, default=0.3, help="Schlitzbreite [mm]")
+    parser.add_argument("--bloecke", action="store_true", help="Frontplatte: Buchstaben als DXF-Blöcke")
+    parser.add_argument("--konturen", action="store_true", help="Frontplatte: Buchstaben als Konturen")
+    parser.add_argument("--bogen", type=_sheet_size, metavar="BREITExHOEHE",
+                        help="Stege auf Bögen verteilen (bogen_NN.dxf) statt je Richtung ein Steg-DXF")
+    parser.add_argument("--rand", type=float, default=5.0, help="freier Rand am Bogen [mm]")
+    args = parser.parse_args(argv)
+
+    try:
+        raster, saetze, dateien = build_kit(args.vorlage, args.ausgabe, args.raster, args.rahmen, args.laenge,
+                                            args.hoehe, args.schlitzbreite, args.bloecke, args.konturen,
+                                            args.bogen, args.rand)
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Raster {raster.cols}×{raster.rows}, Rastermaß {args.raster} mm, Rahmen {args.rahmen} mm")
+    for satz in saetze:
+        print(f"  {satz.stueck} Stege zwischen den {satz.name.capitalize()}: {satz.laenge:.2f} mm, {len(satz.soll)} Schlitze, "
+              f"erster Schlitz {satz.erstes:.4f} mm von links")
+    print(f"{len(dateien)} Dateien -> {args.ausgabe}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+## Glyph-Konturen für den DXF Export
+## Wandelt Buchstaben über matplotlib (font_manager / TextPath) in geschlossene Polylinien um
+## - Maße werden aus den echten Glyph-Grenzen bestimmt (z.B. Umlaute mit Punkten)
+## - gestaucht wird nur, was deutlich über die Versalhöhe ragt (Umlautpunkte, Akzente); Überhang runder
+##   Buchstaben (O, S, 0) und Unterlängen (J, Q) bleiben unverändert
+## - Ergebnis wird auf der Platte zwischengespeichert, Schlüssel: Schriftdatei, Zeichen, Höhe, Breitenfaktor
+##
+## Cache-Verzeichnis: ~/.cache/scriptmaker/glyphen (änderbar über SCRIPTMAKER_GLYPH_CACHE)
+
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+from matplotlib import font_manager
+from matplotlib.textpath import TextPath
+
+CACHE_VERSION = 2
+CACHE_DIR = os.environ.get("SCRIPTMAKER_GLYPH_CACHE",
+                           os.path.join(os.path.expanduser("~"), ".cache", "scriptmaker", "glyphen"))
+REFERENZ = "H"      # Versalhöhe = Höhe von H
+UEBERSTAND = 0.05   # erst ab 5 % der Versalhöhe über H gilt eine Glyphe als zu hoch (runde Buchstaben ~2 %)
+
+_memory = {}
+
+
+@lru_cache(maxsize=None)
+def font_file(family, fallback=True):
+    # Pfad der Schriftdatei; ohne fallback None, wenn die Schrift nicht installiert ist
+    try:
+        return font_manager.findfont(font_manager.FontProperties(family=family),
+                                     fallback_to_default=fallback)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def glyph_bounds(letter, path):
+    # (x0, y0, x1, y1) der Glyphe bei Schriftgröße 1
+    extents = TextPath((0, 0), letter, size=1, prop=font_manager.FontProperties(fname=path)).get_extents()
+    return extents.x0, extents.y0, extents.x1, extents.y1
+
+
+def height_factor(letter, path):
+    # Faktor, damit Glyphen mit Punkten/Akzenten über der Versalhöhe (Umlaute) ganz hineinpassen, sonst 1.0
+    _, y0, _, y1 = glyph_bounds(letter, path)
+    _, ref0, _, ref1 = glyph_bounds(REFERENZ, path)
+    if y1 - y0 <= 0 or y1 - ref1 <= UEBERSTAND * (ref1 - ref0):
+        return 1.0
+    return min(1.0, round(float((ref1 - ref0) / (y1 - y0)), 4))
+
+
+def _cache_key(letter, path, height, width):
+    stat = os.stat(path)
+    raw = json.dumps([CACHE_VERSION, os.path.abspath(path), stat.st_mtime_ns, stat.st_size,
+                      letter, round(height, 4), round(width, 4)])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def glyph_outline(letter, path, height, width=1.0):
+    # Liste geschlossener Polygone [(x, y), ...], Glyphe mittig um (0, 0)
+    key = _cache_key(letter, path, height, width)
+    polygons = _memory.get(key)
+    if polygons is not None:
+        return polygons
+
+    cache_file = os.path.join(CACHE_DIR, key[:2], key + ".json")
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            polygons = [[tuple(p) for p in poly] for poly in json.load(f)]
+    except (OSError, ValueError):
+        polygons = _convert(letter, path, height, width)
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            tmp = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(polygons, f)
+            os.replace(tmp, cache_file)   # atomar, auch bei parallelen Batch-Prozessen
+        except OSError:
+            pass   # ohne Cache geht es auch
+
+    _memory[key] = polygons
+    return polygons
+
+
+def _convert(letter, path, height, width):
+    if not letter.strip():
+        return []
+    x0, y0, x1, y1 = glyph_bounds(letter, path)
+    _, ref0, _, ref1 = glyph_bounds(REFERENZ, path)
+    # Versalhöhe = height, zu hohe Glyphen (Umlaute) werden gestaucht, die Breite bleibt
+    factor = height_factor(letter, path)
+    scale = height / (ref1 - ref0)
+    sy = scale * factor
+    sx = scale * width
+    # senkrecht mittig auf die Versalhöhe wie TEXT mit MIDDLE_CENTER, gestauchte Glyphen auf ihre Grenzen
+    cx = (x0 + x1) / 2
+    cy = (y0 + y1) / 2 if factor < 1 else (ref0 + ref1) / 2
+
+    text_path = TextPath((0, 0), letter, size=1, prop=font_manager.FontProperties(fname=path))
+    polygons = []
+    for poly in text_path.to_polygons(closed_only=True):
+        points = [(round((x - cx) * sx, 4), round((y - cy) * sy, 4)) for x, y in poly]
+        if len(points) > 1 and points[0] == points[-1]:
+            points.pop()     # LWPOLYLINE wird ohnehin geschlossen
+        if len(points) >= 3:
+            polygons.append(points)
+    return polygons
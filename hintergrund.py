@@ -0,0 +1,143 @@
+## Hintergrund-Exporte für Scriptmaker
+## Lange Exporte (DXF mit Konturen, große Raster) laufen in einem eigenen Thread, das Fenster bleibt bedienbar:
+## - Fortschritt und Ergebnis gehen über eine Queue an den Tk-Thread, abgeholt mit after()
+## - "Abbrechen" setzt ein Event, die Arbeit prüft es bei jeder Fortschrittsmeldung (Fortschritt.melde)
+## - Tk-Objekte nur im Hauptthread anfassen: alles, was die Arbeit braucht, vorher einsammeln
+## - Dateien über eine temporäre Datei schreiben und erst am Ende umbenennen (Abbruch = keine halbe Datei)
+
+# -*- coding: utf-8 -*-
+
+import os
+import queue
+import threading
+import tkinter as tk
+from tkinter import messagebox
+
+ABFRAGE_MS = 50          # so oft holt der Tk-Thread Fortschritt und Ergebnis ab
+
+
+class Abgebrochen(Exception):
+    pass
+
+
+class Fortschritt:
+    # wird der Arbeit übergeben und im Worker-Thread aufgerufen
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.abbruch = threading.Event()
+
+    def melde(self, anteil, text=None):
+        # anteil 0..1; wirft Abgebrochen, sobald "Abbrechen" gedrückt wurde
+        if self.abbruch.is_set():
+            raise Abgebrochen()
+        self.queue.put(("fortschritt", anteil, text))
+
+    def teil(self, von, bis, text=None):
+        # Rückruf für einen Abschnitt der Arbeit: anteil 0..1 des Abschnitts -> von..bis insgesamt
+        return lambda anteil, _text=None: self.melde(von + (bis - von) * anteil, _text or text)
+
+
+def write_atomic(path, schreiben, fortschritt=None):
+    # schreiben(tmp_pfad) erzeugt die Datei, umbenannt wird erst danach (und nur ohne Abbruch)
+    write_atomic_all({path: schreiben}, fortschritt)
+
+
+def write_atomic_all(auftraege, fortschritt=None):
+    # mehrere Dateien {pfad: schreiben}: erst alle temporär schreiben, umbenannt wird nur, wenn alle gelungen sind
+    tmps = {path: f"{path}.{os.getpid()}.tmp" for path in auftraege}
+    try:
+        for path, schreiben in auftraege.items():
+            schreiben(tmps[path])
+        if fortschritt is not None:
+            fortschritt.melde(1.0)
+        for path, tmp in tmps.items():
+            os.replace(tmp, path)
+    finally:
+        for tmp in tmps.values():
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+def text_writer(text):
+    # schreiben(pfad) für write_atomic / write_atomic_all
+    def schreiben(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+    return schreiben
+
+
+def write_text(path, text, fortschritt=None):
+    write_atomic(path, text_writer(text), fortschritt)
+
+
+class Hintergrundexport:
+    # Fortschrittsfenster + Worker-Thread für eine Arbeit arbeit(fortschritt) -> ergebnis
+    # fertig(ergebnis) läuft danach im Tk-Thread, Fehler werden dort angezeigt
+
+    def __init__(self, root, titel, arbeit, fertig):
+        from tkinter import ttk
+
+        self.root = root
+        self.titel = titel
+        self.fertig = fertig
+        self.fortschritt = Fortschritt()
+        self.laeuft = True
+
+        self.fenster = tk.Toplevel(root)
+        self.fenster.title(titel)
+        self.fenster.transient(root)
+        self.fenster.resizable(False, False)
+        self.fenster.protocol("WM_DELETE_WINDOW", self.abbrechen)
+        self.text = tk.Label(self.fenster, text="Start ...", anchor="w", width=40)
+        self.text.pack(padx=10, pady=(10, 4), fill=tk.X)
+        self.balken = ttk.Progressbar(self.fenster, length=300, mode="determinate", maximum=1.0)
+        self.balken.pack(padx=10, pady=4)
+        self.knopf = tk.Button(self.fenster, text="Abbrechen", width=12, command=self.abbrechen)
+        self.knopf.pack(pady=(4, 10))
+
+        self.thread = threading.Thread(target=self._arbeite, args=(arbeit,), name=f"Export {titel}", daemon=True)
+        self.thread.start()
+        self.root.after(ABFRAGE_MS, self._abfragen)
+
+    def abbrechen(self):
+        self.fortschritt.abbruch.set()
+        self.knopf.config(state=tk.DISABLED)
+        self.text.config(text="Wird abgebrochen ...")
+
+    def _arbeite(self, arbeit):
+        # Worker-Thread: nur die Queue benutzen, kein Tk
+        try:
+            self.fortschritt.queue.put(("fertig", arbeit(self.fortschritt)))
+        except Abgebrochen:
+            self.fortschritt.queue.put(("abgebrochen", None))
+        except Exception as e:
+            self.fortschritt.queue.put(("fehler", e))
+
+    def _abfragen(self):
+        # Tk-Thread: alle bisherigen Meldungen abholen, bei Ende Fenster schließen und Ergebnis melden
+        ende = None
+        try:
+            while True:
+                art, *werte = self.fortschritt.queue.get_nowait()
+                if art == "fortschritt":
+                    anteil, text = werte
+                    self.balken["value"] = anteil
+                    if text and not self.fortschritt.abbruch.is_set():
+                        self.text.config(text=text)
+                else:
+                    ende = (art, werte[0])
+        except queue.Empty:
+            pass
+
+        if ende is None:
+            self.root.after(ABFRAGE_MS, self._abfragen)
+            return
+
+        self.laeuft = False
+        self.fenster.destroy()
+        art, wert = ende
+        if art == "fertig":
+            self.fertig(wert)
+        elif art == "fehler":
+            messagebox.showerror(f"Fehler: {self.titel}", f"{self.titel} konnte nicht gespeichert werden:\n{wert}")
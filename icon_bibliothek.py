@@ -0,0 +1,276 @@
+## Icon-Bibliothek für Scriptmaker
+## Verwaltet benannte Icons (Bitmasken wie die Markierung im Raster) in icons/bibliothek.json und erzeugt daraus
+## die Icon-Headerdatei für die Uhr:
+## - gleiche Bilder werden nur einmal abgelegt, die Plätze (Icon-Nummern der Firmware) zeigen auf die Bilder
+## - Formate: bits  (Bits ohne Auffüllen hintereinander, Zugriff auf jede Zeile direkt)
+##            rle   (Lauflängen abwechselnd 0/1 je Bild, ein Byte je Lauf)
+##            delta (XOR zum vorherigen Bild, dann Lauflängen - klein bei ähnlichen Bildern)
+## - iconDecode(platz, rows) im Header entpackt jedes Format in icon_row_t rows[ICON_ROWS]
+## - "auswahl" ist die aktuelle Markierung im Raster zum Zeitpunkt des Exports
+
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import re
+
+BIBLIOTHEK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons", "bibliothek.json")
+AUSWAHL = "auswahl"
+FORMATE = ("bits", "rle", "delta")
+MAX_LAUF = 255               # längerer Lauf: 255, 0, Rest
+
+
+class IconBibliothek:
+
+    def __init__(self, zeilen, spalten, icons=None, plaetze=None):
+        self.zeilen = zeilen
+        self.spalten = spalten
+        self.icons = {}                        # name -> tuple(int je Zeile, höchste Spalte = höchstes Bit)
+        self.plaetze = list(plaetze or [])     # Icon-Nummer der Firmware -> name
+        for name, rows in (icons or {}).items():
+            self.add(name, rows)
+
+    def add(self, name, rows):
+        # rows: Binärstrings ("00110001100") oder Zahlen je Zeile
+        rows = tuple(int(r, 2) if isinstance(r, str) else int(r) for r in rows)
+        if len(rows) != self.zeilen or any(r >> self.spalten for r in rows):
+            raise ValueError(f"Icon {name}: erwartet {self.zeilen} Zeilen mit {self.spalten} Spalten")
+        if name == AUSWAHL:
+            raise ValueError(f"'{AUSWAHL}' ist für die aktuelle Markierung reserviert")
+        self.icons[name] = rows
+
+    def remove(self, name):
+        del self.icons[name]
+        self.plaetze = [p for p in self.plaetze if p != name]
+
+    @classmethod
+    def load(cls, path=BIBLIOTHEK):
+        with open(path, "r", encoding="utf-8") as f:
+            daten = json.load(f)
+        return cls(daten["zeilen"], daten["spalten"], daten.get("icons"), daten.get("plaetze"))
+
+    def save(self, path=BIBLIOTHEK):
+        # eine Zeile je Bildzeile, damit Änderungen im Diff lesbar bleiben
+        icons = ",\n".join(
+            f'    {json.dumps(name, ensure_ascii=False)}: [\n'
+            + ",\n".join(f'      "{r:0{self.spalten}b}"' for r in rows) + "\n    ]"
+            for name, rows in self.icons.items())
+        text = (f'{{\n  "zeilen": {self.zeilen},\n  "spalten": {self.spalten},\n'
+                f'  "plaetze": {json.dumps(self.plaetze, ensure_ascii=False)},\n'
+                f'  "icons": {{\n{icons}\n  }}\n}}\n')
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def frames(self, auswahl=None):
+        # (bilder, platz_bild): verschiedene Bilder in Reihenfolge des ersten Auftretens und Bildindex je Platz
+        bilder, index, platz_bild = [], {}, []
+        for name in self.plaetze:
+            if name == AUSWAHL:
+                rows = tuple(auswahl) if auswahl is not None else (0,) * self.zeilen
+            elif name in self.icons:
+                rows = self.icons[name]
+            else:
+                raise ValueError(f"Platz {len(platz_bild)}: Icon '{name}' ist nicht in der Bibliothek")
+            if rows not in index:
+                index[rows] = len(bilder)
+                bilder.append(rows)
+            platz_bild.append(index[rows])
+        return bilder, platz_bild
+
+
+# ---------- Kodierung ----------
+
+def frame_bits(rows, spalten):
+    # Bits eines Bildes zeilenweise, höchste Spalte zuerst (wie die Binärstrings)
+    return [(row >> b) & 1 for row in rows for b in range(spalten - 1, -1, -1)]
+
+
+def pack_bits(bits):
+    # MSB zuerst, letztes Byte mit Nullen aufgefüllt
+    data = bytearray((len(bits) + 7) // 8)
+    for i, bit in enumerate(bits):
+        if bit:
+            data[i >> 3] |= 0x80 >> (i & 7)
+    return bytes(data)
+
+
+def rle_encode(bits):
+    # Lauflängen abwechselnd 0 und 1, beginnend mit 0 (ggf. Länge 0)
+    laeufe = []
+    wert, lauf = 0, 0
+    for bit in bits:
+        if bit == wert:
+            lauf += 1
+            continue
+        laeufe.append(lauf)
+        wert, lauf = bit, 1
+    laeufe.append(lauf)
+    data = bytearray()
+    for lauf in laeufe:
+        while lauf > MAX_LAUF:
+            data += bytes((MAX_LAUF, 0))       # 255 gleiche Bits, dann ein leerer Lauf des anderen Werts
+            lauf -= MAX_LAUF
+        data.append(lauf)
+    return bytes(data)
+
+
+def rle_decode(data, anzahl):
+    bits = []
+    wert = 0
+    for lauf in data:
+        bits += [wert] * lauf
+        wert ^= 1
+    return bits[:anzahl]
+
+
+def encode(bilder, zeilen, spalten, format="bits"):
+    # (daten, offsets) - offsets je Bild (plus Ende) für rle/delta, None für bits
+    n = zeilen * spalten
+    if format == "bits":
+        return pack_bits([b for rows in bilder for b in frame_bits(rows, spalten)]), None
+    if format not in FORMATE:
+        raise ValueError(f"unbekanntes Icon-Format {format} ({', '.join(FORMATE)})")
+    data, offsets = bytearray(), []
+    vorher = [0] * n
+    for rows in bilder:
+        bits = frame_bits(rows, spalten)
+        if format == "delta":
+            bits, vorher = [a ^ b for a, b in zip(bits, vorher)], bits
+        offsets.append(len(data))
+        data += rle_encode(bits)
+    offsets.append(len(data))
+    return bytes(data), offsets
+
+
+def decode(data, offsets, bild, zeilen, spalten, format="bits"):
+    # Referenz zu iconDecode() im Header: Zeilen (int) von Bild bild
+    n = zeilen * spalten
+    if format == "bits":
+        bits = [(data[i >> 3] >> (7 - (i & 7))) & 1 for i in range(bild * n, (bild + 1) * n)]
+    else:
+        bits = [0] * n
+        erste = 0 if format == "delta" else bild
+        for k in range(erste, bild + 1):
+            teil = rle_decode(data[offsets[k]:offsets[k + 1]], n)
+            bits = [a ^ b for a, b in zip(bits, teil)] if format == "delta" else teil
+    return [int("".join(map(str, bits[r * spalten:(r + 1) * spalten])), 2) for r in range(zeilen)]
+
+
+def flash_bytes(bibliothek, auswahl=None):
+    # Daten + Tabellen in Byte je Format, "alt" = uint16_t je Zeile und Platz (bisheriger Export)
+    bilder, platz_bild = bibliothek.frames(auswahl)
+    groessen = {}
+    for format in FORMATE:
+        data, offsets = encode(bilder, bibliothek.zeilen, bibliothek.spalten, format)
+        groessen[format] = len(data) + len(platz_bild) + (2 * len(offsets) if offsets else 0)
+    groessen["alt"] = 2 * bibliothek.zeilen * len(platz_bild)
+    return groessen
+
+
+# ---------- Header ----------
+
+def _c_name(name):
+    return "ICON_" + re.sub(r"\W", "_", name.upper(), flags=re.ASCII)
+
+
+def _bytes_text(data, pro_zeile=16):
+    zeilen = [", ".join(f"0x{b:02x}" for b in data[i:i + pro_zeile]) for i in range(0, len(data), pro_zeile)]
+    return ",\n".join("    " + z for z in zeilen)
+
+
+DECODER_BITS = """
+static void iconDecode(uint8_t slot, icon_row_t rows[ICON_ROWS]) {
+    uint32_t bit = (uint32_t)pgm_read_byte(&iconSlots[slot]) * ICON_ROWS * ICON_COLS;
+    for (uint8_t r = 0; r < ICON_ROWS; r++) {
+        icon_row_t value = 0;
+        for (uint8_t c = 0; c < ICON_COLS; c++, bit++) {
+            value = value << 1 | ((pgm_read_byte(&iconData[bit >> 3]) >> (7 - (bit & 7))) & 1);
+        }
+        rows[r] = value;
+    }
+}
+"""
+
+DECODER_RLE = """
+static void iconRuns(uint8_t frame, icon_row_t rows[ICON_ROWS]) {
+    // Lauflängen eines Bildes per XOR in rows eintragen
+    uint16_t pos = pgm_read_word(&iconOffsets[frame]);
+    const uint16_t end = pgm_read_word(&iconOffsets[frame + 1]);
+    uint16_t bit = 0;
+    uint8_t value = 0;
+    while (pos < end) {
+        for (uint8_t run = pgm_read_byte(&iconData[pos++]); run; run--, bit++) {
+            if (value) {
+                rows[bit / ICON_COLS] ^= (icon_row_t)1 << (ICON_COLS - 1 - bit % ICON_COLS);
+            }
+        }
+        value ^= 1;
+    }
+}
+
+static void iconDecode(uint8_t slot, icon_row_t rows[ICON_ROWS]) {
+    const uint8_t frame = pgm_read_byte(&iconSlots[slot]);
+    for (uint8_t r = 0; r < ICON_ROWS; r++) {
+        rows[r] = 0;
+    }
+    for (uint16_t f = ERSTES; f <= frame; f++) {    // uint16_t: bei 256 Bildern ist frame = 255
+        iconRuns(f, rows);
+    }
+}
+"""
+
+
+def build_icon_library_text(bibliothek, auswahl=None, format="bits"):
+    # Inhalt der Icon .h Datei aus der Bibliothek; auswahl = Zeilen der aktuellen Markierung
+    zeilen, spalten = bibliothek.zeilen, bibliothek.spalten
+    bilder, platz_bild = bibliothek.frames(auswahl)
+    if len(platz_bild) > 256 or spalten > 32:
+        raise ValueError("höchstens 256 Plätze und 32 Spalten (uint8_t-Index, icon_row_t)")
+    data, offsets = encode(bilder, zeilen, spalten, format)
+    if offsets is not None and len(data) > 0xFFFF:
+        raise ValueError(f"Icon-Daten zu groß für uint16_t-Offsets ({len(data)} Byte), Format bits verwenden")
+    groessen = flash_bytes(bibliothek, auswahl)
+
+    erster_platz = {}
+    for platz, name in enumerate(bibliothek.plaetze):
+        erster_platz.setdefault(name, platz)
+    c_namen = {}
+    for name in erster_platz:
+        anderer = c_namen.setdefault(_c_name(name), name)
+        if anderer != name:
+            raise ValueError(f"Icons '{anderer}' und '{name}' ergeben beide {_c_name(name)}, einen davon umbenennen")
+    namen_je_bild = [[] for _ in bilder]
+    for platz, bild in enumerate(platz_bild):
+        name = bibliothek.plaetze[platz]
+        if name not in namen_je_bild[bild]:
+            namen_je_bild[bild].append(name)
+
+    text = "#pragma once\n\n"
+    text += (f"/* Icon-Bibliothek {spalten}x{zeilen}: {len(platz_bild)} Plätze, {len(bilder)} verschiedene Bilder, "
+             f"Format {format}\n")
+    text += " * Flash (Daten + Tabellen): " + ", ".join(f"{k} {v} Byte" for k, v in groessen.items()) + "\n"
+    for bild, rows in enumerate(bilder):
+        plaetze = [str(p) for p, b in enumerate(platz_bild) if b == bild]
+        text += f" *\n * Bild {bild}: {', '.join(namen_je_bild[bild])} (Platz {', '.join(plaetze)})\n"
+        for row in rows:
+            text += " *   " + " ".join("0" if (row >> b) & 1 else "." for b in range(spalten - 1, -1, -1)) + "\n"
+    text += " */\n\n"
+
+    text += f"#define ICON_ROWS {zeilen}\n#define ICON_COLS {spalten}\n#define ICON_COUNT {len(platz_bild)}\n\n"
+    text += f"typedef {'uint16_t' if spalten <= 16 else 'uint32_t'} icon_row_t;\n\n"
+    text += "enum IconName : uint8_t {\n"
+    text += "".join(f"    {c_name} = {erster_platz[name]},\n" for c_name, name in c_namen.items())
+    text += "};\n\n"
+    text += "static const uint8_t iconSlots[ICON_COUNT] PROGMEM = {" + ", ".join(map(str, platz_bild)) + "};\n\n"
+    if offsets is not None:
+        text += (f"static const uint16_t iconOffsets[{len(offsets)}] PROGMEM = {{"
+                 + ", ".join(map(str, offsets)) + "};\n\n")
+    text += f"static const uint8_t iconData[{len(data)}] PROGMEM = {{\n{_bytes_text(data)}\n}};\n"
+    if format == "bits":
+        text += DECODER_BITS
+    else:
+        # delta: Bild f = Bild 0 XOR ... XOR Änderung f, daher alle Bilder bis f durchlaufen
+        text += DECODER_RLE.replace("ERSTES", "0" if format == "delta" else "frame")
+    return text
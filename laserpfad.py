@@ -0,0 +1,278 @@
+# laserpfad.py
+# Laserpfad-Optimierung für die erzeugten DXF-Dateien
+# Der Laser schneidet in der Reihenfolge der Objekte in der Datei. Damit die Leerfahrten kurz werden:
+# - Reihenfolge nach dem nächsten Nachbarn, danach 2-opt Verbesserung
+# - Startpunkt geschlossener Konturen und Richtung offener Linien werden mitgewählt
+# - Außenkonturen zuletzt, damit das Teil erst am Ende aus dem Bogen fällt
+# - kollineare Linien (z.B. Mittellinie zwischen den Schlitzen) werden zu Polylinien zusammengefasst
+# Wird vom Trennsteg Generator, der Bogen-Schachtelung und vom Scriptmaker (Frontplatte) genutzt.
+# ------------------------------------------------------
+
+import math
+
+GENAUIGKEIT = 4          # Nachkommastellen beim Vergleich von Punkten
+MAX_STARTPUNKTE = 8      # Kandidaten je Kontur bei der Nachbarsuche (Feinwahl danach über alle Punkte)
+
+
+class _Weg:
+    # ein Objekt auf dem Laserpfad
+    # art: "linie" (offen, Richtung wählbar), "kontur" (geschlossen, Startpunkt wählbar), "punkt" (fest)
+    __slots__ = ("entity", "art", "punkte", "index", "umgedreht")
+
+    def __init__(self, entity, art, punkte):
+        self.entity = entity
+        self.art = art
+        self.punkte = punkte
+        self.index = 0
+        self.umgedreht = False
+
+    def ein(self):
+        if self.art == "linie":
+            return self.punkte[-1] if self.umgedreht else self.punkte[0]
+        return self.punkte[self.index]
+
+    def aus(self):
+        if self.art == "linie":
+            return self.punkte[0] if self.umgedreht else self.punkte[-1]
+        if self.art == "punkt":
+            return self.punkte[-1]
+        return self.punkte[self.index]
+
+    def kandidaten(self):
+        # (einstieg, ausstieg, index, umgedreht)
+        if self.art == "linie":
+            yield self.punkte[0], self.punkte[-1], 0, False
+            yield self.punkte[-1], self.punkte[0], 0, True
+        elif self.art == "kontur":
+            schritt = max(1, len(self.punkte) // MAX_STARTPUNKTE)
+            for i in range(0, len(self.punkte), schritt):
+                yield self.punkte[i], self.punkte[i], i, False
+        else:
+            yield self.punkte[0], self.punkte[-1], 0, False
+
+
+def _dist(p, q):
+    return math.hypot(p[0] - q[0], p[1] - q[1])
+
+
+def _make_weg(entity):
+    typ = entity.dxftype()
+    if typ == "LINE":
+        s, e = entity.dxf.start, entity.dxf.end
+        return _Weg(entity, "linie", [(s.x, s.y), (e.x, e.y)])
+    if typ == "LWPOLYLINE":
+        punkte = [(float(x), float(y)) for x, y in entity.get_points("xy")]
+        if not punkte:
+            return None
+        if len(punkte) > 2 and punkte[0] == punkte[-1]:
+            punkte.pop()
+            return _Weg(entity, "kontur", punkte)
+        if entity.closed:
+            return _Weg(entity, "kontur", punkte)
+        return _Weg(entity, "linie", punkte)
+    if typ == "CIRCLE":
+        c, r = entity.dxf.center, entity.dxf.radius
+        return _Weg(entity, "punkt", [(c.x + r, c.y)])     # Anschnitt bei 0°
+    if typ == "ARC":
+        s, e = entity.start_point, entity.end_point
+        return _Weg(entity, "punkt", [(s.x, s.y), (e.x, e.y)])
+    if entity.dxf.hasattr("insert"):
+        # TEXT, INSERT, ... : Lage über den Einfügepunkt (bzw. Ausrichtepunkt)
+        p = entity.dxf.align_point if entity.dxf.hasattr("align_point") else entity.dxf.insert
+        return _Weg(entity, "punkt", [(p.x, p.y)])
+    return None
+
+
+def travel_length(wege, start=(0, 0)):
+    pos = start
+    summe = 0.0
+    for weg in wege:
+        summe += _dist(pos, weg.ein())
+        pos = weg.aus()
+    return summe
+
+
+def _nearest_neighbour(wege, start):
+    reihenfolge = []
+    offen = list(wege)
+    pos = start
+    while offen:
+        best = None
+        for n, weg in enumerate(offen):
+            for ein, aus, index, umgedreht in weg.kandidaten():
+                d = _dist(pos, ein)
+                if best is None or d < best[0]:
+                    best = (d, n, aus, index, umgedreht)
+        _, n, pos, index, umgedreht = best
+        weg = offen.pop(n)
+        weg.index, weg.umgedreht = index, umgedreht
+        reihenfolge.append(weg)
+    return reihenfolge
+
+
+def _two_opt(wege, start, fenster, max_durchlaeufe=20):
+    # Teilstück i..j umkehren, wenn die Leerfahrt dadurch kürzer wird
+    n = len(wege)
+    for _ in range(max_durchlaeufe):
+        besser = False
+        for i in range(n - 1):
+            vor = wege[i - 1].aus() if i else start
+            ein_i = wege[i].ein()
+            for j in range(i + 1, min(n, i + fenster)):
+                aus_j = wege[j].aus()
+                alt = _dist(vor, ein_i)
+                neu = _dist(vor, aus_j)
+                if j + 1 < n:
+                    nach = wege[j + 1].ein()
+                    alt += _dist(aus_j, nach)
+                    neu += _dist(ein_i, nach)
+                if neu < alt - 1e-9:
+                    wege[i:j + 1] = wege[i:j + 1][::-1]
+                    for weg in wege[i:j + 1]:
+                        if weg.art == "linie":
+                            weg.umgedreht = not weg.umgedreht
+                    ein_i = wege[i].ein()
+                    besser = True
+        if not besser:
+            break
+
+
+def _choose_start_points(wege, start):
+    # Einstieg jeder Kontur zwischen Vorgänger und Nachfolger über alle Punkte wählen
+    for k, weg in enumerate(wege):
+        if weg.art != "kontur":
+            continue
+        vor = wege[k - 1].aus() if k else start
+        nach = wege[k + 1].ein() if k + 1 < len(wege) else None
+        weg.index = min(range(len(weg.punkte)),
+                        key=lambda i: _dist(vor, weg.punkte[i]) + (_dist(weg.punkte[i], nach) if nach else 0))
+
+
+def _apply(weg):
+    entity = weg.entity
+    if weg.art == "linie" and weg.umgedreht:
+        if entity.dxftype() == "LINE":
+            entity.dxf.start, entity.dxf.end = entity.dxf.end, entity.dxf.start
+        else:
+            punkte = list(entity.get_points("xyseb"))[::-1]
+            # Wölbung gehört zum Segment ab dem Punkt -> beim Umkehren verschieben und negieren
+            bulges = [-p[4] for p in punkte[1:]] + [0]
+            entity.set_points([(x, y, s, e, b) for (x, y, s, e, _), b in zip(punkte, bulges)], format="xyseb")
+    elif weg.art == "kontur":
+        punkte = list(entity.get_points("xyseb"))
+        if len(punkte) > 2 and punkte[0][:2] == punkte[-1][:2]:
+            punkte.pop()
+        entity.set_points(punkte[weg.index:] + punkte[:weg.index], format="xyseb")
+        entity.closed = True
+
+
+def optimize_cut_order(msp, start=(0, 0), ist_aussen=None, fenster=50):
+    # Sortiert den Modelspace neu, Rückgabe: (Leerweg vorher, Leerweg nachher) in Zeichnungseinheiten
+    if ist_aussen is None:
+        ist_aussen = lambda entity: entity.dxf.layer == "Kontur"
+
+    wege = [weg for weg in map(_make_weg, msp) if weg is not None]
+    vorher = travel_length(wege, start)
+
+    innen = [weg for weg in wege if not ist_aussen(weg.entity)]
+    aussen = [weg for weg in wege if ist_aussen(weg.entity)]
+
+    reihenfolge = []
+    pos = start
+    for gruppe in (innen, aussen):
+        gruppe = _nearest_neighbour(gruppe, pos)
+        _two_opt(gruppe, pos, fenster)
+        _choose_start_points(gruppe, pos)
+        if gruppe:
+            pos = gruppe[-1].aus()
+        reihenfolge += gruppe
+    nachher = travel_length(reihenfolge, start)
+
+    for weg in reihenfolge:
+        _apply(weg)
+        msp.unlink_entity(weg.entity)
+        msp.add_entity(weg.entity)
+    return vorher, nachher
+
+
+def merge_collinear_lines(msp, layer, max_luecke=0.0):
+    # LINE-Objekte eines Layers: kollineare Stücke (Lücken bis max_luecke werden überbrückt) zusammenfassen
+    # und an Punkten, an denen genau zwei Stücke enden, zu Polylinien verketten. Rückgabe: Anzahl Polylinien
+    linien = [e for e in msp.query("LINE") if e.dxf.layer == layer]
+    if not linien:
+        return 0
+
+    geraden = {}
+    for linie in linien:
+        s, e = linie.dxf.start, linie.dxf.end
+        laenge = _dist((s.x, s.y), (e.x, e.y))
+        if laenge == 0:
+            continue
+        dx, dy = (e.x - s.x) / laenge, (e.y - s.y) / laenge
+        if dx < 0 or (dx == 0 and dy < 0):
+            dx, dy = -dx, -dy
+        dx, dy = round(dx, 6) + 0.0, round(dy, 6) + 0.0
+        abstand = round(dx * s.y - dy * s.x, GENAUIGKEIT) + 0.0
+        t1, t2 = sorted((s.x * dx + s.y * dy, e.x * dx + e.y * dy))
+        geraden.setdefault((dx, dy, abstand), []).append((t1, t2, s, dx, dy))
+
+    stuecke = []
+    for teile in geraden.values():
+        teile.sort(key=lambda t: t[0])
+        zusammen = []
+        for t1, t2, s, dx, dy in teile:
+            if zusammen and t1 <= zusammen[-1][1] + max_luecke + 10 ** -GENAUIGKEIT:
+                zusammen[-1][1] = max(zusammen[-1][1], t2)
+            else:
+                zusammen.append([t1, t2, s, dx, dy])
+        for t1, t2, s, dx, dy in zusammen:
+            # Punkte auf der Geraden durch s
+            t0 = s.x * dx + s.y * dy
+            a = (round(s.x + (t1 - t0) * dx, GENAUIGKEIT), round(s.y + (t1 - t0) * dy, GENAUIGKEIT))
+            b = (round(s.x + (t2 - t0) * dx, GENAUIGKEIT), round(s.y + (t2 - t0) * dy, GENAUIGKEIT))
+            stuecke.append((a, b))
+
+    for linie in linien:
+        msp.delete_entity(linie)
+    zuege = _chain(stuecke)
+    for punkte, geschlossen in zuege:
+        msp.add_lwpolyline(punkte, close=geschlossen, dxfattribs={"layer": layer})
+    return len(zuege)
+
+
+def _chain(stuecke):
+    # Stücke über Punkte mit genau zwei Enden zu Zügen verbinden
+    enden = {}
+    for n, (a, b) in enumerate(stuecke):
+        enden.setdefault(a, []).append(n)
+        enden.setdefault(b, []).append(n)
+
+    benutzt = [False] * len(stuecke)
+
+    def weiter(punkt, n):
+        # Stück n über punkt hinaus fortsetzen
+        zug = []
+        while len(enden[punkt]) == 2:
+            m = enden[punkt][0] if enden[punkt][1] == n else enden[punkt][1]
+            if benutzt[m]:
+                break
+            benutzt[m] = True
+            a, b = stuecke[m]
+            punkt = b if a == punkt else a
+            zug.append(punkt)
+            n = m
+        return zug
+
+    zuege = []
+    for n, (a, b) in enumerate(stuecke):
+        if benutzt[n]:
+            continue
+        benutzt[n] = True
+        vorne = weiter(b, n)
+        hinten = weiter(a, n)
+        punkte = hinten[::-1] + [a, b] + vorne
+        geschlossen = len(punkte) > 3 and punkte[0] == punkte[-1]
+        if geschlossen:
+            punkte.pop()
+        zuege.append((punkte, geschlossen))
+    return zuege
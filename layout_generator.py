@@ -0,0 +1,307 @@
+## Layout Generator für Scriptmaker
+## Sucht automatisch Buchstabenanordnungen, in denen alle Wörter der Uhr vorkommen
+## - gleiche Reihenregeln wie check_words, aus dem Sprachpaket (deutsch: Zahlenwörter ab Reihe 3, sonstige bis Reihe 4)
+## - Überlappungen werden genutzt (EIN in EINS, ZWEINS, SECHSIEBEN ...)
+## - Bitmasken pro Reihe für schnelle Kollisionsprüfung, Suche verteilt auf alle Kerne
+## - Ausgabe als Vorlagen (JSON), die "Vorlage laden" im Scriptmaker versteht
+##
+## Aufruf z.B.:  python layout_generator.py --reihen 10 --spalten 11 --anzahl 5 --ausgabe layouts/
+
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from raster_modell import Raster
+from sprachpaket import sprachpaket, available as sprachpakete, STANDARD as STANDARD_SPRACHE
+from wortsuche import WordIndex, missing_words
+
+FUELLBUCHSTABEN = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class Item:
+    # Ein zu platzierendes Wort (ggf. zusammengesetzt, z.B. DREIVIERTEL)
+    __slots__ = ("text", "indices", "rows", "shareable", "min_new", "letter_masks")
+
+    def __init__(self, text, indices, rows, shareable):
+        self.text = text
+        self.indices = indices        # Wortindizes im Sprachpaket, die dieses Item abdeckt
+        self.rows = rows              # erlaubte Reihen
+        self.shareable = shareable    # darf Zellen mit anderen Stundenwörtern teilen
+        self.min_new = len(text)      # untere Schranke neu belegter Zellen
+        # Bitmaske der Positionen je Buchstabe
+        self.letter_masks = {}
+        for k, ch in enumerate(text):
+            self.letter_masks[ch] = self.letter_masks.get(ch, 0) | (1 << k)
+
+
+def _overlap(a, b):
+    # längstes Suffix von a, das Präfix von b ist
+    for n in range(min(len(a), len(b)) - 1, 0, -1):
+        if a.endswith(b[:n]):
+            return n
+    return 0
+
+
+def build_items(paket, rows, ohne_zwanzig=False, ohne_dreiviertel=False):
+    # Wortliste des Sprachpakets in platzierbare Items umwandeln
+    words = paket.words
+    optionen = {"varzwanzig": ohne_zwanzig, "varviertel": ohne_dreiviertel}
+    is_hour = paket.is_hour
+    search_rows = [set(paket.allowed_rows(i, rows)) for i in range(len(words))]
+
+    # Verbunde als Spanne (DREI + VIERTEL) werden zusammenhängend gesetzt, wenn sie gebraucht werden
+    spannen = {}
+    for verbund in paket.verbunde:
+        if "spanne" in verbund and not optionen.get(verbund.get("option")):
+            indices = tuple(paket.ids[t] for t in verbund["spanne"])
+            spannen[indices[-1]] = indices
+
+    entries = []
+    teil_von_spanne = {i for indices in spannen.values() for i in indices[:-1]}
+    for i, w in enumerate(words):
+        if paket.optional(i, optionen) or i in teil_von_spanne:
+            continue      # entfällt oder wird mit dem letzten Wort der Spanne zusammen gesetzt
+        if i in spannen:
+            entries.append(("".join(words[j] for j in spannen[i]), spannen[i]))
+            continue
+        entries.append((w, (i,)))
+
+    # Wörter, die in einem Wort der gleichen Gruppe enthalten sind, werden mitgefunden (EIN in EINS)
+    covered = set()
+    for text_b, idx_b in entries:
+        for text_a, idx_a in entries:
+            if idx_a != idx_b and text_b in text_a and len(text_b) < len(text_a) \
+                    and all(is_hour(i) == is_hour(idx_a[0]) for i in idx_b):
+                covered.add(idx_b)
+
+    items = []
+    for text, indices in entries:
+        if indices in covered:
+            continue
+        allowed = set(range(rows))
+        for i in indices:
+            allowed &= search_rows[i]
+        # Reihen ausschließen, in denen ein anderes Wort (andere Gruppe) mitgefunden würde,
+        # z.B. FÜNF (Minuten) vs. FÜNF (Stunden) oder VIER in VIERTEL
+        for j, w in enumerate(words):
+            if j in indices or w not in text:
+                continue
+            if is_hour(j) != is_hour(indices[0]):
+                allowed -= search_rows[j]
+        shareable = all(paket.shareable(i) for i in indices)   # Stundenzahlen leuchten nie gleichzeitig
+        items.append(Item(text, indices, sorted(allowed), shareable))
+
+    # untere Schranke neuer Zellen für teilbare Wörter
+    for a in items:
+        if a.shareable:
+            best = 0
+            for b in items:
+                if b is not a and b.shareable:
+                    best = max(best, _overlap(a.text, b.text), _overlap(b.text, a.text))
+            a.min_new = len(a.text) - best
+
+    # Wörter mit wenig Platz und lange Wörter zuerst
+    items.sort(key=lambda it: (len(it.rows), -len(it.text)))
+    return items
+
+
+class Solver:
+    # Backtracking mit Bitmasken pro Reihe
+
+    def __init__(self, items, rows, cols, rng, max_nodes):
+        self.items = items
+        self.rows, self.cols = rows, cols
+        self.rng = rng
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self.filled = [0] * rows                       # belegte Zellen je Reihe
+        self.letter_rows = [{} for _ in range(rows)]   # Buchstabe -> Bitmaske je Reihe
+        self.owner_shareable = [0] * rows              # Zellen, die von teilbaren Wörtern belegt sind
+        self.placement = [None] * len(items)
+        # Reihengruppen für die Kapazitätsprüfung
+        self.row_groups = sorted({frozenset(it.rows) for it in items}, key=len)
+
+    def _fits(self, item, r, c):
+        span = ((1 << len(item.text)) - 1) << c
+        conflict = self.filled[r] & span
+        if not conflict:
+            return True
+        if not item.shareable or conflict & ~self.owner_shareable[r]:
+            return False
+        match = 0
+        letters = self.letter_rows[r]
+        for ch, mask in item.letter_masks.items():
+            match |= letters.get(ch, 0) & (mask << c)
+        return match == conflict
+
+    def _place(self, item, r, c):
+        span = ((1 << len(item.text)) - 1) << c
+        undo = (self.filled[r], self.owner_shareable[r], dict(self.letter_rows[r]))
+        self.filled[r] |= span
+        if item.shareable:
+            self.owner_shareable[r] |= span
+        letters = self.letter_rows[r]
+        for ch, mask in item.letter_masks.items():
+            letters[ch] = letters.get(ch, 0) | (mask << c)
+        return undo
+
+    def _capacity_ok(self, depth):
+        # Summe der mindestens benötigten Zellen darf den freien Platz nicht übersteigen
+        remaining = self.items[depth:]
+        for group in self.row_groups:
+            need = sum(it.min_new for it in remaining if group.issuperset(it.rows))
+            if need:
+                free = sum(self.cols - bin(self.filled[r]).count("1") for r in group)
+                if need > free:
+                    return False
+        return True
+
+    def solve(self, depth=0):
+        # Generator über alle Platzierungen [(reihe, spalte) je Item]
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            return
+        if depth == len(self.items):
+            yield list(self.placement)
+            return
+        if not self._capacity_ok(depth):
+            return
+
+        item = self.items[depth]
+        candidates = [(r, c) for r in item.rows for c in range(self.cols - len(item.text) + 1)]
+        self.rng.shuffle(candidates)
+        for r, c in candidates:
+            if not self._fits(item, r, c):
+                continue
+            undo = self._place(item, r, c)
+            self.placement[depth] = (r, c)
+            yield from self.solve(depth + 1)
+            self.filled[r], self.owner_shareable[r], self.letter_rows[r] = undo
+            self.placement[depth] = None
+            if self.nodes > self.max_nodes:
+                return
+
+
+def _cells_from_placement(items, placement, rows, cols):
+    cells = [["" for _ in range(cols)] for _ in range(rows)]
+    for item, (r, c) in zip(items, placement):
+        for k, ch in enumerate(item.text):
+            cells[r][c + k] = ch
+    return cells
+
+
+def fill_and_validate(cells, paket, ohne_zwanzig, ohne_dreiviertel, rng, tries=50):
+    # Freie Zellen füllen, ohne zusätzliche Wörter zu erzeugen; None wenn das nicht gelingt
+    words = paket.words
+    base = WordIndex(words, cells, paket)
+    for r, row in enumerate(cells):
+        free = [c for c, ch in enumerate(row) if ch == ""]
+        if not free:
+            continue
+        expected = base.row_hits[r]
+        for _ in range(tries):
+            for c in free:
+                row[c] = rng.choice(FUELLBUCHSTABEN)
+            index = WordIndex(words, [row], paket)
+            if index.row_hits[0] == expected:
+                break
+        else:
+            return None
+
+    index = WordIndex(words, cells, paket)
+    varzwanzig, varviertel = int(ohne_zwanzig), int(ohne_dreiviertel)
+    if missing_words(words, index.word_positions(), varzwanzig, varviertel, paket):
+        return None
+    # Jedes benötigte Wort genau einmal in seinen erlaubten Reihen
+    optionen = {"varzwanzig": varzwanzig, "varviertel": varviertel}
+    for i in range(len(words)):
+        optional = paket.optional(i, optionen)
+        if index.counts[i] > 1 or (index.counts[i] == 0 and not optional):
+            return None
+    return cells
+
+
+def search_layouts(rows, cols, ohne_zwanzig, ohne_dreiviertel, seed, max_solutions=1, max_nodes=200000,
+                   sprache=STANDARD_SPRACHE):
+    # Worker für den Prozesspool: Lösungen für einen Zufallsstartwert
+    rng = random.Random(seed)
+    paket = sprachpaket(sprache)
+    items = build_items(paket, rows, ohne_zwanzig, ohne_dreiviertel)
+    if any(not it.rows for it in items):
+        return []
+    solver = Solver(items, rows, cols, rng, max_nodes)
+    solutions = []
+    for placement in solver.solve():
+        cells = _cells_from_placement(items, placement, rows, cols)
+        cells = fill_and_validate(cells, paket, ohne_zwanzig, ohne_dreiviertel, rng)
+        if cells is None:
+            continue
+        key = tuple(zip((it.text for it in items), placement))
+        solutions.append((key, cells))
+        if len(solutions) >= max_solutions:
+            break
+    return solutions
+
+
+def generate_layouts(rows, cols, anzahl, ohne_zwanzig=False, ohne_dreiviertel=False,
+                     jobs=None, seed=0, max_tasks=1000, max_nodes=200000, sprache=STANDARD_SPRACHE):
+    # Verteilt die Suche mit verschiedenen Startwerten auf alle Kerne, bis anzahl verschiedene Lösungen da sind
+    jobs = jobs or os.cpu_count() or 1
+    found = {}
+    next_seed = seed
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = set()
+        while len(found) < anzahl and (pending or next_seed - seed < max_tasks):
+            while len(pending) < jobs * 2 and next_seed - seed < max_tasks:
+                pending.add(pool.submit(search_layouts, rows, cols, ohne_zwanzig, ohne_dreiviertel,
+                                        next_seed, 1, max_nodes, sprache))
+                next_seed += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for key, cells in future.result():
+                    found.setdefault(key, cells)
+        for future in pending:
+            future.cancel()
+    return list(found.values())[:anzahl]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Erzeugt Layout-Vorlagen mit allen Wörtern der Uhr")
+    parser.add_argument("--reihen", type=int, default=10)
+    parser.add_argument("--spalten", type=int, default=11)
+    parser.add_argument("--anzahl", type=int, default=1, help="Anzahl verschiedener Lösungen")
+    parser.add_argument("--ohne-zwanzig", action="store_true", help="Uhr hat KEINE Anzeige ZWANZIG")
+    parser.add_argument("--ohne-dreiviertel", action="store_true", help="Uhr hat KEINE Anzeige DREIVIERTEL")
+    parser.add_argument("--sprache", choices=sprachpakete(), default=STANDARD_SPRACHE,
+                        help="Sprachpaket aus sprachen/")
+    parser.add_argument("--ausgabe", default="layouts", metavar="VERZEICHNIS")
+    parser.add_argument("--jobs", type=int, default=None, help="Anzahl paralleler Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--seed", type=int, default=0, help="Startwert für die Zufallssuche")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    layouts = generate_layouts(args.reihen, args.spalten, args.anzahl, args.ohne_zwanzig,
+                               args.ohne_dreiviertel, args.jobs, args.seed, sprache=args.sprache)
+    os.makedirs(args.ausgabe, exist_ok=True)
+    for n, cells in enumerate(layouts, 1):
+        path = os.path.join(args.ausgabe, f"layout_{args.spalten}x{args.reihen}_{n:03d}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            sprache = args.sprache if args.sprache != STANDARD_SPRACHE else None
+            json.dump(Raster.from_cells(cells).to_template(int(args.ohne_zwanzig), int(args.ohne_dreiviertel),
+                                                           sprache=sprache), f)
+        print(path)
+        for row in cells:
+            print("   " + " ".join(row))
+
+    print(f"{len(layouts)} von {args.anzahl} Layouts in {time.perf_counter() - start:.2f} s")
+    return 0 if len(layouts) == args.anzahl else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+## Rastermodell für Scriptmaker
+## Buchstaben und Markierungen eines Layouts ohne Tk
+## - Buchstaben kompakt in einem array (Unicode Codepoint, 0 = leeres Feld)
+## - Markierung als Bitmaske pro Reihe (Bit c = Spalte c, wie beim Icon-Export)
+
+# -*- coding: utf-8 -*-
+
+from array import array
+
+from wortsuche import find_word_positions
+
+
+class Raster:
+    __slots__ = ("rows", "cols", "_letters", "_selected")
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self._letters = array("I", bytes(4 * rows * cols))   # alle Felder leer
+        self._selected = [0] * rows
+
+    # ---------- Zugriff ----------
+    def get(self, r, c):
+        code = self._letters[r * self.cols + c]
+        return chr(code) if code else ""
+
+    def set(self, r, c, letter):
+        # leerer String = Feld löschen, sonst genau ein Zeichen
+        self._letters[r * self.cols + c] = ord(letter) if letter else 0
+
+    def is_selected(self, r, c):
+        return bool(self._selected[r] >> c & 1)
+
+    def set_selected(self, r, c, value):
+        if value:
+            self._selected[r] |= 1 << c
+        else:
+            self._selected[r] &= ~(1 << c)
+
+    def toggle(self, r, c):
+        self._selected[r] ^= 1 << c
+
+    def row(self, r):
+        start = r * self.cols
+        return [chr(code) if code else "" for code in self._letters[start:start + self.cols]]
+
+    # Reihenzugriff raster[r], damit Wortsuche und DXF-Export auch direkt mit dem Modell arbeiten
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, r):
+        if not 0 <= r < self.rows:
+            raise IndexError(r)
+        return self.row(r)
+
+    def row_mask(self, r):
+        return self._selected[r]
+
+    def row_bits(self, r):
+        # Binärstring wie im Icon-Export: höchste Spalte zuerst
+        return format(self._selected[r], f"0{self.cols}b")
+
+    def has_empty(self):
+        return 0 in self._letters
+
+    def clear(self):
+        self._letters = array("I", bytes(4 * self.rows * self.cols))
+        self._selected = [0] * self.rows
+
+    def resize(self, rows, cols):
+        # neue Größe, Inhalt bleibt oben links stehen; weggefallene Reihen/Spalten gehen verloren
+        letters = array("I", bytes(4 * rows * cols))
+        n = min(cols, self.cols)
+        for r in range(min(rows, self.rows)):
+            letters[r * cols:r * cols + n] = self._letters[r * self.cols:r * self.cols + n]
+        maske = (1 << cols) - 1
+        self._selected = [m & maske for m in self._selected[:rows]] + [0] * max(0, rows - self.rows)
+        self._letters = letters
+        self.rows, self.cols = rows, cols
+
+    # ---------- Wortsuche ----------
+    def find_words(self, words, paket=None):
+        return find_word_positions(self, words, paket)
+
+    # ---------- Serialisierung ----------
+    @property
+    def cells(self):
+        return [self.row(r) for r in range(self.rows)]
+
+    @property
+    def selected(self):
+        return [[bool(self._selected[r] >> c & 1) for c in range(self.cols)] for r in range(self.rows)]
+
+    @classmethod
+    def from_cells(cls, cells, selected=None):
+        rows = len(cells)
+        cols = len(cells[0]) if rows else 0
+        raster = cls(rows, cols)
+        for r in range(rows):
+            for c in range(cols):
+                raster.set(r, c, cells[r][c][:1] if c < len(cells[r]) else "")
+                if selected and r < len(selected) and c < len(selected[r]) and selected[r][c]:
+                    raster._selected[r] |= 1 << c
+        return raster
+
+    @classmethod
+    def from_template(cls, data):
+        # Format von save_template oder reines 2D-Array (z.B. TEMP/bundes.json)
+        if isinstance(data, list):
+            data = {"cells": data}
+        if not isinstance(data, dict) or not data.get("cells"):
+            raise ValueError("Unbekanntes Vorlagenformat (weder Vorlage noch 2D-Array)")
+        return cls.from_cells(data["cells"], data.get("selected"))
+
+    def to_template(self, varzwanzig=0, varviertel=0, minanzeige=0, sprache=None):
+        # gleiches Format wie GridApp.save_template, sprache = Name des Sprachpakets (fehlt = deutsch)
+        data = {
+            "cells": self.cells,
+            "selected": self.selected,
+            "varzwanzig": varzwanzig,
+            "varviertel": varviertel,
+            "minanzeige": minanzeige,
+        }
+        if sprache:
+            data["sprache"] = sprache
+        return data
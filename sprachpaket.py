@@ -0,0 +1,191 @@
+## Sprachpakete für Scriptmaker
+## Wortliste, Reihenregeln und Firmware-Symbole einer Sprache stehen in sprachen/<name>.json:
+##   woerter   -> Wort, erlaubte Reihen [von, bis] (bis null = bis zur letzten Reihe), Gruppe (zahl/stunde/minute),
+##                Firmware-Symbol (null = keine eigene Ausgabe, Liste = mehrere case-Marken), Regeln je Reihe,
+##                Option (Wort entfällt, wenn die Checkbox gesetzt ist), id (für Verbunde)
+##   verbunde  -> Ausgaben aus mehreren Wörtern: teile (je Wort eine Zeile) oder spanne (eine Zeile über alle Wörter)
+##   optionen  -> Checkbox-Texte (varzwanzig, varviertel)
+##   firmware  -> Klassen-/Instanzname und Felder für FrontWord::funk
+##   zeiten    -> Satz je Fünfminutenschritt (Symbole, "{stunde}" = Stundenwort, stunde 1 = nächste Stunde),
+##                Stundensymbole 12, 1 .. 11 und Varianten für gesetzte Checkboxen (für die Tagessimulation)
+## Der Suchautomat (WordMatcher) eines Pakets wird einmal gebaut und in sprachen/__pycache__ zwischengespeichert,
+## neue Sprache = neue JSON-Datei, ohne Änderung am Code.
+
+# -*- coding: utf-8 -*-
+
+import glob
+import json
+import os
+from functools import lru_cache
+
+SPRACHEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sprachen")
+STANDARD = "de"
+CACHE_VERSION = b"1"        # erhöhen, wenn sich WordMatcher ändert
+
+
+class Sprachpaket:
+
+    def __init__(self, name, daten, quelle=b""):
+        self.name = name                                   # Dateiname ohne .json, z.B. "de"
+        self.titel = daten.get("name", name)
+        self.kuerzel = daten.get("kuerzel", name.upper())
+        self.optionen = dict(daten.get("optionen", {}))
+        self.verbunde = list(daten.get("verbunde", []))
+        self.firmware = dict(daten.get("firmware", {}))
+        self.standard_reihen = tuple(daten.get("standard_reihen", (0, 4)))
+        self.zeiten = dict(daten.get("zeiten", {}))
+        self._quelle = quelle                              # Dateiinhalt, Schlüssel für den Matcher-Cache
+        self._matcher = None
+
+        eintraege = daten["woerter"]
+        self.words = [e["wort"].upper() for e in eintraege]
+        self.reihen = [tuple(e.get("reihen", self.standard_reihen)) for e in eintraege]
+        self.gruppen = [e.get("gruppe", "minute") for e in eintraege]
+        self.option = [e.get("option") for e in eintraege]
+        self.symbole = [e.get("symbol", e["wort"]) for e in eintraege]
+        self.regeln = [[(tuple(r["reihen"]), r) for r in e.get("regeln", ())] for e in eintraege]
+        self.ids = {e["id"]: i for i, e in enumerate(eintraege) if "id" in e}
+
+        for opt in filter(None, self.option):
+            if opt not in self.optionen:
+                raise ValueError(f"Sprachpaket {name}: Option {opt} ist nicht unter 'optionen' definiert")
+        for verbund in self.verbunde:
+            for teil in verbund.get("teile", ()) or verbund.get("spanne", ()):
+                if teil not in self.ids:
+                    raise ValueError(f"Sprachpaket {name}: Verbund {verbund.get('symbol')} - unbekannte id {teil}")
+        if self.zeiten and (len(self.zeiten.get("minuten", ())) != 12 or len(self.zeiten.get("stunden", ())) != 12):
+            raise ValueError(f"Sprachpaket {name}: 'zeiten' braucht 12 Minuten- und 12 Stundeneinträge")
+
+    def __repr__(self):
+        return f"Sprachpaket({self.name!r}, {len(self.words)} Wörter)"
+
+    # ---------- Regeln ----------
+
+    def allowed_rows(self, word_index, rows):
+        # Bereichsregel; Wörter außerhalb des Pakets (z.B. erweiterte Wortlisten) mit den Standardreihen
+        von, bis = self.reihen[word_index] if word_index < len(self.reihen) else self.standard_reihen
+        return range(von, rows if bis is None else bis + 1)
+
+    def optional(self, word_index, optionen):
+        # True, wenn das Wort wegen einer gesetzten Checkbox nicht vorkommen muss
+        opt = self.option[word_index] if word_index < len(self.option) else None
+        return bool(opt and optionen.get(opt))
+
+    def is_hour(self, word_index):
+        return word_index < len(self.gruppen) and self.gruppen[word_index] != "minute"
+
+    def shareable(self, word_index):
+        # Stundenzahlen leuchten nie gleichzeitig und dürfen sich Buchstaben teilen
+        return word_index < len(self.gruppen) and self.gruppen[word_index] == "zahl"
+
+    def symbols(self, word_index, wort, reihe):
+        # Firmware-Symbole (Tupel, leer = keine eigene Ausgabe) für ein gefundenes Wort in Reihe reihe
+        if word_index >= len(self.symbole):
+            return (wort,)
+        symbol = self.symbole[word_index]
+        for (von, bis), regel in self.regeln[word_index]:
+            if von <= reihe and (bis is None or reihe <= bis):
+                symbol = regel.get("symbol", symbol)
+                break
+        if symbol is None:
+            return ()
+        return tuple(symbol) if isinstance(symbol, list) else (symbol,)
+
+    def cases(self, words, word_positions, optionen):
+        # Firmware-Fälle [(symbole, [(reihe, start, ende), ...]), ...] in Ausgabereihenfolge
+        # word_positions wie WordIndex.word_positions(), optionen z.B. {"varzwanzig": 0, "varviertel": 1}
+        faelle = []
+        letzte = {}       # letzte Position je id (für Verbunde)
+        for word_index, _, reihe, start, ende, gefunden in word_positions:
+            if not gefunden:
+                continue
+            wort = words[word_index]
+            if word_index < len(self.words):
+                letzte[word_index] = (reihe, start, ende)
+            symbole = self.symbols(word_index, wort, reihe)
+            if symbole and not self.optional(word_index, optionen):
+                faelle.append((symbole, [(reihe, start, ende)]))
+
+        for verbund in self.verbunde:
+            if verbund.get("option") and optionen.get(verbund["option"]):
+                continue
+            teile = [letzte.get(self.ids[t]) for t in verbund.get("teile", ()) or verbund["spanne"]]
+            if None in teile:
+                continue          # Wort fehlt im Raster, die Warnung kommt von missing_words
+            if "spanne" in verbund:
+                # Reihe und Ende vom ersten, Start vom letzten Wort (Spalten von rechts gezählt)
+                teile = [(teile[0][0], teile[-1][1], teile[0][2])]
+            faelle.append(((verbund["symbol"],), teile))
+        return faelle
+
+    def phrase(self, stunde, minute, optionen):
+        # Firmware-Symbole für eine Uhrzeit (Minute auf 5 abgerundet), z.B. 8:40 -> ("es_ist", "min_20", "vor", "hour_9")
+        if not self.zeiten:
+            raise ValueError(f"Sprachpaket {self.name}: keine Zeitregeln ('zeiten')")
+        eintrag = self.zeiten["minuten"][minute // 5 % 12]
+        for variante in eintrag.get("varianten", ()):
+            if optionen.get(variante["option"]):
+                eintrag = variante
+                break
+        h = (stunde + eintrag.get("stunde", 0)) % 12
+        stunde_symbol = eintrag.get("stunden", {}).get(str(h), self.zeiten["stunden"][h])
+        woerter = list(eintrag["woerter"])
+        if "{stunde}" not in woerter:
+            woerter.append("{stunde}")
+        return tuple(self.zeiten.get("praefix", ())) + tuple(stunde_symbol if w == "{stunde}" else w for w in woerter)
+
+    # ---------- Suchautomat ----------
+
+    def matcher(self):
+        if self._matcher is None:
+            self._matcher = _compiled_matcher(self.name, self.words, self._quelle)
+        return self._matcher
+
+
+def _compiled_matcher(name, words, quelle):
+    # WordMatcher aus dem Cache laden oder bauen und speichern (Schlüssel: Inhalt der Paketdatei)
+    import hashlib
+    import pickle
+    from wortsuche import WordMatcher
+
+    schluessel = hashlib.sha1(CACHE_VERSION + quelle).hexdigest()[:16]
+    cache_dir = os.path.join(SPRACHEN_DIR, "__pycache__")
+    pfad = os.path.join(cache_dir, f"{name}.{schluessel}.pickle")
+    try:
+        with open(pfad, "rb") as f:
+            matcher = pickle.load(f)
+        if matcher.words == words:
+            return matcher
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+
+    matcher = WordMatcher(words)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for alt in glob.glob(os.path.join(cache_dir, f"{name}.*.pickle")):
+            os.remove(alt)
+        tmp = f"{pfad}.{os.getpid()}.tmp"     # Batch-Worker schreiben evtl. gleichzeitig
+        with open(tmp, "wb") as f:
+            pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, pfad)
+    except OSError:
+        pass          # schreibgeschütztes Verzeichnis: ohne Cache weiter
+    return matcher
+
+
+def available():
+    # Namen der vorhandenen Sprachpakete, z.B. ["ch", "de", "en", "nl"]
+    return sorted(os.path.splitext(os.path.basename(p))[0]
+                  for p in glob.glob(os.path.join(SPRACHEN_DIR, "*.json")))
+
+
+@lru_cache(maxsize=None)
+def sprachpaket(name=STANDARD):
+    # Paket laden (einmal pro Prozess), name = Dateiname ohne .json
+    pfad = os.path.join(SPRACHEN_DIR, name + ".json")
+    try:
+        with open(pfad, "rb") as f:
+            quelle = f.read()
+    except FileNotFoundError:
+        raise ValueError(f"Sprachpaket '{name}' nicht gefunden (vorhanden: {', '.join(available())})") from None
+    return Sprachpaket(name, json.loads(quelle.decode("utf-8")), quelle)
@@ -0,0 +1,60 @@
+## Startzeit-Messung für Scriptmaker und Trennsteg Generator
+## --startup-profile startet das Programm erneut mit "python -X importtime", baut das Fenster einmal auf,
+## beendet es sofort und gibt die Zeit bis zum fertigen Fenster sowie die Importzeiten der Module aus.
+
+import os
+import sys
+import time
+
+EXIT_FLAG = "--startup-exit"        # intern: Fenster aufbauen, einmal zeichnen, beenden
+T0_VAR = "STARTPROFIL_T0"           # Startzeitpunkt des Messprozesses (time.time())
+
+
+def window_ready(root):
+    # im Messprozess: Fenster zeichnen, Zeit seit Prozessstart ausgeben, beenden
+    root.update()
+    t0 = float(os.environ.get(T0_VAR, "0") or 0)
+    if t0:
+        print(f"Fenster bereit nach {(time.time() - t0) * 1000:.0f} ms", flush=True)
+    root.destroy()
+    return 0
+
+
+def parse_importtime(text):
+    # Zeilen "import time: self [us] | cumulative | imported package" -> [(name, selbst_us, kumuliert_us, tiefe)]
+    eintraege = []
+    for zeile in text.splitlines():
+        if not zeile.startswith("import time:"):
+            continue
+        teile = zeile[len("import time:"):].split("|")
+        if len(teile) != 3 or not teile[0].strip().isdigit():
+            continue      # Kopfzeile
+        name = teile[2].rstrip()
+        tiefe = (len(name) - len(name.lstrip()) - 1) // 2
+        eintraege.append((name.strip(), int(teile[0]), int(teile[1]), tiefe))
+    return eintraege
+
+
+def run_profile(script, top=15):
+    import subprocess
+
+    env = dict(os.environ, **{T0_VAR: repr(time.time())})
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(script), EXIT_FLAG],
+                          capture_output=True, text=True, env=env)
+    gesamt = (time.perf_counter() - start) * 1000
+
+    eintraege = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        fehler = [z for z in proc.stderr.splitlines() if not z.startswith("import time:")]
+        print("\n".join(fehler), file=sys.stderr)
+        return proc.returncode
+
+    oberste = sorted((e for e in eintraege if e[3] == 0), key=lambda e: e[2], reverse=True)
+    print(proc.stdout.strip())
+    print(f"Prozess gesamt: {gesamt:.0f} ms, davon Importe: {sum(e[2] for e in oberste) / 1000:.0f} ms "
+          f"({len(eintraege)} Module)")
+    print("Größte Importe (kumuliert, oberste Ebene):")
+    for name, _, kumuliert, _ in oberste[:top]:
+        print(f"  {kumuliert / 1000:8.1f} ms  {name}")
+    return 0
@@ -0,0 +1,20 @@
+# Module liegen flach im Projektverzeichnis (kein Paket): für die Tests importierbar machen
+import os
+import sys
+
+import pytest
+
+PROJEKT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJEKT)
+
+
+@pytest.fixture(scope="session")
+def bundes():
+    # mitgelieferte deutsche Vorlage TEMP/bundes.json: (vorlage, sprachpaket, word_positions)
+    from ScriptmakerV2 import load_template_file
+    from sprachpaket import sprachpaket
+
+    vorlage = load_template_file(os.path.join(PROJEKT, "TEMP", "bundes.json"))
+    paket = sprachpaket("de")
+    word_positions, _ = vorlage["raster"].find_words(paket.words, paket)
+    return vorlage, paket, word_positions
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from bildtabelle import FORMATE, TAKTE, build_frame_table_text, encode_frames, zeitbilder
+from zeitsimulation import simulate_day
+
+
+def _frame_entry(stunde, minute, takt):
+    # frameEntry() aus dem Header
+    return (stunde % 12) * (60 // takt) + minute // takt
+
+
+def _c_frame_decode(tabelle, eintrag, zeilen, spalten, format, schluessel):
+    # Nachbau von frameDecode() aus DECODER_DICT / DECODER_DELTA, Bit für Bit wie auf der Uhr
+    data, index_offsets = tabelle[0], tabelle[1]
+    rows = [0] * zeilen
+    if format == "dict":
+        bit = index_offsets[eintrag] * zeilen * spalten
+        for r in range(zeilen):
+            value = 0
+            for _ in range(spalten):
+                value = value << 1 | ((data[bit >> 3] >> (7 - (bit & 7))) & 1)
+                bit += 1
+            rows[r] = value
+        return rows
+    for e in range(eintrag - eintrag % schluessel, eintrag + 1):
+        bit, value = 0, 0
+        for pos in range(index_offsets[e], index_offsets[e + 1]):
+            for _ in range(data[pos]):
+                if value:
+                    rows[bit // spalten] ^= 1 << (spalten - 1 - bit % spalten)
+                bit += 1
+            value ^= 1
+    return rows
+
+
+def _bits(rows, spalten):
+    return "".join(f"{r:0{spalten}b}" for r in rows)
+
+
+@pytest.fixture(scope="module")
+def bericht(bundes):
+    vorlage, paket, word_positions = bundes
+    raster = vorlage["raster"]
+    optionen = {"varzwanzig": vorlage["varzwanzig"], "varviertel": vorlage["varviertel"]}
+    return simulate_day(paket.words, word_positions, raster.rows, raster.cols, optionen, vorlage["minanzeige"],
+                        paket)
+
+
+@pytest.mark.parametrize("format", FORMATE)
+@pytest.mark.parametrize("takt", TAKTE)
+def test_bundes_vorlage(bericht, format, takt):
+    bilder = zeitbilder(bericht, takt)
+    zeilen, spalten = len(bilder[0]), bericht.leds.shape[2]
+    schluessel = 60 // takt
+    tabelle = encode_frames(bilder, zeilen, spalten, format, schluessel)
+    for stunde in range(12):
+        for minute in range(0, 60, takt):
+            eintrag = _frame_entry(stunde, minute, takt)
+            assert _c_frame_decode(tabelle, eintrag, zeilen, spalten, format, schluessel) == list(bilder[eintrag])
+
+    # je Minute: Leuchtbild des Fünfminutensatzes plus Minutenpunkte in der letzten Zeile
+    leds, punkte = bericht.frames()
+    if takt == 1:
+        assert zeilen == 11
+        for minute in (0, 4, 8 * 60 + 43):
+            rows = _c_frame_decode(tabelle, _frame_entry(minute // 60, minute % 60, 1), zeilen, spalten, format,
+                                   schluessel)
+            assert [int(b) for b in _bits(rows[:-1], spalten)] == leds[minute].ravel().tolist()
+            assert bin(rows[-1]).count("1") == punkte[minute]
+    letters = [[""] * spalten for _ in range(bericht.leds.shape[1])]
+    assert "frameDecode" in build_frame_table_text(bericht, letters, takt, format)
+
+
+@pytest.mark.parametrize("format", FORMATE)
+def test_zufallsbilder(format):
+    rng = random.Random(1)
+    zeilen, spalten, schluessel = 10, 11, 12
+    bilder = []
+    for _ in range(60):
+        if bilder and rng.random() < 0.5:
+            rows = list(bilder[-1])
+        else:
+            rows = [rng.getrandbits(spalten) for _ in range(zeilen)]
+        rows[rng.randrange(zeilen)] ^= 1 << rng.randrange(spalten)
+        bilder.append(tuple(rows))
+    tabelle = encode_frames(bilder, zeilen, spalten, format, schluessel)
+    if format == "dict":
+        assert tabelle[2] == len(set(bilder))
+    for eintrag, rows in enumerate(bilder):
+        assert _c_frame_decode(tabelle, eintrag, zeilen, spalten, format, schluessel) == list(rows)
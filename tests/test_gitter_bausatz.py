@@ -0,0 +1,57 @@
+import pytest
+
+from gitter_bausatz import check_kit, kit_strips
+from trennsteg_geometrie import (ANZAHL_SCHLITZE, SCHLITZABSTAND, STEGLAENGE, VERSCHIEBUNG, RAHMEN_MM,
+                                 erstes_schlitz_links, strip_geometry)
+
+
+def _generator_mitten(position):
+    # Schlitzmitten eines Stegs aus dem Trennsteg Generator (ANZAHL_SCHLITZE, Steg links bei 0)
+    erstes = erstes_schlitz_links(STEGLAENGE, position, ANZAHL_SCHLITZE, SCHLITZABSTAND, VERSCHIEBUNG)
+    schlitze = strip_geometry(STEGLAENGE, 89.6, 0.3, erstes, ANZAHL_SCHLITZE, SCHLITZABSTAND)[1]
+    return (schlitze[:, 0, 0] + schlitze[:, 1, 0]) / 2
+
+
+def _satz(saetze, name):
+    return next(satz for satz in saetze if satz.name == name)
+
+
+def test_11x10_wie_trennsteg_generator():
+    _, _, saetze = kit_strips(10, 11)
+    reihen, spalten = _satz(saetze, "reihen"), _satz(saetze, "spalten")
+    versatz = (RAHMEN_MM - STEGLAENGE) / 2
+
+    # Stege zwischen den Reihen: 12 Schlitze = Generator "Senkrecht"
+    assert reihen.stueck == 11
+    assert reihen.schlitz_mitten() - versatz == pytest.approx(_generator_mitten("Senkrecht"), abs=1e-3)
+    # Stege zwischen den Spalten: 11 Schlitze = die ersten 11 von Generator "Waagerecht" (der 12. liegt dort
+    # außerhalb des Rasters)
+    assert spalten.stueck == 12
+    assert spalten.schlitz_mitten() - versatz == pytest.approx(_generator_mitten("Waagerecht")[:11], abs=1e-3)
+
+
+@pytest.mark.parametrize("rows, cols, rahmen", [(10, 11, 250), (5, 6, 150), (13, 4, 250), (1, 1, 100)])
+def test_check_kit_ok(rows, cols, rahmen):
+    x_mitten, y_mitten, saetze = kit_strips(rows, cols, rahmen_mm=rahmen, laenge=rahmen - 10.5)
+    assert check_kit(x_mitten, y_mitten, saetze, rahmen, 11.55) == []
+
+
+@pytest.mark.parametrize("name", ["reihen", "spalten"])
+def test_check_kit_versetzte_schlitze(name):
+    x_mitten, y_mitten, saetze = kit_strips(10, 11)
+    satz = _satz(saetze, name)
+    satz.erstes += 0.01
+    satz.geometrie = strip_geometry(satz.laenge, satz.hoehe, satz.schlitzbreite, satz.erstes, len(satz.soll),
+                                    satz.abstand)
+    fehler = check_kit(x_mitten, y_mitten, saetze, RAHMEN_MM)
+    assert any(f.startswith(f"Stege ({name}): Schlitze weichen") for f in fehler)
+    assert any(f.startswith(f"Frontplatte/Stege ({name})") for f in fehler)
+    assert not any(f"({'spalten' if name == 'reihen' else 'reihen'})" in f for f in fehler)
+
+
+@pytest.mark.parametrize("rows, cols, name", [(4, 13, "reihen"), (13, 4, "spalten")])
+def test_check_kit_steg_zu_kurz(rows, cols, name):
+    # 13 Felder = 216.7 mm Raster, Steg 200 mm: nur die Richtung mit 14 Schlitzen passt nicht
+    x_mitten, y_mitten, saetze = kit_strips(rows, cols, laenge=200)
+    fehler = check_kit(x_mitten, y_mitten, saetze, RAHMEN_MM)
+    assert len(fehler) == 1 and fehler[0].startswith(f"Stege ({name}): die äußeren Schlitze")
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from icon_bibliothek import (BIBLIOTHEK, FORMATE, IconBibliothek, build_icon_library_text, decode, encode,
+                             rle_decode, rle_encode)
+
+
+def _c_icon_decode(data, offsets, bild, zeilen, spalten, format):
+    # Nachbau von iconDecode() aus dem Header (DECODER_BITS / DECODER_RLE), Bit für Bit wie auf der Uhr
+    rows = [0] * zeilen
+    if format == "bits":
+        bit = bild * zeilen * spalten
+        for r in range(zeilen):
+            value = 0
+            for _ in range(spalten):
+                value = value << 1 | ((data[bit >> 3] >> (7 - (bit & 7))) & 1)
+                bit += 1
+            rows[r] = value
+        return rows
+    for f in range(0 if format == "delta" else bild, bild + 1):
+        bit, value = 0, 0
+        for pos in range(offsets[f], offsets[f + 1]):
+            for _ in range(data[pos]):
+                if value:
+                    rows[bit // spalten] ^= 1 << (spalten - 1 - bit % spalten)
+                bit += 1
+            value ^= 1
+    return rows
+
+
+def _bilder(rng, anzahl, zeilen, spalten):
+    # Zufallsbilder, dazu leere und volle (lange Läufe über MAX_LAUF) und ein kleiner Unterschied zum Vorgänger
+    voll = (1 << spalten) - 1
+    bilder = [tuple([0] * zeilen), tuple([voll] * zeilen)]
+    while len(bilder) < anzahl:
+        rows = list(bilder[-1]) if rng.random() < 0.3 else [rng.getrandbits(spalten) for _ in range(zeilen)]
+        rows[rng.randrange(zeilen)] ^= 1 << rng.randrange(spalten)
+        bilder.append(tuple(rows))
+    return bilder
+
+
+@pytest.mark.parametrize("format", FORMATE)
+@pytest.mark.parametrize("zeilen, spalten", [(10, 11), (16, 32), (1, 1)])
+def test_encode_decode(format, zeilen, spalten):
+    bilder = _bilder(random.Random(zeilen * spalten), 12, zeilen, spalten)
+    data, offsets = encode(bilder, zeilen, spalten, format)
+    assert (offsets is None) == (format == "bits")
+    for bild, rows in enumerate(bilder):
+        assert decode(data, offsets, bild, zeilen, spalten, format) == list(rows)
+        assert _c_icon_decode(data, offsets, bild, zeilen, spalten, format) == list(rows)
+
+
+def test_rle_lange_laeufe():
+    bits = [0] * 600 + [1] * 300 + [0]
+    data = rle_encode(bits)
+    assert max(data) == 255
+    assert rle_decode(data, len(bits)) == bits
+
+
+@pytest.mark.parametrize("format", FORMATE)
+def test_mitgelieferte_bibliothek(format):
+    bibliothek = IconBibliothek.load(BIBLIOTHEK)
+    auswahl = [1 << r for r in range(bibliothek.zeilen)]
+    bilder, platz_bild = bibliothek.frames(auswahl)
+    data, offsets = encode(bilder, bibliothek.zeilen, bibliothek.spalten, format)
+    for bild in set(platz_bild):
+        assert _c_icon_decode(data, offsets, bild, bibliothek.zeilen, bibliothek.spalten, format) == list(bilder[bild])
+    assert "iconDecode" in build_icon_library_text(bibliothek, auswahl, format)
+
+
+def test_uint16_offsets_ueberlauf():
+    rng = random.Random(5)
+    bibliothek = IconBibliothek(32, 32)
+    for i in range(256):
+        bibliothek.add(f"bild{i}", [rng.getrandbits(32) for _ in range(32)])
+    bibliothek.plaetze = list(bibliothek.icons)
+    with pytest.raises(ValueError, match="uint16_t"):
+        build_icon_library_text(bibliothek, format="rle")
+    assert "iconData" in build_icon_library_text(bibliothek, format="bits")
+
+
+def test_256_plaetze_schleife_endet():
+    # letztes Bild 255: die Schleife in iconDecode braucht einen breiteren Zähler als uint8_t
+    rng = random.Random(2)
+    bibliothek = IconBibliothek(10, 11)
+    for i in range(256):
+        bibliothek.add(f"bild{i}", [rng.getrandbits(11) for _ in range(10)])
+    bibliothek.plaetze = list(bibliothek.icons)
+    text = build_icon_library_text(bibliothek, format="delta")
+    assert "for (uint16_t f = 0; f <= frame; f++)" in text
+
+
+@pytest.mark.parametrize("erster, zweiter, c_name", [("a-b", "a_b", "ICON_A_B"), ("tür", "tor", None),
+                                                     ("für", "f_r", "ICON_F_R")])
+def test_gleiche_c_namen(erster, zweiter, c_name):
+    bibliothek = IconBibliothek(1, 4, {erster: [1], zweiter: [2]}, [erster, zweiter])
+    if c_name is None:
+        assert "ICON_TOR = 1," in build_icon_library_text(bibliothek)
+        return
+    with pytest.raises(ValueError, match=c_name):
+        build_icon_library_text(bibliothek)
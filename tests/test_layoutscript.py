@@ -0,0 +1,18 @@
+import pytest
+
+from ScriptmakerV2 import build_script_text, build_table_script_text, firmware_cases
+from sprachpaket import sprachpaket
+
+
+@pytest.mark.parametrize("sprache, funk", [("de", True), ("en", False)])
+def test_funk_nur_mit_firmware_funk(bundes, sprache, funk):
+    vorlage, _, _ = bundes
+    raster = vorlage["raster"]
+    paket = sprachpaket(sprache)
+    word_positions, _ = raster.find_words(paket.words, paket)
+    text = build_script_text(raster, paket.words, word_positions, 0, 0, paket)
+    assert ("case FrontWord::funk:" in text) == funk
+    assert text.count("default:") == 1
+    faelle = firmware_cases(paket.words, word_positions, 0, 0, paket)
+    assert (("funk",) in [symbole for symbole, _ in faelle]) == funk
+    assert "show(FrontWord word)" in build_table_script_text(raster, paket.words, word_positions, 0, 0, paket)
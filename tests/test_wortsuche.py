@@ -0,0 +1,58 @@
+import random
+
+from sprachpaket import sprachpaket
+from wortsuche import WordIndex, WordMatcher, scan_row
+
+
+def _naiv(row_cells, words):
+    # jede Startspalte gegen jedes Wort vergleichen; leere Felder gehören zu keinem Wort
+    treffer = []
+    for i, word in enumerate(words):
+        word = word.upper()
+        for c in range(len(row_cells) - len(word) + 1):
+            feld = row_cells[c:c + len(word)]
+            if all(len(z) == 1 for z in feld) and "".join(feld).upper() == word:
+                treffer.append((i, c))
+    return sorted(treffer)
+
+
+def test_ueberlappende_woerter_wie_naive_suche():
+    # Präfixe, Suffixe und doppelte Wörter: genau die Fälle, die über die Fehlerlinks laufen
+    words = ["EIN", "EINS", "NS", "S", "SIEBEN", "BEN", "ELF", "EIN", "ZEHN", "HNE"]
+    matcher = WordMatcher(words)
+    rng = random.Random(7)
+    for _ in range(300):
+        row = [rng.choice("EINSBLFZH") if rng.random() > 0.05 else "" for _ in range(rng.randint(1, 14))]
+        assert sorted(matcher.find_all(row)) == _naiv(row, words), row
+
+
+def test_kleinbuchstaben_und_leere_felder():
+    matcher = WordMatcher(["elf", "FÜNF"])
+    assert sorted(matcher.find_all(list("xElFfünf"))) == [(0, 1), (1, 4)]
+    assert list(matcher.find_all(["E", "", "L", "F"])) == []
+
+
+def test_deutsches_paket_wie_naive_suche():
+    paket = sprachpaket("de")
+    rng = random.Random(3)
+    buchstaben = sorted({ch for w in paket.words for ch in w.upper()})
+    for _ in range(100):
+        row = [rng.choice(buchstaben) for _ in range(11)]
+        hits = scan_row(row, paket.words, paket.matcher())
+        gefunden = sorted((i, 10 - ende) for i, spannen in hits.items() for _, ende in spannen)
+        assert gefunden == _naiv(row, paket.words), row
+
+
+def test_update_row_wie_neuer_index():
+    paket = sprachpaket("de")
+    rng = random.Random(11)
+    buchstaben = sorted({ch for w in paket.words for ch in w.upper()})
+    cells = [[rng.choice(buchstaben) for _ in range(11)] for _ in range(10)]
+    index = WordIndex(paket.words, cells, paket)
+    for _ in range(200):
+        r, c = rng.randrange(10), rng.randrange(11)
+        cells[r][c] = rng.choice(buchstaben)
+        index.update_row(cells, r)
+    neu = WordIndex(paket.words, cells, paket)
+    assert index.counts == neu.counts
+    assert index.word_positions() == neu.word_positions()
@@ -0,0 +1,60 @@
+import numpy as np
+
+from zeitsimulation import MINUTEN, SAETZE, simulate_day, uhrzeit
+
+
+def _bericht(vorlage, paket, word_positions, optionen=None):
+    raster = vorlage["raster"]
+    optionen = optionen or {"varzwanzig": vorlage["varzwanzig"], "varviertel": vorlage["varviertel"]}
+    return simulate_day(paket.words, word_positions, raster.rows, raster.cols, optionen, vorlage["minanzeige"],
+                        paket)
+
+
+def _naiv(paket, word_positions, rows, cols, optionen):
+    # Leuchtbild je Satz Wort für Wort zusammensetzen (erster Fall je Symbol, wie der switch der Firmware)
+    positionen = {}
+    for symbole, teile in paket.cases(paket.words, word_positions, optionen):
+        for s in symbole:
+            positionen.setdefault(s, teile)
+    leds = np.zeros((SAETZE, rows, cols), bool)
+    for i in range(SAETZE):
+        stunde, schritt = divmod(i, 12)
+        for s in paket.phrase(stunde, schritt * 5, optionen):
+            for reihe, start, ende in positionen[s]:
+                leds[i, reihe, cols - 1 - ende:cols - start] = True
+    return leds
+
+
+def test_bundes_vorlage_ganzer_tag(bundes):
+    vorlage, paket, word_positions = bundes
+    bericht = _bericht(vorlage, paket, word_positions)
+    assert bericht.ok
+    assert bericht.meldungen() == []
+    assert bericht.leds.shape == (SAETZE, 10, 11)
+    assert bericht.leds.reshape(SAETZE, -1).any(axis=1).all()
+
+    leds, punkte = bericht.frames()
+    assert leds.shape == (MINUTEN, 10, 11)
+    assert punkte.tolist()[:7] == [0, 1, 2, 3, 4, 0, 1]
+    assert (leds[8 * 60 + 40] == bericht.leds[8 * 12 + 8]).all()
+    assert uhrzeit(0) == "12:00" and uhrzeit(8 * 12 + 8) == "8:40"
+
+
+def test_leuchtbilder_wie_wortweise(bundes):
+    vorlage, paket, word_positions = bundes
+    raster = vorlage["raster"]
+    for optionen in ({"varzwanzig": 0, "varviertel": 0}, {"varzwanzig": 1, "varviertel": 1}):
+        bericht = _bericht(vorlage, paket, word_positions, optionen)
+        assert (bericht.leds == _naiv(paket, word_positions, raster.rows, raster.cols, optionen)).all()
+
+
+def test_fehlendes_wort(bundes):
+    vorlage, paket, word_positions = bundes
+    # NEUN aus den Treffern nehmen: 8:25 bis 9:20 sind dann nicht darstellbar
+    neun = paket.words.index("NEUN")
+    ohne = [p for p in word_positions if p[0] != neun] + [(neun, "NEUN", None, None, None, False)]
+    bericht = _bericht(vorlage, paket, ohne)
+    assert not bericht.ok
+    assert {uhrzeit(i) for i in bericht.fehlend} >= {"9:00", "8:45"}
+    assert "8:00" not in {uhrzeit(i) for i in bericht.fehlend}
+    assert bericht.minuten(bericht.fehlend) == len(bericht.fehlend) * 10
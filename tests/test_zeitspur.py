@@ -0,0 +1,34 @@
+import os
+
+import zeitspur
+
+
+def _arbeit(x):
+    with zeitspur.span("arbeit", x=x):
+        return x * 2
+
+
+def test_run_traced_gibt_nur_eigene_abschnitte_zurueck(monkeypatch, tmp_path):
+    monkeypatch.setattr(zeitspur, "AKTIV", True)
+    monkeypatch.setattr(zeitspur, "_events", [{"name": "vom Elternprozess geerbt"}])
+    monkeypatch.setattr(zeitspur, "_worker", False)
+
+    ergebnis, events = zeitspur.run_traced(_arbeit, 21)
+    assert ergebnis == 42
+    assert [e["name"] for e in events] == ["arbeit", "_arbeit"]
+    assert events[0]["args"] == {"x": 21} and events[0]["pid"] == os.getpid()
+    assert zeitspur._events == [{"name": "vom Elternprozess geerbt"}]
+    # ein Worker schreibt beim Beenden keine eigene Datei
+    assert zeitspur.dump(str(tmp_path / "worker.json")) is None
+
+    monkeypatch.setattr(zeitspur, "_worker", False)
+    monkeypatch.setattr(zeitspur, "_events", [])
+    zeitspur.merge(events)
+    ziel = zeitspur.dump(str(tmp_path / "trace.json"))
+    assert ziel and "_arbeit" in (tmp_path / "trace.json").read_text(encoding="utf-8")
+
+
+def test_run_traced_ausgeschaltet(monkeypatch):
+    monkeypatch.setattr(zeitspur, "AKTIV", False)
+    monkeypatch.setattr(zeitspur, "_worker", False)
+    assert zeitspur.run_traced(_arbeit, 1) == (2, [])
@@ -0,0 +1,126 @@
+# trennsteg_geometrie.py
+# Geometrie der Trennstege ohne Tk
+# Wird vom Trennsteg Generator, der Bogen-Schachtelung und dem Batch-Export gemeinsam genutzt.
+# NumPy wird erst bei der ersten Berechnung geladen (schneller Programmstart)
+# ------------------------------------------------------
+
+from functools import lru_cache
+
+# -----------------------------
+# Globale Vorgaben für IKEA Rahmen 250x250 (auch Rastermaß und Rahmen der Frontplatte im Scriptmaker)
+# -----------------------------
+SCHLITZABSTAND = 16.6666  # mm Abstand Mitte -> Mitte
+ANZAHL_SCHLITZE = 12      # Anzahl der Schlitze für Gitter
+VERSCHIEBUNG = 8.3333     # mm für "Waagerecht"-Option
+TRENNSTEGHOEHE = 44.8     # mm Höhe der Trennstege
+RAHMEN_MM = 250           # mm Außenmaß Rahmen / Frontplatte
+STEGLAENGE = 239.5        # mm Länge der Trennstege im Rahmen
+
+
+def validate_dimensions(laenge, hoehe, schlitzbreite):
+    # Eingabewerte eines Stegs prüfen (hoehe bereits verdoppelt); Rückgabe Fehlermeldung oder None
+    if laenge <= 0:
+        return "Länge muss größer als 0 sein."
+    if hoehe <= 0:
+        return "Höhe muss größer als 0 sein."
+    if schlitzbreite < 0.1:
+        return "Schlitzbreite darf nicht kleiner als 0.1 mm sein."
+    return None
+
+
+def validate_values(schlitzbreite, anzahl_schlitze, verschiebung, schlitzabstand):
+    # Schlitzbreite gegen die Vorgaben prüfen (ohne Meldungsfenster); Rückgabe Fehlermeldung oder None
+    if schlitzbreite < 0.1:
+        return "Die Schlitzbreite darf nicht kleiner als 0,1 mm sein."
+    if schlitzbreite > schlitzabstand - 1:
+        return f"Schlitzbreite darf maximal {schlitzabstand - 1:.2f} mm betragen."
+    if anzahl_schlitze < 1 or anzahl_schlitze > 24:
+        return "Die Anzahl der Schlitze muss zwischen 1 und 24 liegen."
+    if verschiebung > schlitzabstand:
+        return f"Die Verschiebung darf maximal {schlitzabstand:.2f} mm betragen."
+    return None
+
+
+def erstes_schlitz_links(laenge, position, anzahl_schlitze, schlitzabstand, verschiebung):
+    # Mitte des ersten Schlitzes von links
+    if position == "Waagerecht":
+        return round((laenge - (anzahl_schlitze-1)*schlitzabstand)/2 + verschiebung, 4)
+    return round((laenge - (anzahl_schlitze-1)*schlitzabstand)/2, 4)
+
+
+def strip_geometry(laenge, hoehe, schlitzbreite, erstes_schlitzauslinks, anzahl_schlitze, schlitzabstand):
+    # Liefert (kontur, schlitze, mittellinie) eines Trennstegs als NumPy-Arrays (nur lesbar, zwischengespeichert):
+    #   kontur (5, 2)  geschlossener Außenrahmen
+    #   schlitze (n, 5, 2)  geschlossene Schlitzrechtecke
+    #   mittellinie (n+1, 2, 2)  Strecken zwischen den Schlitzen
+    # Vorschau und DXF nutzen dieselben Werte
+    return _strip_arrays(float(laenge), float(hoehe), float(schlitzbreite), float(erstes_schlitzauslinks),
+                         int(anzahl_schlitze), float(schlitzabstand))
+
+
+@lru_cache(maxsize=4096)
+def _strip_arrays(laenge, hoehe, schlitzbreite, erstes, anzahl, abstand):
+    import numpy as np
+
+    schlitzhoehe = round(hoehe / 2 , 2)
+    y_unten = round((hoehe - schlitzhoehe) / 2, 2)
+    y_oben = round(y_unten + schlitzhoehe, 2)
+
+    kontur = np.array([(0, 0), (laenge, 0), (laenge, hoehe), (0, hoehe), (0, 0)], dtype=float)
+
+    # Schlitzmitten fortlaufend aufaddiert (cumsum), wie früher in der Schleife x += schlitzabstand
+    mitten = np.cumsum(np.r_[erstes, np.full(anzahl - 1, abstand)])
+    links = mitten - schlitzbreite/2
+    rechts = mitten + schlitzbreite/2
+
+    schlitze = np.empty((anzahl, 5, 2))
+    schlitze[:, :, 0] = np.column_stack((links, rechts, rechts, links, links))
+    schlitze[:, :, 1] = (y_unten, y_unten, y_oben, y_oben, y_unten)
+
+    mittellinie = np.empty((anzahl + 1, 2, 2))
+    mittellinie[:, 0, 0] = np.r_[0, rechts]
+    mittellinie[:, 1, 0] = np.r_[links, laenge]
+    mittellinie[:, :, 1] = hoehe/2
+
+    for array in (kontur, schlitze, mittellinie):
+        array.flags.writeable = False       # liegt im Cache, darf nicht verändert werden
+    return kontur, schlitze, mittellinie
+
+
+def grid_lines(rows, cols, x_pitch=SCHLITZABSTAND, y_pitch=SCHLITZABSTAND, rahmen_mm=RAHMEN_MM):
+    # Raster mittig im Rahmen, Rahmenkoordinaten (y nach oben, Reihe 0 oben), als NumPy-Arrays (nur lesbar):
+    #   x_mitten (cols), y_mitten (rows)        Buchstabenmitten der Frontplatte
+    #   x_stege (cols+1), y_stege (rows+1)      Lage der Trennstege = Schlitzmitten der quer laufenden Stege
+    # Frontplatte und Trennstege rechnen mit denselben Werten
+    return _grid_arrays(int(rows), int(cols), float(x_pitch), float(y_pitch), float(rahmen_mm))
+
+
+@lru_cache(maxsize=256)
+def _grid_arrays(rows, cols, x_pitch, y_pitch, rahmen_mm):
+    import numpy as np
+
+    mitte = rahmen_mm / 2
+    x_stege = mitte + (np.arange(cols + 1) - cols / 2) * x_pitch
+    y_stege = mitte + (rows / 2 - np.arange(rows + 1)) * y_pitch
+    x_mitten = (x_stege[:-1] + x_stege[1:]) / 2
+    y_mitten = (y_stege[:-1] + y_stege[1:]) / 2
+
+    arrays = (x_mitten, y_mitten, x_stege, y_stege)
+    for array in arrays:
+        array.flags.writeable = False       # liegt im Cache, darf nicht verändert werden
+    return arrays
+
+
+def add_strip_entities(msp, geometrie, dx=0, dy=0, kontur=True):
+    # Trennsteg in einen ezdxf Modelspace schreiben, verschoben um (dx, dy)
+    aussen, schlitze, mittellinie = geometrie
+    versatz = (dx, dy)
+
+    if kontur:
+        msp.add_lwpolyline((aussen + versatz).tolist(), close=True, dxfattribs={"layer": "Kontur"})
+    strecken = (mittellinie + versatz).tolist()
+    for (start, ende), schlitz in zip(strecken, (schlitze + versatz).tolist()):
+        msp.add_line(start, ende, dxfattribs={"layer": "Mittellinie"})
+        msp.add_lwpolyline(schlitz, close=True, dxfattribs={"layer": "Schlitze"})
+    start, ende = strecken[-1]
+    msp.add_line(start, ende, dxfattribs={"layer": "Mittellinie"})
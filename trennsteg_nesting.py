@@ -0,0 +1,245 @@
+# trennsteg_nesting.py
+# Bogen-Schachtelung für Trennstege
+# Verteilt eine Liste von Trennstegen auf möglichst wenige Bögen und schreibt je Bogen eine DXF-Datei.
+# - Regal-Verfahren: höchste/längste Stege zuerst, jeweils in das erste passende Regal (First Fit Decreasing)
+# - ohne Abstand liegen die Stege direkt aneinander und teilen sich die Schnittkanten
+#   (jede gemeinsame Kante wird nur einmal geschnitten -> weniger Laserzeit und Einstiche)
+#
+# Aufruf:
+#   python trennsteg_nesting.py --bogen 600x400 --rahmen 1 --laenge 239.5 --hoehe 44.8 --schlitzbreite 0.3
+#   python trennsteg_nesting.py --bogen 600x400 --liste stege.json --ausgabe boegen/
+#
+# Format der Liste (JSON), "hoehe" wie im Feld Höhe des Trennsteg Generators (wird ebenso verdoppelt):
+#   [{"laenge": 239.5, "hoehe": 44.8, "schlitzbreite": 0.3, "position": "Senkrecht", "stueck": 12}, ...]
+#   optional je Eintrag: "anzahl_schlitze", "schlitzabstand", "verschiebung"
+# ------------------------------------------------------
+
+import argparse
+import json
+import os
+import sys
+
+import ezdxf
+
+from trennsteg_geometrie import (SCHLITZABSTAND, ANZAHL_SCHLITZE, VERSCHIEBUNG, TRENNSTEGHOEHE,
+                                 erstes_schlitz_links, strip_geometry, add_strip_entities, validate_dimensions,
+                                 validate_values)
+from laserpfad import merge_collinear_lines, optimize_cut_order
+
+GENAUIGKEIT = 4     # Nachkommastellen beim Vergleich von Kanten
+
+
+class Steg:
+    __slots__ = ("name", "laenge", "hoehe", "schlitzbreite", "geometrie")
+
+    def __init__(self, name, laenge, hoehe, schlitzbreite, geometrie):
+        self.name = name
+        self.laenge = laenge
+        self.hoehe = hoehe
+        self.schlitzbreite = schlitzbreite
+        self.geometrie = geometrie
+
+
+def make_strip(name, laenge, hoehe, schlitzbreite, position="Senkrecht",
+               anzahl_schlitze=ANZAHL_SCHLITZE, schlitzabstand=SCHLITZABSTAND, verschiebung=VERSCHIEBUNG):
+    # hoehe wie im Generator eingegeben, der Steg ist doppelt so hoch
+    hoehe = hoehe * 2
+    # gleiche Regeln wie im Trennsteg Generator
+    meldung = (validate_dimensions(laenge, hoehe, schlitzbreite)
+               or validate_values(schlitzbreite, anzahl_schlitze, verschiebung, schlitzabstand))
+    if meldung:
+        raise ValueError(f"{name}: {meldung}")
+    erstes = erstes_schlitz_links(laenge, position, anzahl_schlitze, schlitzabstand, verschiebung)
+    geometrie = strip_geometry(laenge, hoehe, schlitzbreite, erstes, anzahl_schlitze, schlitzabstand)
+    return Steg(name, laenge, hoehe, schlitzbreite, geometrie)
+
+
+def frame_strips(laenge, hoehe, schlitzbreite, rahmen=1, anzahl_schlitze=ANZAHL_SCHLITZE,
+                 schlitzabstand=SCHLITZABSTAND, verschiebung=VERSCHIEBUNG):
+    # alle Stege eines Gitters: je Schlitz ein Steg der anderen Richtung
+    stege = []
+    for position in ("Senkrecht", "Waagerecht"):
+        for i in range(anzahl_schlitze * rahmen):
+            stege.append(make_strip(f"{position} {i + 1}", laenge, hoehe, schlitzbreite, position,
+                                    anzahl_schlitze, schlitzabstand, verschiebung))
+    return stege
+
+
+def load_strip_list(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError("Die Stegliste muss ein JSON-Array sein.")
+
+    stege = []
+    for n, eintrag in enumerate(data, start=1):
+        try:
+            stueck = int(eintrag.get("stueck", 1))
+            werte = dict(
+                laenge=float(eintrag["laenge"]),
+                hoehe=float(eintrag.get("hoehe", TRENNSTEGHOEHE)),
+                schlitzbreite=float(eintrag["schlitzbreite"]),
+                position=eintrag.get("position", "Senkrecht"),
+                anzahl_schlitze=int(eintrag.get("anzahl_schlitze", ANZAHL_SCHLITZE)),
+                schlitzabstand=float(eintrag.get("schlitzabstand", SCHLITZABSTAND)),
+                verschiebung=float(eintrag.get("verschiebung", VERSCHIEBUNG)),
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Eintrag {n} der Stegliste ist ungültig: {e}")
+        for i in range(stueck):
+            stege.append(make_strip(f"Eintrag {n}/{i + 1}", **werte))
+    return stege
+
+
+def nest_strips(stege, breite, hoehe, rand=5.0, abstand=0.0):
+    # Liefert je Bogen eine Liste (steg, x, y); x/y = linke untere Ecke auf dem Bogen
+    nutz_breite = breite - 2 * rand
+    nutz_hoehe = hoehe - 2 * rand
+    eps = 10 ** -GENAUIGKEIT
+
+    boegen = []     # je Bogen: {"regale": [[y, hoehe, x_frei]], "teile": [...]}
+    for steg in sorted(stege, key=lambda s: (s.hoehe, s.laenge), reverse=True):
+        if steg.laenge > nutz_breite + eps or steg.hoehe > nutz_hoehe + eps:
+            raise ValueError(f"{steg.name} ({steg.laenge:.2f} x {steg.hoehe:.2f} mm) passt nicht auf den Bogen.")
+        for bogen in boegen:
+            if _place(bogen, steg, nutz_breite, nutz_hoehe, rand, abstand, eps):
+                break
+        else:
+            bogen = {"regale": [], "teile": []}
+            _place(bogen, steg, nutz_breite, nutz_hoehe, rand, abstand, eps)
+            boegen.append(bogen)
+    return [bogen["teile"] for bogen in boegen]
+
+
+def _place(bogen, steg, nutz_breite, nutz_hoehe, rand, abstand, eps):
+    for regal in bogen["regale"]:
+        y, regal_hoehe, x_frei = regal
+        if steg.hoehe <= regal_hoehe + eps and x_frei + steg.laenge <= nutz_breite + eps:
+            bogen["teile"].append((steg, rand + x_frei, rand + y))
+            regal[2] = x_frei + steg.laenge + abstand
+            return True
+
+    # neues Regal über dem letzten
+    y = 0.0
+    if bogen["regale"]:
+        letztes = bogen["regale"][-1]
+        y = letztes[0] + letztes[1] + abstand
+    if y + steg.hoehe > nutz_hoehe + eps:
+        return False
+    bogen["regale"].append([y, steg.hoehe, steg.laenge + abstand])
+    bogen["teile"].append((steg, rand, rand + y))
+    return True
+
+
+def shared_outline(teile):
+    # Außenkonturen aller Teile als Strecken, deckungsgleiche Kantenstücke nur einmal
+    waagerecht = {}   # y -> [(x1, x2)]
+    senkrecht = {}    # x -> [(y1, y2)]
+    for steg, dx, dy in teile:
+        punkte = [(round(x + dx, GENAUIGKEIT), round(y + dy, GENAUIGKEIT)) for x, y in steg.geometrie[0].tolist()]
+        for (x1, y1), (x2, y2) in zip(punkte, punkte[1:]):
+            if y1 == y2:
+                waagerecht.setdefault(y1, []).append((min(x1, x2), max(x1, x2)))
+            elif x1 == x2:
+                senkrecht.setdefault(x1, []).append((min(y1, y2), max(y1, y2)))
+
+    strecken = []
+    for y, stuecke in sorted(waagerecht.items()):
+        strecken += [((a, y), (b, y)) for a, b in _merge(stuecke)]
+    for x, stuecke in sorted(senkrecht.items()):
+        strecken += [((x, a), (x, b)) for a, b in _merge(stuecke)]
+    return strecken
+
+
+def _merge(stuecke):
+    zusammen = []
+    for a, b in sorted(stuecke):
+        if zusammen and a <= zusammen[-1][1]:
+            zusammen[-1][1] = max(zusammen[-1][1], b)
+        else:
+            zusammen.append([a, b])
+    return zusammen
+
+
+def build_sheet_doc(teile, gemeinsame_kanten=True):
+    doc = ezdxf.new(dxfversion='AC1015', units=3)
+    msp = doc.modelspace()
+    for steg, dx, dy in teile:
+        add_strip_entities(msp, steg.geometrie, dx, dy, kontur=not gemeinsame_kanten)
+    if gemeinsame_kanten:
+        for start, ende in shared_outline(teile):
+            msp.add_line(start, ende, dxfattribs={"layer": "Kontur"})
+        merge_collinear_lines(msp, "Kontur")
+    merge_collinear_lines(msp, "Mittellinie", max(steg.schlitzbreite for steg, _, _ in teile))
+    optimize_cut_order(msp)
+    return doc
+
+
+def cut_length(strecken):
+    return sum(abs(x2 - x1) + abs(y2 - y1) for (x1, y1), (x2, y2) in strecken)
+
+
+def write_sheets(stege, breite, hoehe, ausgabe, rand=5.0, abstand=0.0):
+    # Ein DXF je Bogen, Rückgabe: Liste der geschriebenen Dateien
+    boegen = nest_strips(stege, breite, hoehe, rand, abstand)
+    gemeinsame_kanten = abstand <= 0
+    os.makedirs(ausgabe, exist_ok=True)
+
+    dateien = []
+    for n, teile in enumerate(boegen, start=1):
+        pfad = os.path.join(ausgabe, f"bogen_{n:02d}.dxf")
+        build_sheet_doc(teile, gemeinsame_kanten).saveas(pfad)
+        dateien.append(pfad)
+
+        flaeche = sum(steg.laenge * steg.hoehe for steg, _, _ in teile)
+        einzeln = sum(2 * (steg.laenge + steg.hoehe) for steg, _, _ in teile)
+        kontur = cut_length(shared_outline(teile)) if gemeinsame_kanten else einzeln
+        print(f"{os.path.basename(pfad)}: {len(teile)} Stege, Ausnutzung {100 * flaeche / (breite * hoehe):.1f} %, "
+              f"Konturschnitt {kontur:.1f} mm (einzeln {einzeln:.1f} mm)")
+    return dateien
+
+
+def _sheet_size(text):
+    try:
+        breite, hoehe = (float(v.replace(",", ".")) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("Bogengröße als BREITExHOEHE angeben, z.B. 600x400")
+    return breite, hoehe
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trennstege auf Bögen verteilen (ein DXF je Bogen)")
+    parser.add_argument("--bogen", type=_sheet_size, required=True, metavar="BREITExHOEHE",
+                        help="Bogengröße in mm, z.B. 600x400")
+    quelle = parser.add_mutually_exclusive_group(required=True)
+    quelle.add_argument("--liste", metavar="JSON", help="Stegliste (JSON)")
+    quelle.add_argument("--rahmen", type=int, metavar="N", help="alle Stege für N Gitter")
+    parser.add_argument("--laenge", type=float, default=239.5, help="Länge der Stege bei --rahmen [mm]")
+    parser.add_argument("--hoehe", type=float, default=TRENNSTEGHOEHE, help="Höhe wie im Generator bei --rahmen [mm]")
+    parser.add_argument("--schlitzbreite", type=float, default=0.3, help="Schlitzbreite bei --rahmen [mm]")
+    parser.add_argument("--anzahl-schlitze", type=int, default=ANZAHL_SCHLITZE)
+    parser.add_argument("--schlitzabstand", type=float, default=SCHLITZABSTAND)
+    parser.add_argument("--verschiebung", type=float, default=VERSCHIEBUNG)
+    parser.add_argument("--rand", type=float, default=5.0, help="freier Rand am Bogen [mm]")
+    parser.add_argument("--abstand", type=float, default=0.0,
+                        help="Abstand zwischen den Stegen [mm], 0 = gemeinsame Schnittkanten")
+    parser.add_argument("--ausgabe", default="boegen", help="Zielverzeichnis")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.liste:
+            stege = load_strip_list(args.liste)
+        else:
+            stege = frame_strips(args.laenge, args.hoehe, args.schlitzbreite, args.rahmen,
+                                 args.anzahl_schlitze, args.schlitzabstand, args.verschiebung)
+        dateien = write_sheets(stege, *args.bogen, args.ausgabe, args.rand, args.abstand)
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{len(stege)} Stege auf {len(dateien)} Bögen verteilt -> {args.ausgabe}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+## Wortsuche für Scriptmaker
+## Mehrmuster-Suche (Aho-Corasick) über das Buchstabenraster
+## - ein Automat pro Wortliste, findet alle Wörter in einem Durchlauf je Reihe
+## - ohne Tk, wird von GUI, Batch-Export und Layout-Prüfungen gemeinsam genutzt
+## - Wortliste und Reihenregeln kommen aus dem Sprachpaket (sprachpaket.py, Standard: Deutsch)
+
+# -*- coding: utf-8 -*-
+
+from collections import deque
+from functools import lru_cache
+
+from sprachpaket import sprachpaket
+
+WORDS = sprachpaket().words                                # Wortliste des deutschen Pakets
+
+
+class WordMatcher:
+    # Aho-Corasick Automat über einer Wortliste (Groß-/Kleinschreibung egal)
+
+    def __init__(self, words):
+        self.words = list(words)
+        self.lengths = [len(w) for w in self.words]
+        self.goto = [{}]        # Übergänge je Zustand
+        self.fail = [0]         # Fehlerlinks
+        self.out = [()]         # Wortindizes, die in diesem Zustand enden
+
+        # Trie aufbauen (doppelte Wörter teilen sich den Endzustand)
+        ends = {}
+        for i, word in enumerate(self.words):
+            state = 0
+            for ch in word.upper():
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                state = nxt
+            ends.setdefault(state, []).append(i)
+        for state, indices in ends.items():
+            self.out[state] = tuple(indices)
+
+        # Fehlerlinks in Breitensuche, Ausgaben der Suffixe übernehmen
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find_all(self, row_cells):
+        # Liefert (wortindex, startspalte) für jedes Vorkommen, Spalten von links gezählt
+        state = 0
+        goto, fail, out, lengths = self.goto, self.fail, self.out, self.lengths
+        for c, cell in enumerate(row_cells):
+            ch = cell.upper() if len(cell) == 1 else None   # leere Felder unterbrechen jedes Wort
+            if ch is None:
+                state = 0
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for i in out[state]:
+                yield i, c - lengths[i] + 1
+
+
+@lru_cache(maxsize=32)
+def matcher_for(words):
+    # Automat nur einmal pro Wortliste bauen (words als Tupel)
+    return WordMatcher(words)
+
+
+def word_allowed_rows(word_index, rows, paket=None):
+    # Bereichsregel aus dem Sprachpaket (deutsch: Zahlenwörter ab Reihe 3, sonstige Wörter bis Reihe 4)
+    return (paket or sprachpaket()).allowed_rows(word_index, rows)
+
+
+def scan_row(row_cells, words, matcher=None):
+    # Alle Treffer einer Reihe: {word_index: [(start, ende), ...]} (Zählung von rechts nach links)
+    cols = len(row_cells)
+    hits = {}
+    found = sorted((matcher or matcher_for(tuple(words))).find_all(row_cells))
+    for i, c in found:
+        length = len(words[i])
+        # Positionszählung von rechts nach links
+        start_rev = cols - 1 - (c + length - 1)
+        end_rev = cols - 1 - c
+        hits.setdefault(i, []).append((start_rev, end_rev))
+    return hits
+
+
+class WordIndex:
+    # Trefferindex pro Reihe - nach einer Eingabe wird nur die geänderte Reihe neu durchsucht
+
+    def __init__(self, words, cells, paket=None):
+        paket = paket or sprachpaket()
+        self.words = words
+        self.rows = len(cells)
+        self.row_hits = [{} for _ in range(self.rows)]
+        self.counts = [0] * len(words)   # Treffer in erlaubten Reihen pro Wort
+        self.allowed = [set(paket.allowed_rows(i, self.rows)) for i in range(len(words))]
+        # vorkompilierter Automat des Pakets, für erweiterte Wortlisten ein eigener
+        self.matcher = paket.matcher() if list(words) == paket.words else matcher_for(tuple(words))
+        for r in range(self.rows):
+            self.update_row(cells, r)
+
+    def update_row(self, cells, r):
+        # Reihe r neu durchsuchen, Rückgabe: Wortindizes, deren Status (gefunden/nicht gefunden) sich geändert hat
+        old = self.row_hits[r]
+        new = scan_row(cells[r], self.words, self.matcher)
+        changed = set()
+        for idx in old.keys() | new.keys():
+            if r not in self.allowed[idx]:
+                continue
+            before = self.counts[idx] > 0
+            self.counts[idx] += len(new.get(idx, ())) - len(old.get(idx, ()))
+            if (self.counts[idx] > 0) != before:
+                changed.add(idx)
+        self.row_hits[r] = new
+        return changed
+
+    def found(self, idx):
+        return self.counts[idx] > 0
+
+    def word_positions(self):
+        # [(word_index, wort, reihe, start, ende, gefunden), ...] in Reihenfolge der Wortliste
+        word_positions = []
+        for i, word in enumerate(self.words):
+            valid = False
+            for r in range(self.rows):
+                if r not in self.allowed[i]:
+                    continue
+                for s, e in self.row_hits[r].get(i, ()):
+                    word_positions.append((i, word, r, s, e, True))
+                    valid = True
+            if not valid:
+                word_positions.append((i, word, None, None, None, False))
+        return word_positions
+
+
+def find_word_positions(cells, words, paket=None):
+    # Liefert (word_positions, results) - word_positions wie von check_words erwartet:
+    # [(word_index, wort, reihe, start, ende, gefunden), ...]
+    index = WordIndex(words, cells, paket)
+    results = [index.found(i) for i in range(len(words))]
+    return index.word_positions(), results
+
+
+def missing_words(words, word_positions, varzwanzig, varviertel, paket=None):
+    # Wörter, die eine Warnung auslösen (leere Liste = Vorlage ist in Ordnung)
+    paket = paket or sprachpaket()
+    found = {idx for idx, _, _, _, _, gefunden in word_positions if gefunden}
+    optionen = {"varzwanzig": varzwanzig, "varviertel": varviertel}
+
+    fehlend = []
+    for i, wort in enumerate(words):
+        if i in found:
+            continue
+        # Sonderwörter (z.B. ZWANZIG, DREI von DREIVIERTEL) nur, wenn die Checkbox nicht aktiviert ist
+        if paket.optional(i, optionen):
+            continue
+        fehlend.append(wort)
+    return fehlend
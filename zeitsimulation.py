@@ -0,0 +1,135 @@
+## Tagessimulation für Scriptmaker
+## Berechnet für alle 1440 Minuten des Tages, welche LEDs leuchten, und prüft, ob jede Uhrzeit darstellbar ist
+## - Wortmasken aus denselben Positionen wie das Layoutscript (Sprachpaket.cases), erstes Vorkommen gilt
+## - Satz je Uhrzeit aus dem Sprachpaket ("zeiten"), 144 Sätze (12 Stunden x 12 Fünfminutenschritte)
+## - Leuchtbild aller Sätze in einem Schritt: Satzmatrix (144 x Symbole) @ Wortmasken (Symbole x Zellen)
+## - meldet: Symbol ohne Position (Uhrzeit nicht darstellbar), überlappende Wörter in einem Satz,
+##   gleiche Leuchtbilder für verschiedene Uhrzeiten
+## - ohne Tk, schnell genug für jede Eingabe in der GUI und den Batch über ganze Vorlagenverzeichnisse
+## NumPy wird erst beim ersten Aufruf geladen (schneller Programmstart)
+
+# -*- coding: utf-8 -*-
+
+from functools import lru_cache
+
+from sprachpaket import sprachpaket
+
+MINUTEN = 1440
+STUNDEN = 12
+SCHRITTE = 12             # Fünfminutenschritte je Stunde
+SAETZE = STUNDEN * SCHRITTE
+
+
+def uhrzeit(satz):
+    # Satzindex -> "8:40" (12-Stunden-Anzeige, 0 Uhr = 12)
+    stunde, schritt = divmod(satz, SCHRITTE)
+    return f"{stunde or 12}:{schritt * 5:02d}"
+
+
+@lru_cache(maxsize=32)
+def _satzmatrix(paket, optionen):
+    # (saetze, symbole, matrix) je Sprachpaket und Checkbox-Stand (optionen als sortiertes Tupel)
+    # matrix[satz, symbol] = wie oft das Symbol im Satz vorkommt, nur lesbar
+    import numpy as np
+
+    optionen = dict(optionen)
+    saetze = [paket.phrase(stunde, schritt * 5, optionen) for stunde in range(STUNDEN) for schritt in range(SCHRITTE)]
+    symbole = list(dict.fromkeys(s for satz in saetze for s in satz))
+    spalte = {s: i for i, s in enumerate(symbole)}
+    matrix = np.zeros((SAETZE, len(symbole)), np.uint8)
+    for i, satz in enumerate(saetze):
+        for s in satz:
+            matrix[i, spalte[s]] += 1
+    matrix.flags.writeable = False
+    return saetze, symbole, matrix
+
+
+def word_masks(faelle, symbole, rows, cols):
+    # Wortmasken (Symbole x Zellen) aus den Firmware-Fällen [(symbole, [(reihe, start, ende), ...]), ...]
+    # Start/Ende von rechts gezählt wie setFrontMatrixWord; ein Symbol gilt mit seinem ersten Fall (wie im switch)
+    import numpy as np
+
+    spalte = {s: i for i, s in enumerate(symbole)}
+    masken = np.zeros((len(symbole), rows, cols), np.uint8)
+    vorhanden = np.zeros(len(symbole), bool)
+    for case_symbole, positionen in faelle:
+        for s in case_symbole:
+            i = spalte.get(s)
+            if i is None or vorhanden[i]:
+                continue
+            vorhanden[i] = True
+            for reihe, start, ende in positionen:
+                masken[i, reihe, cols - 1 - ende:cols - start] = 1
+    return masken.reshape(len(symbole), rows * cols), vorhanden
+
+
+class Tagesbericht:
+    # Ergebnis von simulate_day, Leuchtbilder je Satz und Prüfergebnisse
+
+    def __init__(self, saetze, leds, zaehler, fehlend, minanzeige):
+        import numpy as np
+
+        self.saetze = saetze                 # 144 Symbol-Tupel
+        self.leds = leds                     # (144, reihen, spalten) bool
+        self.minanzeige = minanzeige         # 1 = Uhr ohne Minutenpunkte
+        self.fehlend = fehlend               # {satz: (symbole ohne Position, ...)}
+        flach = zaehler.reshape(SAETZE, -1)
+        self.ueberlappend = [int(i) for i in np.flatnonzero((flach > 1).any(axis=1)) if i not in fehlend]
+
+        # gleiche Leuchtbilder nur unter den darstellbaren Sätzen
+        darstellbar = np.array([i not in fehlend for i in range(SAETZE)])
+        _, gruppe, anzahl = np.unique(leds.reshape(SAETZE, -1)[darstellbar], axis=0,
+                                      return_inverse=True, return_counts=True)
+        indizes = np.flatnonzero(darstellbar)
+        self.gleich = [indizes[gruppe.ravel() == g].tolist() for g in np.flatnonzero(anzahl > 1)]
+
+    @property
+    def ok(self):
+        return not self.fehlend
+
+    @property
+    def satz_index(self):
+        # Satz für jede Minute des Tages (0..1439)
+        import numpy as np
+        minute = np.arange(MINUTEN)
+        return (minute // 60 % STUNDEN) * SCHRITTE + minute % 60 // 5
+
+    def frames(self):
+        # (leds (1440, reihen, spalten) bool, minutenpunkte (1440,)) für den ganzen Tag
+        import numpy as np
+        minute = np.arange(MINUTEN)
+        punkte = np.zeros(MINUTEN, np.uint8) if self.minanzeige else (minute % 5).astype(np.uint8)
+        return self.leds[self.satz_index], punkte
+
+    def minuten(self, saetze):
+        # Anzahl Minuten des Tages, die einen der Sätze anzeigen
+        return len(saetze) * MINUTEN // SAETZE
+
+    def meldungen(self, beispiele=3):
+        # Kurze Texte für GUI und Batch, leere Liste = alles in Ordnung
+        meldungen = []
+        if self.fehlend:
+            fehlt = sorted({s for symbole in self.fehlend.values() for s in symbole})
+            zeiten = ", ".join(uhrzeit(i) for i in sorted(self.fehlend)[:beispiele])
+            meldungen.append(f"{self.minuten(self.fehlend)} Minuten nicht darstellbar ({zeiten} ...), "
+                             f"fehlt: {', '.join(fehlt)}")
+        if self.ueberlappend:
+            zeiten = ", ".join(uhrzeit(i) for i in self.ueberlappend[:beispiele])
+            meldungen.append(f"{self.minuten(self.ueberlappend)} Minuten mit überlappenden Wörtern ({zeiten} ...)")
+        for gruppe in self.gleich[:beispiele]:
+            meldungen.append("gleiches Bild: " + " = ".join(uhrzeit(i) for i in gruppe))
+        return meldungen
+
+
+def simulate_day(words, word_positions, rows, cols, optionen, minanzeige=0, paket=None):
+    # Tagesbericht für ein Raster, word_positions wie WordIndex.word_positions()
+    # optionen z.B. {"varzwanzig": 0, "varviertel": 1}, minanzeige = 1: Uhr ohne Minutenpunkte
+    paket = paket or sprachpaket()
+    saetze, symbole, matrix = _satzmatrix(paket, tuple(sorted(optionen.items())))
+    masken, vorhanden = word_masks(paket.cases(words, word_positions, optionen), symbole, rows, cols)
+
+    zaehler = (matrix @ masken).reshape(SAETZE, rows, cols)      # wie oft jede LED je Satz angesteuert wird
+    fehlt = matrix[:, ~vorhanden]
+    namen = [s for s, da in zip(symbole, vorhanden) if not da]
+    fehlend = {i: tuple(n for n, k in zip(namen, zeile) if k) for i, zeile in enumerate(fehlt) if zeile.any()}
+    return Tagesbericht(saetze, zaehler > 0, zaehler, fehlend, minanzeige)
@@ -0,0 +1,146 @@
+## Zeitspur (Tracing) für die Exportpfade von Scriptmaker und Trennsteg Generator
+## Eingeschaltet über die Umgebungsvariable SCRIPTMAKER_TRACE:
+##   SCRIPTMAKER_TRACE=1                -> scriptmaker_trace.json im aktuellen Verzeichnis
+##   SCRIPTMAKER_TRACE=pfad/trace.json  -> eigene Datei
+## Jeder Abschnitt (span) wird mit Dauer und Zusatzwerten (Objektanzahl, geschriebene Bytes, ...) erfasst und
+## beim Programmende im Chrome-Trace-Format gespeichert (chrome://tracing oder https://ui.perfetto.dev).
+## Ausgeschaltet kostet es nichts: traced() gibt die Funktion unverändert zurück, span() ein leeres Objekt.
+## Prozesspool (Batch-Export, Sweep): Worker beenden sich ohne atexit und dürften auch nicht alle dieselbe Datei
+## schreiben. Die Aufgaben laufen deshalb über run_traced(), das die Abschnitte des Aufrufs mit dem Ergebnis
+## zurückgibt; der Elternprozess übernimmt sie mit merge() und schreibt eine gemeinsame Datei (pid je Worker).
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+UMGEBUNG = "SCRIPTMAKER_TRACE"
+_ziel = os.environ.get(UMGEBUNG, "")
+AKTIV = bool(_ziel) and _ziel != "0"
+
+_events = []
+_lock = threading.Lock()
+_worker = False          # True in Pool-Workern: dort schreibt dump() beim Beenden nichts
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def set(self, **args):
+        # Zusatzwerte während des Abschnitts ergänzen (z.B. entities=..., bytes=...)
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ende = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["fehler"] = exc_type.__name__
+        event = {
+            "name": self.name,
+            "ph": "X",
+            "ts": self.start / 1000,
+            "dur": (ende - self.start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": self.args,
+        }
+        with _lock:
+            _events.append(event)
+        return False
+
+
+class _Aus:
+    # leerer Abschnitt für den ausgeschalteten Zustand
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_AUS = _Aus()
+
+
+def span(name, **args):
+    # with span("saveas", datei=pfad) as s: ... s.set(bytes=...)
+    if not AKTIV:
+        return _AUS
+    return _Span(name, args)
+
+
+def traced(name=None):
+    # Dekorator: ganze Funktion als Abschnitt, ausgeschaltet unverändert
+    def deco(fn):
+        if not AKTIV:
+            return fn
+        titel = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(titel, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def run_traced(fn, *args):
+    # im Worker: fn(*args) ausführen, Rückgabe (ergebnis, abschnitte dieses Aufrufs) für merge() im Elternprozess
+    # (Abschnitte eines Aufrufs, der mit einer Ausnahme endet, gehen verloren)
+    global _worker
+    _worker = True
+    if not AKTIV:
+        return fn(*args), []
+    with _lock:
+        anfang = len(_events)      # bei fork stehen hier schon die geerbten Abschnitte des Elternprozesses
+    with _Span(fn.__name__, {}):
+        ergebnis = fn(*args)
+    with _lock:
+        events = _events[anfang:]
+        del _events[anfang:]
+    return ergebnis, events
+
+
+def merge(events):
+    # Abschnitte aus einem Worker (run_traced) übernehmen
+    if events:
+        with _lock:
+            _events.extend(events)
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def dump(path=None):
+    # Chrome-Trace JSON schreiben, Rückgabe: Pfad oder None (nichts aufgezeichnet oder Pool-Worker)
+    if _worker:
+        return None
+    with _lock:
+        events = list(_events)
+    if not events:
+        return None
+    path = path or (_ziel if _ziel not in ("1", "true", "ja") else "scriptmaker_trace.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return path
+
+
+if AKTIV:
+    atexit.register(dump)